@@ -0,0 +1,95 @@
+"""
+Batch operations on forecast columns
+
+Forecast series keep each field as a column (see forecast_model.py.) These functions apply the
+plugin's value rules to a whole column at once: scaling (for example, fractions to percentages) and
+the corrupted data rule from Plugin.fix_corrupted_data(). NumPy is used for numeric columns when it's
+installed; otherwise (and for columns with text or missing values) the same rules run in plain
+Python. Both paths return the same values.
+"""
+
+from array import array
+
+# Third-party modules
+try:
+    import numpy as np  # noqa
+except ImportError:
+    np = None
+
+CORRUPT_BELOW = -55.728  # -99 F = -55.728 C
+CORRUPT_VALUE = -99.0
+
+
+# =============================================================================
+def scale_column(values: array | list | None = None, factor: float = 1.0) -> array | list:
+    """
+    Multiply a column by a factor
+
+    Values that aren't numbers are left as they are (fix_column() displays them as "--".)
+
+    :param array values:
+    :param float factor:
+    :return array or list:
+    """
+    values = values if values is not None else []
+
+    if isinstance(values, array):
+        if np is not None:
+            return array('d', (np.asarray(values, dtype=float) * factor).tolist())
+        return array('d', (float(value) * factor for value in values))
+
+    scaled = []
+    for value in values:
+        try:
+            scaled.append(float(value) * factor)
+        except (ValueError, TypeError):
+            scaled.append(value)
+    return scaled
+
+
+# =============================================================================
+def fix_column(values: array | list | None = None) -> tuple[list, list]:
+    """
+    Apply the corrupted data rule to a column
+
+    Each value becomes a float, and values that can't be converted or that are below -55.728 become
+    -99.0 (displayed as "--".) See Plugin.fix_corrupted_data().
+
+    :param array values:
+    :return tuple: ([float, ...], [str, ...])
+    """
+    values = values if values is not None else []
+
+    if np is not None and isinstance(values, array):
+        column  = np.asarray(values, dtype=float)
+        corrupt = column < CORRUPT_BELOW
+        fixed   = np.where(corrupt, CORRUPT_VALUE, column).tolist()
+        strings = ["--" if bad else str(value) for value, bad in zip(fixed, corrupt.tolist())]
+        return fixed, strings
+
+    if isinstance(values, array):
+        # Typed columns are numeric throughout, so no conversion checks are needed, and most
+        # columns don't have any corrupted values at all.
+        fixed = values.tolist() if values.typecode == 'd' else list(map(float, values))
+        if any(value < CORRUPT_BELOW for value in fixed):
+            fixed   = [CORRUPT_VALUE if value < CORRUPT_BELOW else value for value in fixed]
+            strings = ["--" if value < CORRUPT_BELOW else str(value) for value in fixed]
+        else:
+            strings = list(map(str, fixed))
+        return fixed, strings
+
+    fixed, strings = [], []
+    for value in values:
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            value = None
+
+        if value is None or value < CORRUPT_BELOW:
+            fixed.append(CORRUPT_VALUE)
+            strings.append("--")
+        else:
+            fixed.append(value)
+            strings.append(str(value))
+
+    return fixed, strings
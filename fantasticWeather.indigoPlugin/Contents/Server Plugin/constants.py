@@ -5,6 +5,22 @@ The constants.py file contains all application constants and is imported as a li
 are denoted as constants by the use of all caps.
 """
 
+# =============================== Forecast Cache ==============================
+FORECAST_CACHE_FOLDER    = "forecast_cache"  # Subfolder of the plugin preferences folder.
+FORECAST_CACHE_MAX_AGE   = 86400             # Seconds before a cached forecast is evicted.
+FORECAST_CACHE_MAX_BYTES = 20 * 1024 * 1024  # Total size before the oldest forecasts are evicted.
+
+# ============================== Refresh Schedule =============================
+# Plugin prefs that hold the refresh interval for each device type.
+DEVICE_TYPE_INTERVAL_PREFS = {
+    'Astronomy': 'intervalAstronomy',
+    'Daily': 'intervalDaily',
+    'Hourly': 'intervalHourly',
+    'satelliteImageDownloader': 'intervalImages',
+    'Weather': 'intervalWeather',
+}
+REFRESH_ALIGN_WINDOW = 60  # Devices due within this many seconds are refreshed together.
+
 
 def __init__():
     pass
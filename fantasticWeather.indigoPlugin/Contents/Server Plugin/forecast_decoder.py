@@ -0,0 +1,93 @@
+"""
+Projected forecast decoding
+
+A Pirate Weather response carries every field for every forecast period (48 or more hours, 8 days),
+but the device parsers read only a fraction of them. decode() projects the response onto the fields
+that the configured device types consume while it's being decoded: each JSON object is filtered as
+soon as the decoder finishes it, so the full tree is never built and only the projected (compact)
+structure is kept in the masterWeatherDict.
+
+The projection is context free; a field that's kept anywhere is kept everywhere it appears. That
+keeps the filter to a single set lookup per field.
+"""
+
+from functools import lru_cache
+import json
+from typing import Any, Callable
+
+from state_schema import STATE_SCHEMA
+
+# Fields read outside the state schema (observation times, astronomy, alerts and the forecast email.)
+ALERT_KEYS     = ('description', 'expires', 'regions', 'severity', 'time', 'title', 'uri')
+ASTRONOMY_KEYS = ('moonPhase', 'sunriseTime', 'sunsetTime', 'time')
+EMAIL_KEYS     = (
+    'cloudCover', 'humidity', 'precipIntensity', 'precipProbability', 'precipType', 'pressure',
+    'summary', 'temperatureHigh', 'temperatureLow', 'time', 'uvIndex', 'visibility', 'windBearing',
+    'windGust', 'windSpeed',
+)
+
+# The top level blocks that each device type reads (Daily devices send the forecast email, which
+# includes the alerts.)
+DEVICE_BLOCKS = {
+    'Astronomy': ('currently', 'daily'),
+    'Daily': ('alerts', 'currently', 'daily'),
+    'Hourly': ('currently', 'hourly'),
+    'Weather': ('alerts', 'currently', 'daily'),
+}
+
+
+# =============================================================================
+@lru_cache(maxsize=None)
+def projected_keys(device_types: frozenset = frozenset()) -> frozenset:
+    """
+    Return the JSON keys that the device types consume
+
+    :param frozenset device_types: {'Daily', 'Weather', ...}
+    :return frozenset:
+    """
+    keys = {'data', 'summary', 'time', 'timezone'}
+
+    for device_type in device_types:
+        keys.update(DEVICE_BLOCKS.get(device_type, ()))
+        keys.update(key for _, path, *_ in STATE_SCHEMA.get(device_type, ()) for key in path)
+
+    if 'Astronomy' in device_types:
+        keys.update(ASTRONOMY_KEYS)
+
+    if 'Weather' in device_types:
+        keys.update(ALERT_KEYS)
+
+    if 'Daily' in device_types:
+        keys.update(ALERT_KEYS)
+        keys.update(EMAIL_KEYS)
+
+    return frozenset(keys)
+
+
+# =============================================================================
+@lru_cache(maxsize=None)
+def object_filter(device_types: frozenset = frozenset()) -> Callable[[list], dict]:
+    """
+    Return a JSON object_pairs_hook that keeps only the keys the device types consume
+
+    :param frozenset device_types:
+    :return Callable:
+    """
+    keys = projected_keys(device_types)
+
+    def object_pairs_hook(pairs: list) -> dict:
+        return {key: value for key, value in pairs if key in keys}
+
+    return object_pairs_hook
+
+
+# =============================================================================
+def decode(raw: bytes | str = b"", device_types: frozenset = frozenset()) -> Any:
+    """
+    Decode a forecast response, keeping only the fields the device types consume
+
+    :param bytes raw: the response body.
+    :param frozenset device_types:
+    :return dict:
+    """
+    return json.loads(raw, object_pairs_hook=object_filter(frozenset(device_types)))
@@ -0,0 +1,315 @@
+"""
+Forecast model
+
+The masterWeatherDict holds one Forecast per location for the whole cycle. build_forecast() builds
+it once per fetch from the (projected) JSON: the current conditions and alerts are slotted records,
+and the hourly and daily series keep each field as a column (a typed array where the field is
+numeric throughout, a list otherwise) rather than a dict per period. Reading a series period
+returns an HourlyPoint or DailyPoint view of that period's columns.
+
+Fields that aren't in the JSON are left unset, so looking them up behaves like a missing key. The
+records support get(), 'in' and [] so that the key path lookups (json_lookup.py) work on them the
+same way they work on the JSON.
+"""
+
+from array import array
+import datetime as dt
+import hashlib
+from typing import Any, NamedTuple
+
+from forecast_decoder import ALERT_KEYS, ASTRONOMY_KEYS, EMAIL_KEYS
+from state_schema import DAILY_FIELDS, HOURLY_FIELDS, WEATHER_FIELDS
+
+_MISSING = object()
+
+
+# =============================================================================
+class Record:
+    """
+    Base class for slotted forecast records
+    """
+    __slots__ = ()
+
+    # =============================================================================
+    @classmethod
+    def from_dict(cls, obj: dict | None = None) -> 'Record':
+        """
+        Build a record from a JSON object (keys without a slot are dropped)
+
+        :param dict obj:
+        :return Record:
+        """
+        record = cls.__new__(cls)
+        for key, value in (obj or {}).items():
+            if key in cls.__slots__:
+                setattr(record, key, value)
+        return record
+
+    # =============================================================================
+    def get(self, key: str = "", default: Any = None) -> Any:
+        """
+        Return a field value, or the default if the field isn't set
+
+        :param str key:
+        :param Any default:
+        :return Any:
+        """
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    # =============================================================================
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+
+    # =============================================================================
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    # =============================================================================
+    def as_dict(self) -> dict:
+        """
+        Return the record as a dict (for display)
+
+        :return dict:
+        """
+        return {key: getattr(self, key) for key in self.__slots__ if hasattr(self, key)}
+
+    # =============================================================================
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()})"
+
+
+# =============================================================================
+def _slots(*fields: tuple, extra: tuple = ()) -> tuple:
+    """
+    Return the slot names for the schema fields (the last key of each path) plus any extras
+
+    :param tuple fields: state schema field tuples.
+    :param tuple extra:
+    :return tuple:
+    """
+    return tuple(sorted({path[-1] for _, path, *_ in fields} | {'time', *extra}))
+
+
+# =============================================================================
+class CurrentConditions(Record):
+    """
+    Current conditions for a location
+    """
+    __slots__ = _slots(*WEATHER_FIELDS)
+
+
+# =============================================================================
+class HourlyPoint(Record):
+    """
+    One forecast hour
+    """
+    __slots__ = _slots(*HOURLY_FIELDS)
+
+
+# =============================================================================
+class DailyPoint(Record):
+    """
+    One forecast day
+    """
+    __slots__ = _slots(*DAILY_FIELDS, extra=ASTRONOMY_KEYS + EMAIL_KEYS)
+
+
+# =============================================================================
+class Alert(Record):
+    """
+    One severe weather alert
+    """
+    __slots__ = ALERT_KEYS
+
+    # =============================================================================
+    @property
+    def fingerprint(self) -> str:
+        """
+        A hash of the alert's uri, time and title
+
+        An alert has the same fingerprint in every download until it's reissued or expires.
+
+        :return str:
+        """
+        key = "\x1f".join(str(self.get(field, "")) for field in ('uri', 'time', 'title'))
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# =============================================================================
+class Series(Record):
+    """
+    Columnar forecast series
+
+    :param type point_type: HourlyPoint or DailyPoint.
+    :param dict obj: the JSON series ({'summary': str, 'data': [period, ...]}).
+    """
+    __slots__ = ('summary', 'columns', 'length', 'point_type')
+
+    def __init__(self, point_type: type = HourlyPoint, obj: dict | None = None) -> None:
+        obj     = obj or {}
+        periods = obj.get('data', [])
+
+        if 'summary' in obj:
+            self.summary = obj['summary']
+        self.point_type = point_type
+        self.length     = len(periods)
+        self.columns    = {}
+
+        for key in point_type.__slots__:
+            values = [period.get(key, _MISSING) for period in periods]
+            if any(value is not _MISSING for value in values):
+                self.columns[key] = self.column(values)
+
+    # =============================================================================
+    @staticmethod
+    def column(values: list | None = None) -> array | list:
+        """
+        Store a field's values as a typed array when they're all ints or all floats
+
+        Mixed and missing values stay in a list so that every value reads back exactly as it was
+        decoded.
+
+        :param list values:
+        :return array or list:
+        """
+        types = {type(value) for value in values}
+        if types == {int}:
+            try:
+                return array('q', values)
+            except OverflowError:
+                return values
+        if types == {float}:
+            return array('d', values)
+        return values
+
+    # =============================================================================
+    def __len__(self) -> int:
+        return self.length
+
+    # =============================================================================
+    def __iter__(self):
+        for index in range(self.length):
+            yield self.point(index)
+
+    # =============================================================================
+    def __getitem__(self, key: int | str) -> Any:
+        if isinstance(key, str):
+            return super().__getitem__(key)
+        if not -self.length <= key < self.length:
+            raise IndexError(key)
+        return self.point(key % self.length)
+
+    # =============================================================================
+    def values(self, key: str = "", count: int | None = None, default: Any = None) -> array | list:
+        """
+        Return a field's column for the first count periods
+
+        Missing values are replaced by the default.
+
+        :param str key:
+        :param int count: defaults to every period.
+        :param Any default:
+        :return array or list:
+        """
+        count  = self.length if count is None else min(count, self.length)
+        column = self.columns.get(key)
+
+        if column is None:
+            return [default] * count
+        if isinstance(column, array):
+            return column[:count]
+        return [default if value is _MISSING else value for value in column[:count]]
+
+    # =============================================================================
+    def point(self, index: int = 0) -> Record:
+        """
+        Return one period of the series
+
+        :param int index:
+        :return HourlyPoint or DailyPoint:
+        """
+        point = self.point_type.__new__(self.point_type)
+        for key, values in self.columns.items():
+            value = values[index]
+            if value is not _MISSING:
+                setattr(point, key, value)
+        return point
+
+    # =============================================================================
+    def as_dict(self) -> dict:
+        """
+        Return the series as a dict (for display)
+
+        :return dict:
+        """
+        series = {'summary': self.summary} if hasattr(self, 'summary') else {}
+        series['data'] = [point.as_dict() for point in self]
+        return series
+
+
+# =============================================================================
+class Forecast(Record):
+    """
+    Forecast for one location
+    """
+    __slots__ = ('alerts', 'currently', 'daily', 'hourly', 'timezone')
+
+    # =============================================================================
+    def as_dict(self) -> dict:
+        """
+        Return the forecast as a dict (for display)
+
+        :return dict:
+        """
+        forecast = super().as_dict()
+        for key, value in forecast.items():
+            if isinstance(value, Record):
+                forecast[key] = value.as_dict()
+            elif key == 'alerts':
+                forecast[key] = [alert.as_dict() for alert in value]
+        return forecast
+
+
+# =============================================================================
+class LocationContext(NamedTuple):
+    """
+    Values derived from a location's forecast that every device at the location shares
+
+    Built once per location per cycle (see Plugin.location_context()).
+    """
+    epoch: int                  # observation epoch
+    observation: str            # Last updated on Jan 31, 14:00 PM -0600
+    observation_24hr: str       # the observation time in the Indigo date and time formats
+    zone: str | None            # the location timezone name
+    tzinfo: dt.tzinfo | None    # the location timezone
+    sunrise: Any                # the first forecast day's sunriseTime
+    sunset: Any                 # the first forecast day's sunsetTime
+    moon_phase: Any             # the first forecast day's moonPhase
+
+
+# =============================================================================
+def build_forecast(obj: dict | None = None) -> Forecast:
+    """
+    Build the forecast model from the (projected) JSON for a location
+
+    :param dict obj:
+    :return Forecast:
+    """
+    obj      = obj or {}
+    forecast = Forecast.__new__(Forecast)
+
+    if 'timezone' in obj:
+        forecast.timezone = obj['timezone']
+    if 'currently' in obj:
+        forecast.currently = CurrentConditions.from_dict(obj['currently'])
+    if 'hourly' in obj:
+        forecast.hourly = Series(HourlyPoint, obj['hourly'])
+    if 'daily' in obj:
+        forecast.daily = Series(DailyPoint, obj['daily'])
+    if 'alerts' in obj:
+        forecast.alerts = tuple(Alert.from_dict(alert) for alert in obj['alerts'])
+
+    return forecast
@@ -0,0 +1,206 @@
+"""
+Satellite image downloads
+
+Image downloader devices poll the same radar or satellite frame over and over, and most polls
+return an image that hasn't changed. The ImageValidator class keeps a device's cache validators (the
+ETag and Last-Modified headers of the last download and a hash of its content) so that each download
+can be a conditional request: the server answers 304 Not Modified when the image hasn't changed, and
+the destination file is left alone. Servers that don't support validators still send the whole
+image, but the content hash catches an unchanged image before the file is rewritten.
+
+save_image() streams a download to a temporary file in the destination folder and then renames it
+over the destination, so a control page never reads a partially written image. Downloads run in
+their own worker pool (see Plugin.download_satellite_images()).
+
+Sources can also be local files (a path or a file:// URL), for example frames written by a local
+radar tool. copy_image() skips the copy when the file's modification time and size haven't changed,
+and otherwise copies it with shutil.copyfile(), which uses the operating system's copy routines
+(fcopyfile on macOS, sendfile on Linux) so the image isn't read into the plugin.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Iterable
+import urllib.parse
+import urllib.request
+
+IMAGE_CHUNK_SIZE = 65536  # bytes read from the response (and written) at a time
+
+
+# =============================================================================
+class ImageValidator:
+    """
+    Cache validators for one image downloader device
+
+    :param str destination: the image file.
+    """
+    def __init__(self, destination: str = "") -> None:
+        self.destination   = destination
+        self.etag          = None
+        self.last_modified = None
+        self.digest        = None  # hash of the last image written
+        self.size          = 0     # size (in bytes) of the last image written
+        self.source_stat   = None  # (mtime, size) of the local source file last copied
+        self.bytes_saved   = 0     # bytes not downloaded because the image hadn't changed
+
+    # =============================================================================
+    def request_headers(self) -> dict:
+        """
+        Return the conditional request headers for the next download
+
+        Validators are only sent while the destination file is still there; otherwise the image has
+        to be downloaded again.
+
+        :return dict:
+        """
+        headers = {}
+
+        if self.digest is None or not os.path.isfile(self.destination):
+            return headers
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    # =============================================================================
+    def not_modified(self) -> int:
+        """
+        Record a 304 Not Modified response
+
+        :return int: the bytes saved by the response.
+        """
+        self.bytes_saved += self.size
+        return self.size
+
+    # =============================================================================
+    def unchanged(self, digest: str = "", headers: dict | None = None) -> bool:
+        """
+        Return True if a downloaded image is the same as the image already written
+
+        The response validators are kept either way.
+
+        :param str digest: the hash of the downloaded image.
+        :param dict headers: the response headers.
+        :return bool:
+        """
+        headers            = headers or {}
+        self.etag          = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+
+        return digest == self.digest and os.path.isfile(self.destination)
+
+    # =============================================================================
+    def written(self, digest: str = "", size: int = 0) -> None:
+        """
+        Record the image that was written to the destination file
+
+        :param str digest: the hash of the image (None for local copies, which aren't hashed.)
+        :param int size: the size of the image in bytes.
+        """
+        self.digest = digest
+        self.size   = size
+
+
+# =============================================================================
+def source_path(source: str = "") -> str | None:
+    """
+    Return the local file path of an image source
+
+    :param str source: a URL, a file:// URL or a path.
+    :return str: the path, or None if the source isn't a local file.
+    """
+    parsed = urllib.parse.urlparse(source)
+
+    if parsed.scheme == "file":
+        return urllib.request.url2pathname(parsed.path)
+    if parsed.scheme and parsed.netloc:
+        return None
+    return source
+
+
+# =============================================================================
+def save_image(chunks: Iterable[bytes] = (), validator: ImageValidator | None = None, headers: dict | None = None) -> str:  # noqa
+    """
+    Write a downloaded image to the destination file unless it's unchanged
+
+    The image is written to a temporary file next to the destination (and hashed as it's written).
+    An unchanged image is discarded; otherwise the temporary file replaces the destination in one
+    step.
+
+    :param Iterable chunks: the response body.
+    :param ImageValidator validator: the device's validators (and destination.)
+    :param dict headers: the response headers.
+    :return str: 'miss' if the image was written, 'unchanged' if it wasn't.
+    """
+    destination = validator.destination
+    digest      = hashlib.blake2b(digest_size=16)
+    size        = 0
+
+    handle, temp_name = tempfile.mkstemp(dir=os.path.dirname(destination) or ".", suffix=".part")
+
+    try:
+        with os.fdopen(handle, 'wb', buffering=IMAGE_CHUNK_SIZE) as outfile:
+            for chunk in chunks:
+                outfile.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+
+        if validator.unchanged(digest.hexdigest(), headers):
+            os.remove(temp_name)
+            return "unchanged"
+
+        # mkstemp() files are private to the plugin; images are read by other processes.
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, destination)
+
+    except Exception:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+    validator.written(digest.hexdigest(), size)
+    return "miss"
+
+
+# =============================================================================
+def copy_image(path: str = "", validator: ImageValidator | None = None) -> str:
+    """
+    Copy a local image to the destination file unless it's unchanged
+
+    The source is unchanged when its modification time and size are the same as the last copy
+    (and the destination is still there.) Otherwise it's copied to a temporary file next to the
+    destination, which then replaces the destination in one step.
+
+    :param str path: the source file.
+    :param ImageValidator validator: the device's validators (and destination.)
+    :return str: 'hit' if the copy was skipped, 'miss' if the image was copied.
+    """
+    destination = validator.destination
+    stat        = os.stat(path)
+    source_stat = (stat.st_mtime_ns, stat.st_size)
+
+    if source_stat == validator.source_stat and os.path.isfile(destination):
+        validator.not_modified()
+        return "hit"
+
+    handle, temp_name = tempfile.mkstemp(dir=os.path.dirname(destination) or ".", suffix=".part")
+    os.close(handle)
+
+    try:
+        shutil.copyfile(path, temp_name)
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, destination)
+
+    except Exception:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+    validator.source_stat = source_stat
+    validator.written(None, stat.st_size)
+    return "miss"
@@ -0,0 +1,433 @@
+"""
+Satellite image frame history
+
+Each image an image downloader device writes replaces the last one. When frame history is turned
+on, the FrameRing class also keeps the most recent images (frames) on disk, in a folder next to the
+destination ('<destination name>_frames'), and evicts frames by count and age.
+
+The frames can be assembled into an animated loop next to the destination ('<destination
+name>_loop'): an APNG for .png destinations and an animated GIF for .gif destinations (JPEG has no
+animated form.) Frames aren't decoded or re-encoded. Each frame's compressed image data is read once,
+when the frame is added, and kept; the loop is written by wrapping the kept frames in the animation
+chunks (APNG) or blocks (GIF). Adding a frame reads only that frame, and evicting one drops it.
+"""
+
+import abc
+from collections import deque
+import os
+import shutil
+import struct
+import tempfile
+import time
+from typing import Any, NamedTuple
+import zlib
+
+PNG_SIGNATURE     = b'\x89PNG\r\n\x1a\n'
+PNG_HEADER_CHUNKS = (b'PLTE', b'tRNS', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'sBIT')  # copied to the loop
+PNG_COLOR_CHUNKS  = (b'PLTE', b'tRNS')  # frames with different palettes can't share a loop
+GIF_SIGNATURES    = (b'GIF87a', b'GIF89a')
+GIF_LOOP_FOREVER  = b'\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00'
+
+
+# =============================================================================
+class FrameRing:
+    """
+    Recent frames for one image downloader device
+
+    Frames are named for the time they were added (epoch milliseconds), so frames kept from an
+    earlier session are picked up again when the ring is created.
+
+    :param str destination: the image file.
+    :param int count: the maximum number of frames kept.
+    :param int max_age: frames older than this (in seconds) are evicted.
+    """
+    def __init__(self, destination: str = "", count: int = 12, max_age: int = 10800) -> None:
+        stem, self.extension = os.path.splitext(destination)
+        self.folder  = f"{stem}_frames"
+        self.count   = max(1, count)
+        self.max_age = max_age
+        os.makedirs(self.folder, exist_ok=True)
+
+        self.frames = deque(sorted(
+            entry.path for entry in os.scandir(self.folder)
+            if entry.name.endswith(self.extension) and entry.name[:-len(self.extension)].isdigit()
+        ))
+
+    # =============================================================================
+    @staticmethod
+    def frame_time(path: str = "") -> float:
+        """
+        Return the epoch a frame was added
+
+        :param str path:
+        :return float:
+        """
+        return int(os.path.splitext(os.path.basename(path))[0]) / 1000
+
+    # =============================================================================
+    def add(self, image: str = "") -> str:
+        """
+        Add an image to the ring
+
+        The frame is a hard link to the image where the file system allows it (the image is always
+        replaced rather than rewritten, so the frame keeps its content) and a copy otherwise.
+
+        :param str image: the image file.
+        :return str: the frame file.
+        """
+        stamp = time.time_ns() // 1000000
+
+        # Frames are kept in the order they were added, even if two arrive in the same millisecond.
+        if self.frames:
+            stamp = max(stamp, int(self.frame_time(self.frames[-1]) * 1000) + 1)
+        frame = os.path.join(self.folder, f"{stamp:013d}{self.extension}")
+
+        try:
+            os.link(image, frame)
+        except OSError:
+            shutil.copyfile(image, frame)
+
+        self.frames.append(frame)
+        return frame
+
+    # =============================================================================
+    def evict(self) -> list:
+        """
+        Remove frames beyond the frame count and frames that are too old
+
+        :return list: the frames removed.
+        """
+        oldest  = time.time() - self.max_age
+        removed = []
+
+        while self.frames and (len(self.frames) > self.count or self.frame_time(self.frames[0]) < oldest):
+            frame = self.frames.popleft()
+            removed.append(frame)
+            try:
+                os.remove(frame)
+            except FileNotFoundError:
+                pass
+
+        return removed
+
+
+# =============================================================================
+class PngFrame(NamedTuple):
+    """
+    The parts of a PNG frame that an APNG loop is built from
+    """
+    header: bytes        # IHDR chunk data
+    chunks: tuple        # ((chunk type, data), ...) for the chunks copied to the loop
+    image_data: bytes    # the frame's IDAT data, joined
+
+
+# =============================================================================
+class GifFrame(NamedTuple):
+    """
+    The parts of a GIF frame that a GIF loop is built from
+    """
+    width: int                  # logical screen width
+    height: int                 # logical screen height
+    transparency: int | None    # transparent color index
+    image: bytes                # image descriptor, local color table and image data
+
+
+# =============================================================================
+class FrameLoop(abc.ABC):
+    """
+    Base class for animated loops built from a frame ring
+
+    :param str path: the loop file.
+    :param int delay: the time each frame is shown, in milliseconds.
+    """
+    def __init__(self, path: str = "", delay: int = 500) -> None:
+        self.path  = path
+        self.delay = delay
+        self.parts = {}  # {frame file: frame parts}
+
+    # =============================================================================
+    @abc.abstractmethod
+    def read_frame(self, data: bytes = b"") -> Any:
+        """
+        Return the parts of a frame that the loop is built from
+
+        :param bytes data: the frame file contents.
+        :return NamedTuple:
+        """
+
+    # =============================================================================
+    @abc.abstractmethod
+    def assemble(self, frames: list | None = None) -> bytes:
+        """
+        Return the loop for the frame parts
+
+        :param list frames: frame parts, oldest first.
+        :return bytes:
+        """
+
+    # =============================================================================
+    def write(self, frames: deque | list | None = None) -> int:
+        """
+        Write the loop for the frames in a ring
+
+        Frames that haven't been read yet are read, and frames that have left the ring are
+        forgotten. Frames that can't be read are left out of the loop. The loop is written to a
+        temporary file and then moved into place.
+
+        :param deque frames: frame files, oldest first.
+        :return int: the number of frames in the loop.
+        """
+        frames = list(frames or [])
+
+        for frame in frames:
+            if frame not in self.parts:
+                try:
+                    with open(frame, 'rb') as infile:
+                        self.parts[frame] = self.read_frame(infile.read())
+                except (OSError, ValueError):
+                    self.parts[frame] = None
+
+        for frame in set(self.parts) - set(frames):
+            del self.parts[frame]
+
+        parts = [self.parts[frame] for frame in frames if self.parts[frame] is not None]
+        if not parts:
+            return 0
+
+        loop = self.assemble(parts)
+
+        handle, temp_name = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".part")
+        try:
+            with os.fdopen(handle, 'wb') as outfile:
+                outfile.write(loop)
+            os.chmod(temp_name, 0o644)
+            os.replace(temp_name, self.path)
+
+        except OSError:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+        return len(parts)
+
+
+# =============================================================================
+class ApngLoop(FrameLoop):
+    """
+    Animated PNG loop
+
+    Every frame has to have the same size and color format as the newest frame; older frames that
+    don't (the source changed, for example) are left out.
+    """
+    # =============================================================================
+    def read_frame(self, data: bytes = b"") -> PngFrame:
+        """
+        Return the header, color chunks and image data of a PNG
+
+        :param bytes data:
+        :return PngFrame:
+        """
+        if not data.startswith(PNG_SIGNATURE):
+            raise ValueError("Not a PNG image.")
+
+        header, chunks, image_data = None, [], []
+        position = len(PNG_SIGNATURE)
+
+        while position + 8 <= len(data):
+            length, kind = struct.unpack('>I4s', data[position:position + 8])
+            chunk_data   = data[position + 8:position + 8 + length]
+            position    += length + 12
+
+            if kind == b'IHDR':
+                header = chunk_data
+            elif kind == b'IDAT':
+                image_data.append(chunk_data)
+            elif kind in PNG_HEADER_CHUNKS and not image_data:
+                chunks.append((kind, chunk_data))
+            elif kind == b'IEND':
+                break
+
+        if header is None or not image_data:
+            raise ValueError("Incomplete PNG image.")
+
+        return PngFrame(header, tuple(chunks), b"".join(image_data))
+
+    # =============================================================================
+    @staticmethod
+    def chunk(kind: bytes = b"", data: bytes = b"") -> bytes:
+        """
+        Return a PNG chunk
+
+        :param bytes kind: the chunk type.
+        :param bytes data:
+        :return bytes:
+        """
+        crc = zlib.crc32(data, zlib.crc32(kind))
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', crc)
+
+    # =============================================================================
+    def assemble(self, frames: list | None = None) -> bytes:
+        """
+        Return the APNG for the frame parts
+
+        :param list frames: PngFrame, oldest first.
+        :return bytes:
+        """
+        newest = frames[-1]
+        colors = [chunk for chunk in newest.chunks if chunk[0] in PNG_COLOR_CHUNKS]
+        frames = [
+            frame for frame in frames
+            if frame.header == newest.header
+            and [chunk for chunk in frame.chunks if chunk[0] in PNG_COLOR_CHUNKS] == colors
+        ]
+        width, height = struct.unpack('>II', newest.header[:8])
+
+        # The animation control chunk (0 plays = loop forever) goes before the image data.
+        loop = [
+            PNG_SIGNATURE,
+            self.chunk(b'IHDR', newest.header),
+            self.chunk(b'acTL', struct.pack('>II', len(frames), 0)),
+            *(self.chunk(kind, data) for kind, data in newest.chunks),
+        ]
+        sequence = 0
+
+        for index, frame in enumerate(frames):
+            # Each frame replaces the whole image for the delay (in 1/1000 s.)
+            control = struct.pack('>IIIIIHHBB', sequence, width, height, 0, 0, self.delay, 1000, 0, 0)
+            loop.append(self.chunk(b'fcTL', control))
+            sequence += 1
+
+            # The first frame is also the image shown by viewers that don't animate PNGs.
+            if index == 0:
+                loop.append(self.chunk(b'IDAT', frame.image_data))
+            else:
+                loop.append(self.chunk(b'fdAT', struct.pack('>I', sequence) + frame.image_data))
+                sequence += 1
+
+        loop.append(self.chunk(b'IEND'))
+        return b"".join(loop)
+
+
+# =============================================================================
+class GifLoop(FrameLoop):
+    """
+    Animated GIF loop
+
+    Each frame keeps its own color table (the frame's global table becomes its local table), so
+    frames don't have to share a palette.
+    """
+    # =============================================================================
+    @staticmethod
+    def skip_sub_blocks(data: bytes = b"", position: int = 0) -> int:
+        """
+        Return the position after a run of GIF data sub-blocks
+
+        :param bytes data:
+        :param int position: the position of the first sub-block.
+        :return int:
+        """
+        while True:
+            if position >= len(data):
+                raise ValueError("Incomplete GIF image.")
+            length    = data[position]
+            position += length + 1
+            if not length:
+                return position
+
+    # =============================================================================
+    def read_frame(self, data: bytes = b"") -> GifFrame:
+        """
+        Return the screen size, transparency and first image of a GIF
+
+        :param bytes data:
+        :return GifFrame:
+        """
+        if data[:6] not in GIF_SIGNATURES:
+            raise ValueError("Not a GIF image.")
+
+        width, height, screen_flags = struct.unpack('<HHB', data[6:11])
+        position     = 13
+        color_table  = b""
+        transparency = None
+
+        if screen_flags & 0x80:
+            color_table = data[position:position + (3 << ((screen_flags & 0x07) + 1))]
+            position   += len(color_table)
+
+        while position < len(data):
+            block = data[position]
+
+            # Extensions; only the graphic control extension (transparency) is kept.
+            if block == 0x21:
+                if data[position + 1] == 0xF9 and data[position + 3] & 0x01:
+                    transparency = data[position + 6]
+                position = self.skip_sub_blocks(data, position + 2)
+
+            # The image; a frame without a local color table is given the global table.
+            elif block == 0x2C:
+                left, top, image_width, image_height, image_flags = struct.unpack(
+                    '<HHHHB', data[position + 1:position + 10]
+                )
+                position += 10
+
+                if image_flags & 0x80:
+                    table     = data[position:position + (3 << ((image_flags & 0x07) + 1))]
+                    position += len(table)
+                elif color_table:
+                    table       = color_table
+                    image_flags = (image_flags & 0x40) | 0x80 | (screen_flags & 0x07)
+                else:
+                    raise ValueError("GIF image without a color table.")
+
+                start    = position
+                position = self.skip_sub_blocks(data, position + 1)
+                image    = struct.pack(
+                    '<BHHHHB', 0x2C, left, top, image_width, image_height, image_flags
+                ) + table + data[start:position]
+
+                return GifFrame(width, height, transparency, image)
+
+            else:
+                break
+
+        raise ValueError("GIF without an image.")
+
+    # =============================================================================
+    def assemble(self, frames: list | None = None) -> bytes:
+        """
+        Return the animated GIF for the frame parts
+
+        :param list frames: GifFrame, oldest first.
+        :return bytes:
+        """
+        width  = max(frame.width for frame in frames)
+        height = max(frame.height for frame in frames)
+        delay  = max(1, round(self.delay / 10))  # 1/100 s
+
+        # Logical screen without a global color table (8 bit color resolution.)
+        loop = [b'GIF89a', struct.pack('<HHBBB', width, height, 0x70, 0, 0), GIF_LOOP_FOREVER]
+
+        for frame in frames:
+            # Frames with transparency restore the background so the frame before doesn't show.
+            if frame.transparency is None:
+                control = struct.pack('<BBBBHBB', 0x21, 0xF9, 4, 0x04, delay, 0, 0)
+            else:
+                control = struct.pack('<BBBBHBB', 0x21, 0xF9, 4, 0x09, delay, frame.transparency, 0)
+            loop += [control, frame.image]
+
+        loop.append(b';')
+        return b"".join(loop)
+
+
+# =============================================================================
+def frame_loop(destination: str = "", delay: int = 500) -> FrameLoop | None:
+    """
+    Return the animated loop for an image destination
+
+    :param str destination: the image file.
+    :param int delay: the time each frame is shown, in milliseconds.
+    :return FrameLoop: None if the image type can't be animated.
+    """
+    stem, extension = os.path.splitext(destination)
+    loop_type = {'.png': ApngLoop, '.gif': GifLoop}.get(extension.lower())
+    return loop_type(f"{stem}_loop{extension}", delay) if loop_type else None
@@ -0,0 +1,78 @@
+"""
+Compiled JSON key path lookups
+
+The Pirate Weather JSON is known to be inconsistent in the form of sometimes missing keys, so the
+plugin looks up values by key path with a default for anything that's missing. compile_path() turns a
+key path into an accessor function that's built once and reused. Each step that lands on a dict is a
+plain dict lookup; the list search (find the first item that has the key) is only used where a path
+crosses a list. Forecast model records (forecast_model.py) are read the same way as dicts.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable
+
+from forecast_model import Record
+
+NOT_AVAILABLE = "Not available"
+_MISSING      = object()
+
+
+# =============================================================================
+def search_path(obj: Any = None, keys: tuple = (), default: Any = NOT_AVAILABLE) -> Any:
+    """
+    Look up a key path, searching lists for the first item that has each key
+
+    This is the general form of the lookup. Credit: Jared Goguen at StackOverflow for initial
+    implementation.
+
+    :param dict obj:
+    :param tuple keys:
+    :param Any default:
+    :return Any:
+    """
+    current = obj
+
+    for key in keys:
+        current = current if isinstance(current, list) else [current]
+
+        try:
+            current = next(sub[key] for sub in current if key in sub)
+
+        except StopIteration:
+            return default
+
+    return current
+
+
+# =============================================================================
+@lru_cache(maxsize=None)
+def compile_path(keys: tuple = (), default: Any = NOT_AVAILABLE) -> Callable[[Any], Any]:
+    """
+    Compile a key path into an accessor
+
+    Accessors are cached, so compiling the same path again returns the same function.
+
+    :param tuple keys:
+    :param Any default: returned when any key in the path is missing.
+    :return Callable: lookup(obj)
+    """
+    if len(keys) == 1:
+        key = keys[0]
+
+        def lookup(obj: Any) -> Any:
+            if type(obj) is dict or isinstance(obj, Record):
+                return obj.get(key, default)
+            return search_path(obj, keys, default)
+
+    else:
+        def lookup(obj: Any) -> Any:
+            current = obj
+            for index, key in enumerate(keys):
+                if type(current) is not dict and not isinstance(current, Record):
+                    return search_path(current, keys[index:], default)
+                current = current.get(key, _MISSING)
+                if current is _MISSING:
+                    return default
+            return current
+
+    return lookup
@@ -37,15 +37,16 @@ located on GitHub: https://github.com/DaveL17/Fantastic-Weather/blob/master/LICE
 
 # Built-in modules
 import bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime as dt
 import logging
-import json
+import math
 import os
 import textwrap
 import urllib.parse
 import time
-from typing import Any
-import pytz
+from typing import Any, Callable
+from xml.etree import ElementTree
 from dateutil.parser import parse
 
 # Third-party modules
@@ -57,8 +58,21 @@ except ImportError:
 
 # My modules
 import DLFramework.DLFramework as Dave  # noqa
+from column_ops import fix_column, scale_column  # noqa
 from constants import *  # noqa
+from forecast_decoder import DEVICE_BLOCKS, decode, object_filter  # noqa
+from forecast_model import LocationContext, build_forecast  # noqa
+from image_downloader import IMAGE_CHUNK_SIZE, ImageValidator, copy_image, save_image, source_path  # noqa
+from image_frames import FrameRing, frame_loop  # noqa
+from json_lookup import NOT_AVAILABLE, compile_path, search_path  # noqa
 from plugin_defaults import kDefaultPluginPrefs  # noqa
+from quota_governor import QuotaGovernor  # noqa
+from scheduler import JobScheduler, staggered_time  # noqa
+from state_schema import STATE_SCHEMA  # noqa
+from time_service import day_strings, hour_strings, local_time, zone_info  # noqa
+from ui_formatter import UIFormatter  # noqa
+from weather_api import PirateWeatherClient  # noqa
+from weather_cache import ForecastCache  # noqa
 
 # =================================== HEADER ==================================
 __author__    = Dave.__author__
@@ -66,7 +80,7 @@ __copyright__ = Dave.__copyright__
 __license__   = Dave.__license__
 __build__     = Dave.__build__
 __title__     = "Fantastically Useful Weather Utility"
-__version__   = "2025.2.6"
+__version__   = "2025.3.0"
 
 
 # =============================================================================
@@ -91,13 +105,31 @@ class Plugin(indigo.PluginBase):
         self.inst_attr['ds_online'] = True
         self.inst_attr['pluginIsShuttingDown'] = False
         self.inst_attr['comm_error'] = False
+        self.inst_attr['dedup_calls_saved'] = 0
+        self.inst_attr['retry_schedule'] = {}  # {location: {'attempts': int, 'next_attempt': datetime}}
+        self.inst_attr['state_shadow'] = {}  # {dev.id: {state key: (value, uiValue)}}
+        self.inst_attr['formatters'] = {}  # {dev.id: UIFormatter}; rebuilt each cycle
+        self.inst_attr['image_validators'] = {}  # {dev.id: ImageValidator}
+        self.inst_attr['image_frames'] = {}  # {dev.id: (FrameRing, FrameLoop or None)}
+        self.inst_attr['location_context'] = {}  # {location: LocationContext}; rebuilt each cycle
+        self.inst_attr['alert_slots'] = {}  # {dev.id: alert fingerprints pushed to alert states 1-5}
+        self.inst_attr['active_alerts'] = {}  # {dev.id: ((fingerprint, title), ...)}
+        self.inst_attr['new_alerts'] = set()  # dev.ids with alerts the weatherAlert triggers haven't seen
+        self.inst_attr['next_refresh'] = {}  # {dev.id: epoch of the device's next refresh}
+        self.inst_attr['forced_jobs'] = set()  # jobs that refresh every device the next time they run
+        self.inst_attr['projected_types'] = {}  # {location: device types the location data were decoded for}
+        self.inst_attr['states_pushed'] = 0
+        self.inst_attr['states_suppressed'] = 0
         self.inst_attr['download_interval'] = dt.timedelta(
             seconds=int(self.pluginPrefs.get('downloadInterval', '900'))
         )
 
         self.masterWeatherDict    = {}
-        self.masterTriggerDict    = {}
-        self.pluginPrefs['dailyCallLimitReached'] = False
+        self.masterTriggerDict    = {'weatherAlert': {}, 'weatherSiteOffline': {}}
+        self.api_client           = None  # PirateWeatherClient; created in startup()
+        self.image_client         = None  # PirateWeatherClient for image downloads; created in startup()
+        self.forecast_cache       = None  # ForecastCache; created in startup()
+        self.scheduler            = JobScheduler()  # jobs run by runConcurrentThread()
 
         # ========================== API Poll Values ==========================
         last_poll = self.pluginPrefs.get('lastSuccessfulPoll', "1970-01-01 00:00:00")
@@ -112,6 +144,22 @@ class Plugin(indigo.PluginBase):
         except ValueError:
             self.inst_attr['next_poll'] = parse("1970-01-01 00:00:00")
 
+        # ========================== API Call Quota ===========================
+        try:
+            call_limit = int(self.pluginPrefs.get('callCounter', '999'))
+        except (TypeError, ValueError):
+            call_limit = 999
+
+        try:
+            daily_calls = int(self.pluginPrefs.get('dailyCallCounter', '0'))
+        except (TypeError, ValueError):
+            daily_calls = 0
+
+        self.quota = QuotaGovernor(
+            limit=call_limit, calls=daily_calls, day=self.pluginPrefs.get('dailyCallDay', "1970-01-01")
+        )
+        self.pluginPrefs['dailyCallLimitReached'] = self.quota.limit_reached
+
         # ========================== Initialize DLFramework ===========================
         self.Fogbert     = Dave.Fogbert(self)
         self.Formatter   = Dave.Formatter(self)
@@ -127,6 +175,16 @@ class Plugin(indigo.PluginBase):
         )
         self.indigo_log_handler.setLevel(int(debug_level))
 
+        # ============================= State Extractors ==============================
+        # {'Weather': record extractor, forecast type: [(state keys, column extractor), ...]}
+        self.inst_attr['extractors'] = self.compile_extractors()
+        # {forecast type: number of forecast periods}
+        self.inst_attr['forecast_periods'] = {
+            device_type: max((len(keys) for keys, _ in extractors), default=0)
+            for device_type, extractors in self.inst_attr['extractors'].items()
+            if isinstance(extractors, list)
+        }
+
     def log_plugin_environment(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
         """
         Log pluginEnvironment information when plugin is first started
@@ -172,6 +230,13 @@ class Plugin(indigo.PluginBase):
 
             self.pluginPrefs['nextPoll'] = f"{next_poll}"
 
+            # The refresh intervals may have changed. Rebuild the device schedule and wake the
+            # plugin thread so the new intervals take effect now.
+            self.inst_attr['next_poll'] = next_poll
+            self.inst_attr['next_refresh'].clear()
+            self.scheduler.schedule('refresh')
+            self.scheduler.schedule('images')
+
             # =================== Update Item List Temperature Precision ==================
             # For devices that display the temperature as their main UI state, try to set them to
             # their (potentially changed) ui format.
@@ -206,6 +271,19 @@ class Plugin(indigo.PluginBase):
             for k in values_dict:
                 self.pluginPrefs[k] = values_dict[k]
 
+            # The UI formats may have changed.
+            self.inst_attr['formatters'].clear()
+            self.inst_attr['alert_slots'].clear()
+
+            # The daily call limit may have changed.
+            self.quota.limit = int(self.pluginPrefs.get('callCounter', '999'))
+
+            # Resize the API connection pool in case the concurrent downloads setting has changed.
+            if self.api_client:
+                self.api_client.configure_pool(int(self.pluginPrefs.get('maxConcurrentDownloads', '4')))
+            if self.image_client:
+                self.image_client.configure_pool(int(self.pluginPrefs.get('maxImageDownloads', '2')))
+
     # =============================================================================
     def deviceStartComm(self, dev: indigo.Device | None = None) -> None:  # noqa
         """
@@ -218,6 +296,22 @@ class Plugin(indigo.PluginBase):
         # Check to see if the device profile has changed.
         dev.stateListOrDisplayStateIdChanged()
 
+        # Forget the states we last pushed so that the next update sends every state, and the UI
+        # formatter in case the device's units have changed.
+        self.inst_attr['state_shadow'].pop(dev.id, None)
+        self.inst_attr['formatters'].pop(dev.id, None)
+        self.inst_attr['alert_slots'].pop(dev.id, None)
+        self.inst_attr['image_validators'].pop(dev.id, None)
+        self.inst_attr['image_frames'].pop(dev.id, None)
+
+        # The device's refresh interval or location may have changed, so put it back on the
+        # schedule. Devices without data are refreshed right away.
+        self.inst_attr['next_refresh'].pop(dev.id, None)
+        if dev.pluginProps.get('isWeatherDevice', False):
+            self.scheduler.schedule('refresh', keep_earlier=True)
+        else:
+            self.scheduler.schedule('images', keep_earlier=True)
+
         # ========================= Update Temperature Display ========================
         # For devices that display the temperature as their UI state, try to set them to a value we
         # already have.
@@ -237,9 +331,25 @@ class Plugin(indigo.PluginBase):
 
         dev.updateStateOnServer('onOffState', value=True, uiValue=display_value)
 
+        # ============================== Device Address ===============================
+        if dev.pluginProps.get('isWeatherDevice', False):
+            self.update_device_address(dev)
+
+        # ========================== Populate From the Cache ==========================
+        # If we have cached data for the device location, update the device now rather than waiting
+        # for the next poll.
+        if dev.enabled and dev.pluginProps.get('isWeatherDevice', False):
+            location = self.device_location(dev)
+
+            if location in self.masterWeatherDict:
+                try:
+                    self.parse_weather_device(dev)
+
+                except Exception:  # noqa
+                    self.logger.debug(f"Unable to update {dev.name} from the forecast cache.", exc_info=True)
+
     # =============================================================================
-    @staticmethod
-    def deviceStopComm(dev: indigo.Device | None = None) -> None:  # noqa
+    def deviceStopComm(self, dev: indigo.Device | None = None) -> None:  # noqa
         """
         Title Placeholder
 
@@ -256,6 +366,32 @@ class Plugin(indigo.PluginBase):
 
         dev.updateStateOnServer('onOffState', value=False, uiValue="Disabled")
 
+        # ============================ Drop Scheduled Work ============================
+        # The device has been disabled or deleted (or is being edited; deviceStartComm() puts it
+        # back on the schedule.) Forget its refresh time and the retries for locations that no
+        # other device uses, and stop the refresh jobs that no device needs any longer.
+        self.inst_attr['next_refresh'].pop(dev.id, None)
+
+        is_weather = bool(dev.pluginProps.get('isWeatherDevice', False))
+        others     = [
+            other for other in indigo.devices.iter("self")
+            if other.id != dev.id and other.configured and other.enabled
+            and bool(other.pluginProps.get('isWeatherDevice', False)) == is_weather
+        ]
+
+        if not others:
+            self.scheduler.cancel('refresh' if is_weather else 'images')
+
+        if is_weather:
+            in_use = {self.device_location(other) for other in others}
+            for location in list(self.inst_attr['retry_schedule']):
+                if location not in in_use:
+                    self.inst_attr['retry_schedule'].pop(location, None)
+
+            if not self.inst_attr['retry_schedule']:
+                self.inst_attr['comm_error'] = False
+                self.scheduler.cancel('retry')
+
     # =============================================================================
     def getDeviceConfigUiValues(self, values_dict: indigo.Dict | None = None, type_id: str = "", dev_id: int = 0) -> indigo.Dict:  # noqa
         """
@@ -297,30 +433,41 @@ class Plugin(indigo.PluginBase):
 
         self.sleep(5)
 
+        # ============================== Initial Schedule =============================
+        # The first refresh is due at the saved next poll time (right away if that has passed.)
+        self.scheduler.schedule(
+            'refresh', (self.inst_attr['next_poll'] - dt.datetime.now()).total_seconds(),
+            keep_earlier=True
+        )
+        self.scheduler.schedule(
+            'images', (self.inst_attr['next_poll'] - dt.datetime.now()).total_seconds(),
+            keep_earlier=True
+        )
+        self.scheduler.schedule('emails', self.seconds_until_next_hour())
+
         try:
             while True:
+                self.run_scheduled_jobs()
 
-                # Load the download interval in case it's changed
-                refresh_time           = self.pluginPrefs.get('downloadInterval', '900')
-                self.inst_attr['download_interval'] = dt.timedelta(seconds=int(refresh_time))
-
-                self.inst_attr['last_successful_poll'] = (
-                    parse(self.pluginPrefs['lastSuccessfulPoll'])
-                )
-                self.inst_attr['next_poll']            = parse(self.pluginPrefs['nextPoll'])
-
-                # If we have reached the time for the next scheduled poll
-                if dt.datetime.now() > self.inst_attr['next_poll']:
-
-                    self.refresh_weather_data()
-                    self.trigger_processing()
-
-                # Wait 30 seconds before trying again.
-                self.sleep(30)
+                # Sleep until the next job is due. Config changes, actions and stopConcurrentThread()
+                # wake the scheduler early.
+                self.scheduler.wait(self.scheduler.seconds_until_next(default=900))
+                if self.stopThread:
+                    raise self.StopThread
 
         except self.StopThread:
             self.logger.debug("Stopping Fantastically Useful Weather Utility thread.")
 
+    # =============================================================================
+    def stopConcurrentThread(self) -> None:  # noqa
+        """
+        Standard Indigo method called to stop the plugin thread
+
+        Wakes the scheduler so that runConcurrentThread() doesn't wait out its current sleep.
+        """
+        super().stopConcurrentThread()
+        self.scheduler.wake()
+
     # =============================================================================
     @staticmethod
     def sendDevicePing(dev_id: int = 0, suppress_logging: bool = False) -> dict[str, str]:  # noqa
@@ -344,6 +491,14 @@ class Plugin(indigo.PluginBase):
         :return:
         """
         self.inst_attr['pluginIsShuttingDown'] = True
+        self.inst_attr['retry_schedule'].clear()
+        self.scheduler.clear()
+
+        # Close the pooled API and image sessions.
+        if self.api_client:
+            self.api_client.close()
+        if self.image_client:
+            self.image_client.close()
 
     # =============================================================================
     def startup(self) -> None:
@@ -358,35 +513,97 @@ class Plugin(indigo.PluginBase):
         # =========================== Audit OS Version ============================
         self.Fogbert.audit_os_version(min_ver=10.13)
 
+        # ============================ Pirate Weather API =============================
+        # The client holds a pooled session sized for the number of concurrent downloads.
+        self.api_client = PirateWeatherClient(
+            pool_size=int(self.pluginPrefs.get('maxConcurrentDownloads', '4'))
+        )
+
+        # Satellite images have a session (and connection pool) of their own.
+        self.image_client = PirateWeatherClient(
+            pool_size=int(self.pluginPrefs.get('maxImageDownloads', '2'))
+        )
+
+        # ============================== Forecast Cache ===============================
+        # Repopulate the masterWeatherDict from the last forecasts we downloaded so devices can be
+        # updated as they're started (see deviceStartComm).
+        try:
+            self.forecast_cache = ForecastCache(
+                cache_dir=(
+                    f"{indigo.server.getInstallFolderPath()}/Preferences/Plugins/{self.pluginId}/"
+                    f"{FORECAST_CACHE_FOLDER}"
+                ),
+                max_age=FORECAST_CACHE_MAX_AGE,
+                max_bytes=FORECAST_CACHE_MAX_BYTES,
+            )
+            self.forecast_cache.evict()
+            self.load_cached_weather_data()
+
+        except OSError:
+            self.logger.warning("Unable to open the forecast cache. Continuing without it.", exc_info=True)
+            self.forecast_cache = None
+
     # =============================================================================
     def triggerStartProcessing(self, trigger: indigo.Trigger) -> None:  # noqa
         """
-        Title Placeholder
+        Add a trigger to the trigger index
 
-        Body placeholder
+        Indigo calls this when a trigger is enabled (or created, edited or the plugin starts) and
+        calls triggerStopProcessing() when it's disabled (or edited or deleted), so the index always
+        holds the enabled triggers. trigger_processing() reads the index instead of looking the
+        triggers up each cycle.
 
         :param indigo.Trigger trigger:
         :return:
         """
-        dev_id = int(trigger.pluginProps['list_of_devices'])
-        timer  = trigger.pluginProps.get('offlineTimer', '60')
+        if not trigger.configured or trigger.pluginTypeId not in self.masterTriggerDict:
+            return
+
+        dev_id = self.trigger_device_id(trigger)
+        timer  = None
+
+        if trigger.pluginTypeId == 'weatherSiteOffline':
+            timer = trigger.pluginProps.get('offlineTimer', '60')
 
         # ============================= masterTriggerDict =============================
-        # masterTriggerDict contains information on Weather Location Offline triggers.
-        # {dev.id: (timer, trigger.id)}
-        if trigger.configured and trigger.pluginTypeId == 'weatherSiteOffline':
-            self.masterTriggerDict[dev_id] = (timer, trigger.id)
+        # masterTriggerDict indexes the enabled plugin triggers by type and device.
+        # {trigger type: {dev.id: {trigger.id: offline timer (minutes)}}}
+        if dev_id:
+            self.masterTriggerDict[trigger.pluginTypeId].setdefault(dev_id, {})[trigger.id] = timer
 
     # =============================================================================
     def triggerStopProcessing(self, trigger: indigo.Trigger) -> None:  # noqa
         """
-        Title Placeholder
+        Remove a trigger from the trigger index
 
-        Body placeholder
+        The trigger is looked for under every device in case its device was changed since it was
+        added.
+
+        :param indigo.Trigger trigger:
+        """
+        triggers_by_device = self.masterTriggerDict.get(trigger.pluginTypeId, {})
+
+        for dev_id in list(triggers_by_device):
+            triggers_by_device[dev_id].pop(trigger.id, None)
+            if not triggers_by_device[dev_id]:
+                del triggers_by_device[dev_id]
+
+    # =============================================================================
+    @staticmethod
+    def trigger_device_id(trigger: indigo.Trigger) -> int:
+        """
+        Return the id of the device a trigger watches
+
+        The event config field is 'list_of_devices'; 'listOfDevices' is read for older triggers.
 
         :param indigo.Trigger trigger:
+        :return int: 0 if the trigger doesn't have a device.
         """
-        # self.logger.debug(f"Stopping {trigger.name} trigger.")
+        props = trigger.pluginProps
+        try:
+            return int(props.get('list_of_devices', props.get('listOfDevices', 0)) or 0)
+        except (TypeError, ValueError):
+            return 0
 
     # =============================================================================
     def validateDeviceConfigUi(self, values_dict: indigo.Dict | None = None, type_id: str = "", dev_id: int = 0) -> tuple[bool, indigo.Dict] | tuple[bool, indigo.Dict, indigo.Dict]:  # noqa
@@ -421,6 +638,14 @@ class Plugin(indigo.PluginBase):
             except ValueError:
                 error_msg_dict['longitude'] = "The longitude value must be between -180 and 180."
 
+            # ====================================== Address ======================================
+            # Saved with the rest of the device config, so it doesn't need to be set again when
+            # the device starts.
+            if 'latitude' not in error_msg_dict and 'longitude' not in error_msg_dict:
+                values_dict['address'] = self.format_address(
+                    values_dict['latitude'], values_dict['longitude']
+                )
+
         # ===================================== Image Downloader =====================================
         if type_id == "satelliteImageDownloader":
             destination: str = values_dict['imageDestinationLocation']
@@ -441,8 +666,8 @@ class Plugin(indigo.PluginBase):
                             "The source URL does not appear to be valid (missing host)."
                         )
                 else:
-                    # Treat as a local file path.
-                    if not os.path.isfile(source):
+                    # Treat as a local file path (or file:// URL).
+                    if not os.path.isfile(source_path(source) or ""):
                         error_msg_dict['imageSourceLocation'] = (
                             f"The source '{source}' does not exist or is not a file."
                         )
@@ -470,6 +695,11 @@ class Plugin(indigo.PluginBase):
                     f"The plugin does not have permission to write to '{dest_dir}'."
                 )
 
+            # ===================================== Frame History =====================================
+            # Only GIF and PNG images can be made into an animated loop.
+            if values_dict.get('frameLoop', False) and not destination.endswith((".gif", ".png")):
+                error_msg_dict['frameLoop'] = "Animated loops need a '.gif' or '.png' destination."
+
             if len(error_msg_dict) > 0:
                 return False, values_dict, error_msg_dict
 
@@ -493,7 +723,8 @@ class Plugin(indigo.PluginBase):
         # Weather Site Offline trigger
         if type_id == 'weatherSiteOffline':
 
-            self.masterTriggerDict = {
+            # Disabled triggers aren't in the trigger index, so look at every offline trigger.
+            offline_triggers = {
                 int(trigger.pluginProps['list_of_devices']): (trigger.pluginProps['offlineTimer'],
                                                               trigger.id
                                                               )
@@ -502,7 +733,7 @@ class Plugin(indigo.PluginBase):
 
             # ======================== Validate Trigger Unique ========================
             # Limit weather location offline triggers to one per device
-            if dev_id in self.masterTriggerDict and event_id != self.masterTriggerDict[dev_id][1]:
+            if dev_id in offline_triggers and event_id != offline_triggers[dev_id][1]:
                 error_msg_dict['listOfDevices'] = (
                     "Please select a weather device without an existing offline trigger."
                 )
@@ -580,13 +811,15 @@ class Plugin(indigo.PluginBase):
         """
         Refresh all weather as a result of an action call
 
-        The action_refresh_weather() method calls the refresh_weather_data() method to request a
-        complete refresh of all weather data (Actions.XML call.)
+        The action_refresh_weather() method schedules a complete refresh of all weather data to run
+        right away on the plugin thread (Actions.xml and MenuItems.xml call.)
 
         :param indigo.Dict values_dict:
         """
         self.logger.debug("Refresh all weather data.")
-        self.refresh_weather_data()
+        self.inst_attr['forced_jobs'].update(('refresh', 'images'))
+        self.scheduler.schedule('refresh')
+        self.scheduler.schedule('images')
 
     # =============================================================================
     def comms_kill_all(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
@@ -616,6 +849,197 @@ class Plugin(indigo.PluginBase):
             except Exception:  # noqa
                 self.logger.error("Exception when trying to unkill all comms.", exc_info=True)
 
+    # =============================================================================
+    def compile_extractors(self) -> dict:
+        """
+        Compile the device state schema into state extractors
+
+        The state schema (state_schema.py) is compiled once when the plugin loads. Only states that
+        are declared in Devices.xml are compiled. Weather devices get one record extractor for all of
+        their fields (see make_record_extractor().) Forecast devices get one column extractor for
+        each field, covering each forecast period declared there (h01-h24, d01-d08, etc.; see
+        make_column_extractor().) Schema fields that aren't declared in Devices.xml are logged and
+        skipped.
+
+        :return dict: {device type: record extractor or [([state key, ...], column extractor), ...]}
+        """
+        devices_xml = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Devices.xml")
+        state_ids   = {
+            device.get('id'): {state.get('id') for state in device.iter('State')}
+            for device in ElementTree.parse(devices_xml).getroot().iter('Device')
+        }
+
+        extractors = {}
+        for device_type, fields in STATE_SCHEMA.items():
+            declared = state_ids.get(device_type, set())
+            forecast = any("{" in field[0] for field in fields)
+
+            for key, *_ in fields:
+                if key.format(1) not in declared:
+                    self.logger.warning(
+                        f"State schema field {key.format(1)} isn't a {device_type} device state."
+                    )
+
+            if not forecast:
+                extractors[device_type] = self.make_record_extractor(
+                    [field for field in fields if field[0] in declared]
+                )
+                continue
+
+            columns = []
+            for key, *field in fields:
+                keys   = []
+                period = 1
+                while key.format(period) in declared:
+                    keys.append(key.format(period))
+                    period += 1
+
+                if keys:
+                    columns.append((keys, self.make_column_extractor(keys, *field)))
+
+            extractors[device_type] = columns
+
+        return extractors
+
+    # =============================================================================
+    def make_column_extractor(self, keys: list | None = None, path: tuple = (), rule: str = "raw", formatter: str | None = None, icon: str | None = None) -> Callable:  # noqa
+        """
+        Build the extractor for one field of a forecast series
+
+        The column extractor reads the field's column from the series (see forecast_model.Series)
+        for every forecast period at once, applies the rule to the whole column (column_ops.py) and
+        appends one state (and icon state, if any) per period to the states list. It returns the
+        list of values so that callers can use them for derived states. UI values are formatted with
+        the device's UIFormatter (fmt). See state_schema.py for the rule, formatter and icon values.
+
+        :param list keys: the device state ids, one per forecast period.
+        :param tuple path: the JSON key path (relative to the forecast period.)
+        :param str rule:
+        :param str formatter:
+        :param str icon:
+        :return Callable: extract(series, fmt, states)
+        """
+        keys      = keys or []
+        ui_format = getattr(UIFormatter, formatter or "", None)
+        field     = path[-1]
+
+        def extract(series: Any, fmt: UIFormatter, states: list) -> list:
+            column = series.values(field, len(keys), NOT_AVAILABLE)
+
+            if rule == 'raw':
+                values = list(column)
+                states.extend({'key': key, 'value': value} for key, value in zip(keys, values))
+                return values
+
+            if rule == 'icon':
+                values = [value.replace('-', '_') for value in column]
+                states.extend({'key': key, 'value': value} for key, value in zip(keys, values))
+                return values
+
+            if rule == 'percent':
+                # Missing values fall through to fix_corrupted_batch() and display as "--".
+                column = scale_column(column, 100)
+
+            values, values_ui = self.fix_corrupted_batch(column)
+            self.append_fixed_states(
+                states, keys, values, values_ui, fmt, rule, formatter, ui_format, icon
+            )
+            return values
+
+        return extract
+
+    # =============================================================================
+    def make_record_extractor(self, fields: list | None = None) -> Callable:
+        """
+        Build the extractor for the fields of a single record (Weather devices)
+
+        The record extractor looks up every field, then runs the numeric fields through one
+        fix_corrupted_batch() call and appends the states (and icon states) to the states list. It
+        returns the values ({state key: value}) so that callers can use them for derived states.
+
+        :param list fields: state schema field tuples (see state_schema.py.)
+        :return Callable: extract(obj, fmt, states)
+        """
+        fields  = fields or []
+        lookups = [compile_path(tuple(path)) for _, path, *_ in fields]
+        numeric = [
+            (index, key, rule, formatter, getattr(UIFormatter, formatter or "", None), icon)
+            for index, (key, _, rule, formatter, icon) in enumerate(fields)
+            if rule in ('fix', 'percent', 'total', 'wind_name')
+        ]
+        text    = [
+            (index, key, rule) for index, (key, _, rule, *_) in enumerate(fields)
+            if rule in ('raw', 'icon')
+        ]
+
+        def extract(obj: Any, fmt: UIFormatter, states: list) -> dict:
+            raw    = [lookup(obj) for lookup in lookups]
+            values = {}
+
+            for index, key, rule in text:
+                value = raw[index].replace('-', '_') if rule == 'icon' else raw[index]
+                states.append({'key': key, 'value': value})
+                values[key] = value
+
+            column = [raw[index] for index, *_ in numeric]
+            percent = [position for position, (_, _, rule, *_) in enumerate(numeric) if rule == 'percent']
+            if percent:
+                # Missing values fall through to fix_corrupted_batch() and display as "--".
+                scaled = scale_column([column[position] for position in percent], 100)
+                for position, value in zip(percent, scaled):
+                    column[position] = value
+
+            fixed, fixed_ui = self.fix_corrupted_batch(column)
+            for (_, key, rule, formatter, ui_format, icon), value, value_ui in zip(numeric, fixed, fixed_ui):
+                values[key] = self.append_fixed_states(
+                    states, [key], [value], [value_ui], fmt, rule, formatter, ui_format, icon
+                )[0]
+
+            return values
+
+        return extract
+
+    # =============================================================================
+    @staticmethod
+    def append_fixed_states(states: list, keys: list, values: list, values_ui: list, fmt: UIFormatter, rule: str, formatter: str | None, ui_format: Callable | None, icon: str | None) -> list:  # noqa
+        """
+        Append the states for fixed numeric values (see fix_corrupted_batch())
+
+        :param list states: the states list.
+        :param list keys: the device state ids.
+        :param list values: the fixed values.
+        :param list values_ui: the fixed value strings.
+        :param UIFormatter fmt:
+        :param str rule:
+        :param str formatter:
+        :param Callable ui_format: the UIFormatter method for the formatter.
+        :param str icon:
+        :return list: the state values.
+        """
+        if rule == 'wind_name':
+            values = [fmt.wind_name(value) for value in values]
+            states.extend({'key': key, 'value': value} for key, value in zip(keys, values))
+            return values
+
+        if rule == 'total':
+            values    = [value * 24 for value in values]
+            values_ui = [ui_format(fmt, value) for value in values]
+        elif formatter == 'bearing':
+            # We don't need fractional bearing values for the UI.
+            values_ui = [int(float(value)) if value != "--" else value for value in values_ui]
+        elif ui_format:
+            values_ui = [ui_format(fmt, value) for value in values_ui]
+
+        states.extend(
+            {'key': key, 'value': value, 'uiValue': value_ui}
+            for key, value, value_ui in zip(keys, values, values_ui)
+        )
+        if icon == 'round':
+            states.extend({'key': f"{key}Icon", 'value': round(value)} for key, value in zip(keys, values))
+        elif icon == 'value':
+            states.extend({'key': f"{key}Icon", 'value': value} for key, value in zip(keys, values))
+        return values
+
     # =============================================================================
     def pirate_weather_site(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
         """
@@ -627,6 +1051,99 @@ class Plugin(indigo.PluginBase):
         """
         self.browserOpen(values_dict['launchParameters'])
 
+    # =============================================================================
+    def device_location(self, dev: indigo.Device | None = None) -> tuple[str, str]:  # noqa
+        """
+        Return the shared fetch key for a device location
+
+        The device_location() method rounds the device latitude and longitude to the grid set by
+        the 'locationPrecision' plugin preference (the number of decimal places) so that devices at
+        the same or nearby coordinates (i.e., "42.1" and "42.10") share one API call. The key is
+        used for the API request and to find the location in the masterWeatherDict. If the
+        coordinates can't be converted, the raw values are used.
+
+        :param indigo.Device dev:
+        :return tuple: (latitude, longitude)
+        """
+        latitude  = dev.pluginProps.get('latitude', "0")
+        longitude = dev.pluginProps.get('longitude', "0")
+
+        try:
+            precision = int(self.pluginPrefs.get('locationPrecision', '3'))
+            return f"{float(latitude):.{precision}f}", f"{float(longitude):.{precision}f}"
+
+        except ValueError:
+            return latitude, longitude
+
+    # =============================================================================
+    def location_context(self, location: tuple = ()) -> LocationContext:  # noqa
+        """
+        Return the values derived from a location's forecast that its devices share
+
+        The context is built the first time a device at the location is parsed in a cycle and is
+        reused by the other devices there. It's rebuilt each cycle (the date and time formats may
+        have changed) and whenever new data for the location land in the masterWeatherDict.
+
+        :param tuple location: (latitude, longitude)
+        :return LocationContext:
+        """
+        context = self.inst_attr['location_context'].get(location)
+
+        if context is None:
+            weather_data = self.masterWeatherDict[location]
+            epoch        = int(self.nested_lookup(obj=weather_data, keys=('currently', 'time')))
+            zone         = weather_data.get('timezone')
+            days         = list(weather_data.daily) if 'daily' in weather_data else []
+            observation  = time.localtime(epoch)
+
+            context = LocationContext(
+                epoch=epoch,
+                observation=f"Last updated on {time.strftime('%b %d, %H:%M %p %z', observation)}",
+                observation_24hr=time.strftime(
+                    f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}", observation
+                ),
+                zone=zone,
+                tzinfo=zone_info(zone) if zone else None,
+                sunrise=self.nested_lookup(obj=days, keys=('sunriseTime',)),
+                sunset=self.nested_lookup(obj=days, keys=('sunsetTime',)),
+                moon_phase=self.nested_lookup(obj=days, keys=('moonPhase',)),
+            )
+            self.inst_attr['location_context'][location] = context
+
+        return context
+
+    # =============================================================================
+    @staticmethod
+    def weather_device_types() -> frozenset:
+        """
+        Return the types of the enabled weather devices
+
+        Forecast data are decoded for these device types only (see forecast_decoder.py.)
+
+        :return frozenset:
+        """
+        return frozenset(
+            dev.deviceTypeId for dev in indigo.devices.iter("self")
+            if dev.configured and dev.enabled and dev.deviceTypeId in DEVICE_BLOCKS
+        )
+
+    # =============================================================================
+    def device_formatter(self, dev: indigo.Device | None = None) -> UIFormatter:  # noqa
+        """
+        Return the UI formatter for a device
+
+        Formatters are built once per device per cycle (the cache is cleared at the start of each
+        refresh, when the plugin prefs are saved and when the device starts.)
+
+        :param indigo.Device dev:
+        :return UIFormatter:
+        """
+        fmt = self.inst_attr['formatters'].get(dev.id)
+        if fmt is None:
+            fmt = UIFormatter(self.pluginPrefs, dev.pluginProps)
+            self.inst_attr['formatters'][dev.id] = fmt
+        return fmt
+
     # =============================================================================
     def dump_the_json(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
         """
@@ -651,7 +1168,7 @@ class Plugin(indigo.PluginBase):
 
                 for key in self.masterWeatherDict:
                     logfile.write(f"Location Specified: {key}\n")
-                    logfile.write(f"{self.masterWeatherDict[key]}\n\n")
+                    logfile.write(f"{self.masterWeatherDict[key].as_dict()}\n\n")
 
             indigo.server.log(f"Weather data written to: {file_name}")
 
@@ -672,8 +1189,8 @@ class Plugin(indigo.PluginBase):
         :param bool force:
         """
         try:
-            location       = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
-            forecast_day   = self.masterWeatherDict[location]['daily']['data'][0]
+            location       = self.device_location(dev)
+            forecast_day   = self.masterWeatherDict[location].daily[0]
             summary_wanted = dev.pluginProps.get('weatherSummaryEmail', '')
             summary_sent   = dev.states.get('weatherSummaryEmailSent', False)
 
@@ -712,7 +1229,7 @@ class Plugin(indigo.PluginBase):
                 forecast_time       = self.nested_lookup(forecast_day, keys=('time',))
                 forecast_day_name   = time.strftime('%A', time.localtime(float(forecast_time)))
                 humidity            = int(self.nested_lookup(forecast_day, keys=('humidity',)) * 100)
-                long_range_forecast = self.masterWeatherDict[location]['daily'].get('summary', 'Not available.')
+                long_range_forecast = self.masterWeatherDict[location].daily.get('summary', 'Not available.')
                 precip_intensity    = self.nested_lookup(forecast_day, keys=('precipIntensity',))
                 precip_probability  = int(self.nested_lookup(forecast_day, keys=('precipProbability',)) * 100)
                 precip_type         = self.nested_lookup(forecast_day, keys=('precipType',))
@@ -726,7 +1243,7 @@ class Plugin(indigo.PluginBase):
                 alerts_data         = self.nested_lookup(obj=weather_data, keys=('alerts',))
                 wind_bearing        = self.nested_lookup(forecast_day, keys=('windBearing',))
                 wind_gust           = int(round(self.nested_lookup(forecast_day, keys=('windGust',))))
-                wind_name           = self.ui_format_wind_name(val=wind_bearing)
+                wind_name           = self.device_formatter(dev).wind_name(wind_bearing)
                 wind_speed          = int(round(self.nested_lookup(forecast_day, keys=('windSpeed',))))
 
                 # Adjust for when precip intensity is "Not available."
@@ -874,25 +1391,40 @@ class Plugin(indigo.PluginBase):
 
         Sometimes DS receives corrupted data from personal weather stations. Could be zero, positive
         value or "--" or "-999.0" or "-9999.0". This method tries to "fix" these values for proper
-        display.
+        display. See fix_corrupted_batch() for sequences of values.
 
         :param str or class Float val:
         :return str' or class 'float val:
         """
-        try:
-            if float(val) < -55.728:  # -99 F = -55.728 C
-                reply = -99.0
-                reply_str = "--"
+        reply, reply_str = self.fix_corrupted_batch([val])
+        return reply[0], reply_str[0]
 
-            else:
-                reply = float(val)
-                reply_str = str(reply)
+    # =============================================================================
+    @staticmethod
+    def fix_corrupted_batch(values: list | None = None) -> tuple[list, list]:  # noqa
+        """
+        Format corrupted and missing data for a sequence of values
 
-        except (ValueError, TypeError):
-            reply = -99.0
-            reply_str = "--"
+        The batch form of fix_corrupted_data(): values below -55.728 (-99 F) and values that
+        aren't numbers become -99.0 (displayed as "--".) Typed forecast columns are checked in one
+        pass without per-value conversion errors (see column_ops.fix_column().)
+
+        :param list values: a sequence or forecast column.
+        :return tuple: ([float, ...], [str, ...])
+        """
+        return fix_column(values)
+
+    # =============================================================================
+    @staticmethod
+    def format_address(latitude: str | float = 0, longitude: str | float = 0) -> str:
+        """
+        Format a device address from its coordinates
 
-        return reply, reply_str
+        :param str latitude:
+        :param str longitude:
+        :return str:
+        """
+        return f"{float(latitude):.5f}, {float(longitude):.5f}"
 
     # =============================================================================
     def generator_time(self, filter: str = "", values_dict: indigo.Dict | None = None, type_id: str = "", target_id: int = 0) -> list[tuple[str, str]]:  # noqa
@@ -911,7 +1443,7 @@ class Plugin(indigo.PluginBase):
         return [(f"{hour:02.0f}:00", f"{hour:02.0f}:00") for hour in range(0, 24)]
 
     # =============================================================================
-    def get_satellite_image(self, dev: indigo.Device | None = None) -> bool:  # noqa
+    def get_satellite_image(self, dev: indigo.Device | None = None) -> tuple[str, float]:  # noqa
         """
         Download satellite image and save to file
 
@@ -919,198 +1451,425 @@ class Plugin(indigo.PluginBase):
         save it to a user-specified folder on the local server. This method is used by the Satellite
         Image Downloader device type.
 
+        The download is a conditional request (see image_downloader.py); when the image hasn't
+        changed, the destination file isn't touched. Otherwise, the image is written to a temporary
+        file and renamed over the destination. Local sources (a path or a file:// URL) are copied
+        instead, and only when the source file has changed. This method runs in the image download
+        pool worker threads, so it doesn't update the device; download_satellite_images() does that.
+
         :param indigo.Device dev:
+        :return tuple: (cache status, download time in seconds). The cache status is 'hit' (the
+            server said the image hadn't changed, or the local source hasn't changed), 'unchanged'
+            (the server sent the same image again) or 'miss' (a new image was written.)
         """
-        destination = dev.pluginProps['imageDestinationLocation']
-        source      = dev.pluginProps['imageSourceLocation']
+        source        = dev.pluginProps['imageSourceLocation']
+        validator     = self.inst_attr['image_validators'][dev.id]
+        local_path    = source_path(source)
+        get_data_time = time.monotonic()
 
-        try:
-            if destination.endswith((".gif", ".jpg", ".jpeg", ".png")):
+        if local_path is not None:
+            cache_status = copy_image(local_path, validator)
 
-                get_data_time = dt.datetime.now()
+        else:
+            with self.image_client.get(source, stream=True, headers=validator.request_headers()) as r:
+                if r.status_code == 304:
+                    cache_status = "hit"
+                    self.logger.debug(
+                        f"[{dev.name}] Image not modified ({validator.not_modified()} bytes saved)."
+                    )
 
-                # If requests doesn't work for some reason, revert to urllib.
-                try:
-                    r = requests.get(source, stream=True, timeout=20)
+                else:
                     r.raise_for_status()
+                    cache_status = save_image(r.iter_content(IMAGE_CHUNK_SIZE), validator, r.headers)
 
-                    with open(destination, 'wb') as img:
-                        for chunk in r.iter_content(2000):
-                            img.write(chunk)
+        download_time = time.monotonic() - get_data_time
+        self.update_image_frames(dev, new_frame=cache_status == "miss")
 
-                except requests.exceptions.ConnectionError:
-                    if not self.inst_attr['comm_error']:
-                        self.logger.error("Error downloading satellite image. (No comm.)")
-                        self.inst_attr['comm_error'] = True
-                    dev.updateStateOnServer('onOffState', value=False, uiValue="No comm")
-                    dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    return True
+        return cache_status, download_time
 
-                except requests.exceptions.Timeout:
-                    self.logger.warning("Error downloading satellite image (server timeout occurred).")
-                    return False
+    # =============================================================================
+    def update_image_frames(self, dev: indigo.Device | None = None, new_frame: bool = False) -> None:
+        """
+        Add a new image to the device's frame history and rewrite its animated loop
 
-                dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
+        Frames are evicted by count and age each time the device is downloaded, whether or not the
+        image changed. The loop is only rewritten when the frames change. See image_frames.py. This
+        method runs in the image download pool worker threads.
 
-                # Report results of download timer.
-                data_cycle_time = dt.datetime.now() - get_data_time
-                data_cycle_time = (dt.datetime.min + data_cycle_time).time()
-                self.logger.debug(f"Satellite image download time: {data_cycle_time}")
+        :param indigo.Device dev:
+        :param bool new_frame: True if a new image was written.
+        """
+        if dev.id not in self.inst_attr['image_frames']:
+            return
 
-                self.inst_attr['comm_error'] = False
-                return True
+        ring, loop = self.inst_attr['image_frames'][dev.id]
 
-            self.logger.error("The image destination must include one of these types (.gif, .jpg, .jpeg, .png)")
-            dev.updateStateOnServer('onOffState', value=False, uiValue="Bad Type")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-            return False
-
-        except (
-                requests.exceptions.ConnectionError, requests.exceptions.HTTPError,
-                requests.exceptions.Timeout, Exception
-        ):
-            self.inst_attr['comm_error'] = True
-            self.logger.error(f"[{dev.name}] Error downloading satellite image.", exc_info=True)
-            dev.updateStateOnServer('onOffState', value=False, uiValue="No comm")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-            return True
+        try:
+            if new_frame:
+                ring.add(self.inst_attr['image_validators'][dev.id].destination)
+
+            if ring.evict() or new_frame:
+                if loop:
+                    loop.write(ring.frames)
+
+        except OSError:
+            self.logger.warning(f"[{dev.name}] Unable to update the image frame history.", exc_info=True)
 
     # =============================================================================
-    def get_weather_data(self, dev: indigo.Device | None = None) -> dict:  # noqa
+    def get_weather_data(self, location: tuple = (), device_types: frozenset = frozenset()) -> tuple[dict, Any]:  # noqa
         """
-        Reach out to Dark Sky and download data for this location
+        Reach out to Pirate Weather and download data for this location
 
-        Grab the JSON return for the device. A separate call must be made for each weather device
-        because the data are location specific.
+        Grab the JSON return for the location. A separate call must be made for each location
+        because the data are location specific. This method is run by the fetch pool worker threads
+        (see fetch_weather_data()), so it returns the data to the caller rather than writing to the
+        masterWeatherDict itself. Only one attempt is made; communication errors are raised to the
+        caller, which hands the location to the retry scheduler. The response is decoded straight
+        from the body bytes and projected onto the fields that the device types consume (see
+        forecast_decoder.py) and then built into the forecast model (see forecast_model.py.)
 
-        :param indigo.Device dev:
-        :return class Dict:
+        :param tuple location: (latitude, longitude)
+        :param frozenset device_types: the device types that use the data.
+        :return tuple: (Forecast, API call counter)
         """
         api_key   = self.pluginPrefs['apiKey']
         language  = self.pluginPrefs['language']
-        latitude  = dev.pluginProps['latitude']
-        longitude = dev.pluginProps['longitude']
         units     = self.pluginPrefs['units']
-        location  = (latitude, longitude)
-        comm_timeout = 10
-
-        # Get the data and add it to the masterWeatherDict.
-        if location not in self.masterWeatherDict:
-            source_url = (
-                f"https://api.pirateweather.net/forecast/{api_key}/{latitude},{longitude}?"
-                f"exclude='minutely'&extend=''&units={units}&lang={language}"
+
+        # Start download timer.
+        get_data_time = dt.datetime.now()
+
+        r = self.api_client.get_forecast(
+            api_key=api_key, location=location, units=units, language=language
+        )
+
+        if r.status_code == 400:
+            self.logger.warning(
+                "Problem communicating with API. This problem can usually correct itself, but "
+                "reloading the plugin can often force a repair."
             )
+            self.logger.debug(f"Bad URL - Status Code: {r.status_code}")
+            raise requests.exceptions.ConnectionError
 
-            # Start download timer.
-            get_data_time = dt.datetime.now()
+        r.raise_for_status()
 
-            while True:
-                try:
-                    r = requests.get(url=source_url, timeout=20)
+        # We decode the body bytes below, so we don't use requests' built-in decoder (or r.text,
+        # which makes a decoded copy of the whole body.)
+        raw_json = r.content
 
-                    if r.status_code == 400:
-                        self.logger.warning(
-                            "Problem communicating with API. This problem can usually "
-                            "correct itself, but reloading the plugin can often force a "
-                            "repair."
-                        )
-                        self.logger.debug(f"Bad URL - Status Code: {r.status_code}")
-                        raise requests.exceptions.ConnectionError
+        # Report results of download timer.
+        data_cycle_time = dt.datetime.now() - get_data_time
+        data_cycle_time = (dt.datetime.min + data_cycle_time).time()
+        self.logger.debug(f"Weather data download time for {location}: {data_cycle_time}")
 
-                    r.raise_for_status()
+        # Load the JSON data, keeping only the fields the devices use.
+        try:
+            parsed_json = decode(raw_json, device_types)
+
+        except Exception:  # noqa
+            self.logger.error("Unable to decode data.", exc_info=True)
+            parsed_json = {}
+
+        # Save the raw JSON so that it's available if the plugin is restarted.
+        if parsed_json and self.forecast_cache:
+            try:
+                self.forecast_cache.save(
+                    location=location, units=units, language=language, raw_json=raw_json
+                )
+            except OSError:
+                self.logger.debug(f"Unable to cache weather data for {location}.", exc_info=True)
+
+        return build_forecast(parsed_json), r.headers.get('X-Forecast-API-Calls', -1)
 
-                    # We convert the file to a JSON object below, so we don't use requests'
-                    # built-in decoder.
-                    json_string = r.text
-                    self.inst_attr['comm_error'] = False
+    # =============================================================================
+    def fetch_weather_data(self, locations: set | None = None) -> None:  # noqa
+        """
+        Download weather data for all locations in parallel
+
+        The fetch_weather_data() method downloads each distinct location through a bounded thread
+        pool and adds the results to the masterWeatherDict (replacing the data held for the
+        location.) The number of simultaneous downloads is controlled by the 'maxConcurrentDownloads'
+        plugin preference. The device parsers are not run until every download has completed.
+        Locations that can't be downloaded keep their last good data and are handed to the retry
+        scheduler (see schedule_retry()) so that they don't hold up the other locations.
+
+        :param set locations: {(latitude, longitude), ...}
+        """
+        locations = list(locations or set())
+
+        if not locations or self.inst_attr['pluginIsShuttingDown']:
+            return
+
+        max_workers  = max(1, int(self.pluginPrefs.get('maxConcurrentDownloads', '4')))
+        fetch_time   = dt.datetime.now()
+        device_types = self.weather_device_types()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(locations))) as pool:
+            futures = {
+                pool.submit(self.get_weather_data, location, device_types): location
+                for location in locations
+            }
+
+            for future in as_completed(futures):
+                location = futures[future]
+
+                # Don't wait on downloads that haven't started if the plugin is shutting down.
+                if self.inst_attr['pluginIsShuttingDown']:
+                    for pending in futures:
+                        pending.cancel()
                     break
 
-                # No connection to Internet, no response from API. Let's keep trying.
+                try:
+                    parsed_json, call_counter = future.result()
+
+                # No connection to Internet, no response from API. Try again later.
                 except (
                         requests.exceptions.ConnectionError,
                         requests.exceptions.Timeout,
                         requests.exceptions.HTTPError
                 ):
+                    self.schedule_retry(location)
+                    continue
 
-                    if comm_timeout < 900:
-                        self.logger.warning(
-                            f"Unable to make a successful connection to API. Retrying in "
-                            f"{comm_timeout} seconds."
-                        )
+                except Exception:  # noqa
+                    self.logger.error(f"Problem downloading weather data for {location}.", exc_info=True)
+                    self.schedule_retry(location)
+                    continue
 
-                    else:
-                        self.logger.warning("Unable to reach API. Retrying in 15 minutes.")
+                # Add location JSON to master weather dictionary.
+                self.masterWeatherDict[location] = parsed_json
+                self.inst_attr['location_context'].pop(location, None)
+                self.inst_attr['projected_types'][location] = device_types
+                self.inst_attr['retry_schedule'].pop(location, None)
 
-                    time.sleep(comm_timeout)
+                # Increment the call counter
+                self.quota.record(call_counter)
 
-                    # Keep adding 10 seconds to timeout until it reaches one minute.
-                    # Then, jack it up to 15 minutes.
-                    if comm_timeout < 60:
-                        comm_timeout += 10
-                    else:
-                        comm_timeout = 900
+        if not self.inst_attr['retry_schedule']:
+            self.inst_attr['comm_error'] = False
 
-                    self.inst_attr['comm_error'] = True
-                    for device in indigo.devices.iter("self"):
-                        device.updateStateOnServer("onOffState", value=False, uiValue="No Comm")
-                        device.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+        self.publish_quota()
 
-                except Exception:  # noqa
-                    self.logger.debug("Error obtaining weather data", exc_info=True)
+        # Keep the forecast cache within its age and size limits.
+        if self.forecast_cache:
+            try:
+                self.forecast_cache.evict()
+            except OSError:
+                self.logger.debug("Unable to evict forecast cache entries.", exc_info=True)
+
+        # Report results of fetch timer.
+        fetch_cycle_time = dt.datetime.now() - fetch_time
+        fetch_cycle_time = (dt.datetime.min + fetch_cycle_time).time()
+        self.logger.debug(
+            f"Downloaded {len(locations)} location(s) in {fetch_cycle_time} "
+            f"(max concurrent downloads: {max_workers})."
+        )
 
-            # Report results of download timer.
-            data_cycle_time = dt.datetime.now() - get_data_time
-            data_cycle_time = (dt.datetime.min + data_cycle_time).time()
-            self.logger.threaddebug(f"Weather data download time: {data_cycle_time}")
+    # =============================================================================
+    def schedule_retry(self, location: tuple = ()) -> None:  # noqa
+        """
+        Schedule another download attempt for a failed location
 
-            # Load the JSON data from the file.
-            try:
-                parsed_json = json.loads(json_string)
+        The schedule_retry() method records per-location exponential backoff state in the
+        retry_schedule. The wait starts at 10 seconds and doubles with each failed attempt until it
+        reaches 15 minutes. The location is retried by retry_weather_data() from the main thread
+        when its wait has passed; other locations are not affected.
 
-            except Exception:  # noqa
-                self.logger.error("Unable to decode data.", exc_info=True)
-                parsed_json = {}
+        :param tuple location: (latitude, longitude)
+        """
+        attempts = self.inst_attr['retry_schedule'].get(location, {}).get('attempts', 0) + 1
+        delay    = min(10 * 2 ** (attempts - 1), 900)
 
-            # Add location JSON to master weather dictionary.
-            self.masterWeatherDict[location] = parsed_json
+        self.inst_attr['retry_schedule'][location] = {
+            'attempts': attempts,
+            'next_attempt': dt.datetime.now() + dt.timedelta(seconds=delay),
+        }
+        self.inst_attr['comm_error'] = True
+        self.scheduler.schedule('retry', delay, keep_earlier=True)
 
-            # Increment the call counter
-            self.pluginPrefs['dailyCallCounter'] = r.headers.get('X-Forecast-API-Calls', -1)
+        if delay < 900:
+            self.logger.warning(
+                f"Unable to make a successful connection to API for {location}. Retrying in {delay} "
+                f"seconds."
+            )
+        else:
+            self.logger.warning(f"Unable to reach API for {location}. Retrying in 15 minutes.")
 
-            # We've been successful, mark device online
-            self.inst_attr['comm_error'] = False
-            dev.updateStateOnServer('onOffState', value=True)
+    # =============================================================================
+    def retry_weather_data(self) -> None:
+        """
+        Retry locations whose download failed
 
-        # We could have come here from several places. Return to whence we came
-        # to further process the weather data.
-        self.inst_attr['ds_online'] = True
-        return self.masterWeatherDict
+        The retry_weather_data() method downloads the locations in the retry_schedule whose backoff
+        time has passed and then parses the devices at those locations. Retries are held to the
+        daily API call limit like any other download; locations the calls left today can't cover
+        wait 15 minutes (without counting another attempt) before they're looked at again.
+        """
+        if self.inst_attr['pluginIsShuttingDown']:
+            return
+
+        now = dt.datetime.now()
+        due = {
+            location for location, state in list(self.inst_attr['retry_schedule'].items())
+            if state['next_attempt'] <= now
+        }
+
+        if not due:
+            return
+
+        weather_devices = [
+            dev for dev in indigo.devices.iter("self")
+            if dev.configured and dev.enabled and dev.pluginProps.get('isWeatherDevice', False)
+            and self.device_location(dev) in due
+        ]
+
+        allowed, deferred = self.quota.allot(self.rank_locations(due, weather_devices))
+        for location in deferred:
+            self.inst_attr['retry_schedule'][location]['next_attempt'] = now + dt.timedelta(seconds=900)
+
+        if deferred:
+            self.logger.debug(
+                f"The daily API call limit ({self.quota.limit}) leaves {len(allowed)} call(s) today. "
+                f"Postponing {len(deferred)} retry(s)."
+            )
+
+        due = set(allowed)
+        if not due:
+            return
+
+        self.fetch_weather_data(due)
+
+        for dev in weather_devices:
+            location = self.device_location(dev)
+
+            if location in due and location in self.masterWeatherDict:
+                dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
+                self.parse_weather_device(dev)
 
     # =============================================================================
-    def list_of_devices(self, filter: str = "", values_dict: indigo.Dict | None = None, target_id: str = "", trigger_id: int = 0) -> list:  # noqa
+    def seconds_until_next_retry(self, default: float = 30) -> float:
         """
-        Generate list of devices for offline trigger
+        Return the number of seconds until the next scheduled retry
 
-        list_of_devices returns a list of plugin devices limited to weather devices only (not
-        forecast devices, etc.) when the Weather Location Offline trigger is fired.
+        Used by runConcurrentThread() to wake up in time for the next retry. Returns the default
+        if nothing is waiting to be retried.
 
-        :param str filter:
-        :param indigo.Dict values_dict:
-        :param str target_id:
-        :param int trigger_id:
-        :return list:
+        :param float default:
+        :return float:
         """
-        return self.Fogbert.deviceList(dev_filter='self')
+        schedule = list(self.inst_attr['retry_schedule'].values())
+
+        if not schedule:
+            return default
+
+        next_attempt = min(state['next_attempt'] for state in schedule)
+        return max(1.0, min(default, (next_attempt - dt.datetime.now()).total_seconds()))
 
     # =============================================================================
-    def list_of_weather_devices(
-            self, filter: str = "", values_dict: indigo.Dict | None = None, target_id: str = "", trigger_id: int = 0  # noqa
-    ) -> list:
+    def publish_quota(self) -> None:
         """
-        Generate list of devices for severe weather alert trigger
+        Save the quota governor counts to the plugin prefs
 
-        list_of_weather_devices returns a list of plugin devices limited to weather devices only
+        The counts are shown (read only) in the plugin configuration dialog and are read back by the
+        quota governor when the plugin restarts.
+        """
+        self.pluginPrefs['dailyCallCounter']      = f"{self.quota.calls}"
+        self.pluginPrefs['dailyCallDay']          = self.quota.day
+        self.pluginPrefs['dailyCallLimitReached'] = self.quota.limit_reached
+        self.pluginPrefs['quotaProjectedCalls']   = f"{self.quota.projected}"
+        self.pluginPrefs['quotaIntervalScale']    = f"{self.quota.scale:0.2f}"
+
+    # =============================================================================
+    def rank_locations(self, locations: set | None = None, devices: list | None = None) -> list:
+        """
+        Rank locations for the quota governor, highest priority first
+
+        Locations used by more devices are ranked higher. Ties go to the location whose devices
+        have the shortest refresh interval.
+
+        :param set locations: {(latitude, longitude), ...}
+        :param list devices: the weather devices that are due.
+        :return list:
+        """
+        priority = {location: [0, math.inf] for location in locations or set()}
+
+        for dev in devices or []:
+            location = self.device_location(dev)
+            if location in priority:
+                priority[location][0] += 1
+                priority[location][1] = min(
+                    priority[location][1], self.device_refresh_interval(dev, stretch=False)
+                )
+
+        return sorted(priority, key=lambda location: (-priority[location][0], priority[location][1]))
+
+    # =============================================================================
+    def update_quota(self, devices: list | None = None) -> None:
+        """
+        Project the rest of the day's API calls and stretch the refresh intervals to fit
+
+        Each location is projected to make one call per refresh interval (the shortest interval of
+        the devices at that location) until midnight (UTC).
+
+        :param list devices: the enabled weather devices.
+        """
+        limit_reached = self.quota.limit_reached
+        intervals     = {}
+
+        for dev in devices or []:
+            location = self.device_location(dev)
+            interval = self.device_refresh_interval(dev, stretch=False)
+            intervals[location] = min(intervals.get(location, interval), interval)
+
+        if self.quota.roll_over():
+            # A new UTC day. Drop the schedules that were stretched out yesterday.
+            self.inst_attr['next_refresh'].clear()
+
+        scale = self.quota.scale
+        self.quota.project(list(intervals.values()))
+
+        if self.quota.scale != scale:
+            self.logger.info(
+                f"{self.quota.calls} of {self.quota.limit} API calls used today. Refresh intervals "
+                f"are now {self.quota.scale:0.2f}x normal to stay within the daily limit."
+            )
+
+        if self.quota.limit_reached and not limit_reached:
+            self.logger.warning(
+                "The daily API call limit has been reached. Weather data will be refreshed after "
+                "midnight (UTC)."
+            )
+
+        self.logger.debug(
+            f"API calls today: {self.quota.calls} of {self.quota.limit}. Projected calls before "
+            f"midnight (UTC): {self.quota.projected}. Interval multiplier: {self.quota.scale:0.2f}."
+        )
+        self.publish_quota()
+
+    # =============================================================================
+    def list_of_devices(self, filter: str = "", values_dict: indigo.Dict | None = None, target_id: str = "", trigger_id: int = 0) -> list:  # noqa
+        """
+        Generate list of devices for offline trigger
+
+        list_of_devices returns a list of plugin devices limited to weather devices only (not
+        forecast devices, etc.) when the Weather Location Offline trigger is fired.
+
+        :param str filter:
+        :param indigo.Dict values_dict:
+        :param str target_id:
+        :param int trigger_id:
+        :return list:
+        """
+        return self.Fogbert.deviceList(dev_filter='self')
+
+    # =============================================================================
+    def list_of_weather_devices(
+            self, filter: str = "", values_dict: indigo.Dict | None = None, target_id: str = "", trigger_id: int = 0  # noqa
+    ) -> list:
+        """
+        Generate list of devices for severe weather alert trigger
+
+        list_of_weather_devices returns a list of plugin devices limited to weather devices only
         (not forecast devices, etc.) when severe weather alert trigger is fired.
 
         :param str filter:
@@ -1121,6 +1880,42 @@ class Plugin(indigo.PluginBase):
         """
         return self.Fogbert.deviceList(dev_filter='self.Weather')
 
+    # =============================================================================
+    def load_cached_weather_data(self) -> None:
+        """
+        Load cached weather data into the masterWeatherDict
+
+        The load_cached_weather_data() method reads the forecast cache for the location of each
+        weather device (using the current units and language settings) so that devices can be
+        updated without a network call when the plugin starts.
+        """
+        units        = self.pluginPrefs.get('units', 'auto')
+        language     = self.pluginPrefs.get('language', 'en')
+        device_types = self.weather_device_types()
+        locations    = {
+            self.device_location(dev)
+            for dev in indigo.devices.iter("self")
+            if dev.configured and dev.pluginProps.get('isWeatherDevice', False)
+        }
+
+        for location in locations:
+            cached = self.forecast_cache.load(
+                location=location, units=units, language=language,
+                object_pairs_hook=object_filter(device_types)
+            )
+
+            if cached:
+                parsed_json, fetch_epoch = cached
+                self.masterWeatherDict[location] = build_forecast(parsed_json)
+                self.inst_attr['location_context'].pop(location, None)
+                self.inst_attr['projected_types'][location] = device_types
+                self.logger.debug(
+                    f"Loaded cached weather data for {location} (fetched "
+                    f"{dt.datetime.fromtimestamp(fetch_epoch):%Y-%m-%d %H:%M:%S})."
+                )
+
+        self.logger.debug(f"Loaded {len(self.masterWeatherDict)} location(s) from the forecast cache.")
+
     # =============================================================================
     def nested_lookup(self, obj: dict | list | None = None, keys: tuple | list | None = None, default: Any = "Not available") -> Any:  # noqa
         """
@@ -1133,198 +1928,178 @@ class Plugin(indigo.PluginBase):
         says that there are times when they won't send a key (for example, if they don't have data)
         so this is to be expected.
 
-        Credit: Jared Goguen at StackOverflow for initial implementation.
+        Key paths are compiled into accessors the first time they're used (see json_lookup.py).
 
         :param class dict obj:
         :param class list keys:
         :param str default:
         :return dict:
         """
-        current = obj
-
-        for key in keys:
-            current = current if isinstance(current, list) else [current]
-
-            try:
-                current = next(sub[key] for sub in current if key in sub)
+        try:
+            lookup = compile_path(tuple(keys), default)
 
-            except StopIteration:
-                return default
+        except TypeError:
+            # An unhashable default can't be used to cache the accessor.
+            return search_path(obj, tuple(keys), default)
 
-        return current
+        return lookup(obj)
 
     # =============================================================================
     def parse_alerts_data(self, dev: indigo.Device | None = None) -> None:  # noqa
         """
         Parse alerts data to devices
 
-        The parse_alerts_data() method takes weather alert data and parses it to device states. This
-        segment iterates through all available alert information. It retains only the first five
-        alerts. We set all alerts to an empty string each time, and then repopulate (this clears out
-        alerts that may have expired.) If there are no alerts, set alert status to false.
+        The parse_alerts_data() method takes weather alert data and parses it to device states. It
+        retains only the first five alerts. Each alert is identified by its fingerprint (a hash of
+        its uri, time and title; see forecast_model.Alert), and only the alert states whose alert
+        has changed since the last cycle are rebuilt. Slots whose alert has expired are cleared.
+        New and expired alerts are logged once, and devices with new alerts are flagged for the
+        weatherAlert triggers (see trigger_processing().) After the plugin starts, the alerts that
+        the device states already show (and alerts past the fifth, which the states don't keep)
+        aren't new. If there are no alerts, set alert status to false.
 
         :param indigo.Device dev:
         """
         alerts_states_list = []  # Alerts_states_list needs to be a list.
 
         try:
-            alert_array = []
             # Whether to log alerts
             alerts_logging     = self.pluginPrefs.get('alertLogging', True)
             # Suppress alert messages for dev
             alerts_suppressed  = dev.pluginProps.get('suppressWeatherAlerts', False)
             # Suppress 'No Alert' messages
             no_alerts_logging  = self.pluginPrefs.get('noAlertLogging', False)
+            log_alerts         = alerts_logging and not alerts_suppressed
 
-            location: tuple    = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
+            location: tuple    = self.device_location(dev)
             weather_data: dict = self.masterWeatherDict[location]
-            alerts_data: dict  = self.nested_lookup(obj=weather_data, keys=('alerts',))
+            alerts_data        = self.nested_lookup(obj=weather_data, keys=('alerts',))
+            alert_array        = [] if alerts_data == "Not available" else list(alerts_data)
             preferred_time     = dev.pluginProps.get('time_zone', 'time_here')
-            timezone           = pytz.timezone(weather_data['timezone'])
-
-            # ============================= Delete Old Alerts =============================
-            for alert_counter in range(1, 6):
-                for state in ('alertDescription', 'alertExpires', 'alertRegions', 'alertSeverity',
-                              'alertTime', 'alertTitle', 'alertUri'
-                              ):
-                    alerts_states_list.append(
-                        {'key': f"{state}{alert_counter}", 'value': " ", 'uiValue': " "}
-                    )
-
-            # ================================= No Alerts =================================
-            if alerts_data == "Not available":
-                alerts_states_list.append(
-                    {'key': 'alertStatus', 'value': False, 'uiValue': "False"}
+            zone               = weather_data.timezone if preferred_time == "time_there" else None
+
+            active = tuple(
+                (alert.fingerprint, alert.get('title', "Not provided.").strip()) for alert in alert_array
+            )
+            slots    = tuple(fingerprint for fingerprint, _ in active[:5]) + (None,) * max(0, 5 - len(active))
+            previous = self.inst_attr['active_alerts'].get(dev.id)
+            pushed   = self.inst_attr['alert_slots'].get(dev.id)
+            restart  = previous is None
+
+            # The first cycle after the plugin starts: the alerts the device states already show
+            # aren't new. Alerts past the fifth aren't kept in the states, so they're taken as seen.
+            if restart:
+                shown = {
+                    (dev.states.get(f"alertUri{n}"), dev.states.get(f"alertTitle{n}")) for n in range(1, 6)
+                }
+                previous = tuple(
+                    (fingerprint, title)
+                    for index, (alert, (fingerprint, title)) in enumerate(zip(alert_array, active))
+                    if index >= 5 or (f"{alert.get('uri', 'Not provided.')}", title) in shown
                 )
 
-                if alerts_logging and not no_alerts_logging and not alerts_suppressed:
-                    self.logger.info(f"{dev.name} There are no severe weather alerts.")
+            # Nothing has changed since the last cycle.
+            if active == previous and slots == pushed:
+                return
 
-            # ============================ At Least One Alert =============================
-            else:
-                alerts_states_list.append({'key': 'alertStatus', 'value': True, 'uiValue': "True"})
-
-                for alert in alerts_data:
-
-                    alert_tuple = (
-                        alert.get('description', "Not provided.").strip(),
-                        alert.get('expires', "Not provided."),
-                        alert.get('regions', "Not provided."),
-                        alert.get('severity', "Not provided."),
-                        alert.get('time', "Not provided."),
-                        alert.get('title', "Not provided.").strip(),
-                        alert.get('uri', "Not provided."),
-                    )
+            seen    = {fingerprint for fingerprint, _ in previous}
+            current = {fingerprint for fingerprint, _ in active}
+            new     = [index for index, (fingerprint, _) in enumerate(active) if fingerprint not in seen]
 
-                    alert_array.append(alert_tuple)
+            # ================================ Alert Log =================================
+            if log_alerts:
+                for fingerprint, title in previous:
+                    if fingerprint not in current:
+                        self.logger.info(f"{dev.name}: The severe weather alert '{title}' has ended.")
 
+            if not alert_array:
+                if log_alerts and not no_alerts_logging and (restart or previous):
+                    self.logger.info(f"{dev.name} There are no severe weather alerts.")
+
+            elif new and log_alerts:
                 if len(alert_array) == 1:
-                    # If user has enabled alert logging, write alert message to the Indigo log.
-                    if alerts_logging and not alerts_suppressed:
-                        self.logger.info(f"{dev.name}: There is 1 severe weather alert.")
+                    self.logger.info(f"{dev.name}: There is 1 severe weather alert.")
+                elif len(alert_array) <= 5:
+                    self.logger.info(f"{dev.name}: There are {len(alert_array)} severe weather alerts.")
                 else:
-                    # If user has enabled alert logging, write alert message to the Indigo log.
-                    if alerts_logging and not alerts_suppressed and 0 < len(alert_array) <= 5:
-                        self.logger.info(
-                            f"{dev.name}: There are {len(alert_array)} severe weather alerts."
-                        )
-
-                    # If user has enabled alert logging, write alert message to the Indigo log.
-                    if alerts_logging and not alerts_suppressed and len(alert_array) > 5:
-                        self.logger.info(
-                            f"{dev.name}: The plugin only retains information for the first 5 "
-                            f"alerts."
-                        )
-
-                alert_counter = 1
-                for alert in range(len(alert_array)):
-                    if alert_counter <= 5:
-
-                        # Convert epoch times to human friendly values
+                    self.logger.info(
+                        f"{dev.name}: The plugin only retains information for the first 5 alerts."
+                    )
 
-                        # ========================== Effective / Expires ===========================
-                        # Local Time (server timezone)
-                        if preferred_time == "time_here":
+                # Write new alerts to the log.
+                for index in new:
+                    if index < 5:
+                        description = alert_array[index].get('description', "Not provided.").strip()
+                        alert_text = textwrap.wrap(description, 120)
+                        alert_text_wrapped = ""
+                        for _ in alert_text:
+                            alert_text_wrapped += f"{_}\n"
 
-                            alert_effective_time = time.localtime(int(alert_array[alert][4]))
-                            alert_time    = time.strftime('%Y-%m-%d %H:%M', alert_effective_time)
-                            alerts_states_list.append(
-                                {'key': f"alertTime{alert_counter}", 'value': f"{alert_time}"}
-                            )
+                        self.logger.info(f"\n{alert_text_wrapped}")
 
-                            alert_expires_time = time.localtime(int(alert_array[alert][1]))
-                            alert_expires = time.strftime('%Y-%m-%d %H:%M', alert_expires_time)
-                            alerts_states_list.append(
-                                {'key': f"alertExpires{alert_counter}", 'value': f"{alert_expires}"}
-                            )
+            if new:
+                self.inst_attr['new_alerts'].add(dev.id)
 
-                        # Location Time (location timezone)
-                        elif preferred_time == "time_there":
+            # =========================== Alert Status / Count ============================
+            alerts_states_list.append(
+                {'key': 'alertStatus', 'value': bool(alert_array), 'uiValue': str(bool(alert_array))}
+            )
+            alerts_states_list.append({'key': 'alertCount', 'value': len(alert_array)})
 
-                            alert_effective_time = dt.datetime.fromtimestamp(
-                                int(alert_array[alert][4]), tz=pytz.utc
-                            )
-                            alert_effective_time = timezone.normalize(alert_effective_time)
-                            alert_time = time.strftime(
-                                f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}",
-                                alert_effective_time.timetuple()
-                            )
-                            alerts_states_list.append(
-                                {'key': f"alertTime{alert_counter}", 'value': f"{alert_time}"}
-                            )
+            # ================================ Alert States ================================
+            # Server time ('time_here') or location time ('time_there').
+            if zone is None:
+                alert_format = '%Y-%m-%d %H:%M'
+            else:
+                alert_format = f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}"
 
-                            alert_expires_time = dt.datetime.fromtimestamp(
-                                int(alert_array[alert][1]), tz=pytz.utc
-                            )
-                            alert_expires_time = timezone.normalize(alert_expires_time)
-                            alert_expires = time.strftime(
-                                f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}",
-                                alert_expires_time.timetuple()
-                            )
-                            alerts_states_list.append(
-                                {'key': f"alertExpires{alert_counter}", 'value': f"{alert_expires}"}
-                            )
+            for alert_counter, fingerprint in enumerate(slots, start=1):
 
-                        # ============================== Alert Info ================================
+                # The slot's alert hasn't changed.
+                if pushed is not None and fingerprint == pushed[alert_counter - 1]:
+                    continue
 
+                # Clear out alerts that have expired.
+                if fingerprint is None:
+                    for state in ('alertDescription', 'alertExpires', 'alertRegions', 'alertSeverity',
+                                  'alertTime', 'alertTitle', 'alertUri'
+                                  ):
                         alerts_states_list.append(
-                            {'key': f"alertDescription{alert_counter}",
-                             'value': f"{alert_array[alert][0]}"
-                             }
-                        )
-                        alerts_states_list.append(
-                            {'key': f"alertRegions{alert_counter}",
-                             'value': f"{alert_array[alert][2]}"
-                             }
-                        )
-                        alerts_states_list.append(
-                            {'key': f"alertSeverity{alert_counter}",
-                             'value': f"{alert_array[alert][3]}"
-                             }
-                        )
-                        alerts_states_list.append(
-                            {'key': f"alertTitle{alert_counter}",
-                             'value': f"{alert_array[alert][5]}"
-                             }
-                        )
-                        alerts_states_list.append(
-                            {'key': f"alertUri{alert_counter}",
-                             'value': f"{alert_array[alert][6]}"
-                             }
+                            {'key': f"{state}{alert_counter}", 'value': " ", 'uiValue': " "}
                         )
-                        # Write alert to the log?
-                        if alerts_logging and not alerts_suppressed:
-                            alert_text = textwrap.wrap(alert_array[alert][0], 120)
-                            alert_text_wrapped = ""
-                            for _ in alert_text:
-                                alert_text_wrapped += f"{_}\n"
+                    continue
 
-                            self.logger.info(f"\n{alert_text_wrapped}")
+                alert = alert_array[alert_counter - 1]
 
-                        alert_counter += 1
+                # ========================== Effective / Expires ===========================
+                # Convert epoch times to human friendly values
+                alert_time = time.strftime(
+                    alert_format, local_time(int(alert.get('time', "Not provided.")), zone)
+                )
+                alerts_states_list.append({'key': f"alertTime{alert_counter}", 'value': f"{alert_time}"})
 
-            alerts_states_list.append({'key': 'alertCount', 'value': len(alert_array)})
-            dev.updateStatesOnServer(alerts_states_list)
+                alert_expires = time.strftime(
+                    alert_format, local_time(int(alert.get('expires', "Not provided.")), zone)
+                )
+                alerts_states_list.append(
+                    {'key': f"alertExpires{alert_counter}", 'value': f"{alert_expires}"}
+                )
+
+                # ============================== Alert Info ================================
+                alerts_states_list += [
+                    {'key': f"alertDescription{alert_counter}",
+                     'value': f"{alert.get('description', 'Not provided.').strip()}"},
+                    {'key': f"alertRegions{alert_counter}",
+                     'value': f"{alert.get('regions', 'Not provided.')}"},
+                    {'key': f"alertSeverity{alert_counter}",
+                     'value': f"{alert.get('severity', 'Not provided.')}"},
+                    {'key': f"alertTitle{alert_counter}", 'value': f"{active[alert_counter - 1][1]}"},
+                    {'key': f"alertUri{alert_counter}", 'value': f"{alert.get('uri', 'Not provided.')}"},
+                ]
+
+            self.update_device_states(dev, alerts_states_list)
+            self.inst_attr['active_alerts'][dev.id] = active
+            self.inst_attr['alert_slots'][dev.id]   = slots
 
         except Exception:  # noqa
             self.logger.error("Problem parsing weather alert data.", exc_info=True)
@@ -1344,99 +2119,42 @@ class Plugin(indigo.PluginBase):
         astronomy_states_list = []
 
         try:
-            location       = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
-            weather_data   = self.masterWeatherDict[location]
-            astronomy_data = weather_data['daily']['data']
+            location       = self.device_location(dev)
+            context        = self.location_context(location)
             preferred_time = dev.pluginProps.get('time_zone', 'time_here')
-            timezone = pytz.timezone(zone=weather_data['timezone'])
+            zone           = context.zone if preferred_time == "time_there" else None
 
-            epoch      = self.nested_lookup(obj=weather_data, keys=('currently', 'time'))
-            sun_rise   = self.nested_lookup(obj=astronomy_data, keys=('sunriseTime',))
-            sun_set    = self.nested_lookup(obj=astronomy_data, keys=('sunsetTime',))
-            moon_phase = float(self.nested_lookup(obj=astronomy_data, keys=('moonPhase',)))
+            sun_rise   = context.sunrise
+            sun_set    = context.sunset
+            moon_phase = float(context.moon_phase)
 
             # ============================= Observation Epoch =============================
-            current_observation_epoch = int(epoch)
-            astronomy_states_list.append(
-                {'key': 'currentObservationEpoch', 'value': current_observation_epoch}
-            )
+            astronomy_states_list.append({'key': 'currentObservationEpoch', 'value': context.epoch})
 
             # ============================= Observation Time ==============================
-            last_upd = time.strftime(
-                '%b %d, %H:%M %p %z', time.localtime(current_observation_epoch)
-            )
-            current_observation_time = f"Last updated on {last_upd}"
-            astronomy_states_list.append(
-                {'key': 'currentObservation', 'value': current_observation_time}
-            )
+            astronomy_states_list.append({'key': 'currentObservation', 'value': context.observation})
 
             # ============================= Observation 24hr ==============================
-            curr_obs = time.localtime(current_observation_epoch)
-            current_observation_24hr = time.strftime(
-                f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}", curr_obs
-            )
             astronomy_states_list.append(
-                {'key': 'currentObservation24hr', 'value': current_observation_24hr}
+                {'key': 'currentObservation24hr', 'value': context.observation_24hr}
             )
 
             # ============================= Sunrise / Sunset ==============================
-            # Local Time (server timezone)
-            if preferred_time == "time_here":
-
-                sunrise_local = time.localtime(int(sun_rise))
-                sunrise_local = time.strftime(
-                    f"{self.inst_attr['date_format']} "
-                    f"{self.inst_attr['time_format']}",
-                    sunrise_local
-                )
-                astronomy_states_list.append({'key': 'sunriseTime', 'value': sunrise_local})
-                astronomy_states_list.append(
-                    {'key': 'sunriseTimeShort', 'value': sunrise_local[11:16]}
-                )
-
-                sunset_local  = time.localtime(int(sun_set))
-                sunset_local = time.strftime(
-                    f"{self.inst_attr['date_format']} "
-                    f"{self.inst_attr['time_format']}",
-                    sunset_local
-                )
-                astronomy_states_list.append({'key': 'sunsetTime', 'value': sunset_local})
-                astronomy_states_list.append(
-                    {'key': 'sunsetTimeShort', 'value': sunset_local[11:16]}
-                )
-
-            # Location Time (location timezone)
-            elif preferred_time == "time_there":
-                sunrise_aware = dt.datetime.fromtimestamp(int(sun_rise), tz=pytz.utc)
-                sunset_aware  = dt.datetime.fromtimestamp(int(sun_set), tz=pytz.utc)
+            # Server time ('time_here') or location time ('time_there').
+            date_time_format = f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}"
 
-                sunrise_normal = timezone.normalize(dt=sunrise_aware)
-                sunset_normal  = timezone.normalize(dt=sunset_aware)
-
-                sunrise_local = time.strftime(
-                    f"{self.inst_attr['date_format']} "
-                    f"{self.inst_attr['time_format']}",
-                    sunrise_normal.timetuple()
-                )
-                astronomy_states_list.append({'key': 'sunriseTime', 'value': sunrise_local})
-                astronomy_states_list.append(
-                    {'key': 'sunriseTimeShort', 'value': sunrise_local[11:16]}
-                )
+            sunrise_local = time.strftime(date_time_format, local_time(int(sun_rise), zone))
+            astronomy_states_list.append({'key': 'sunriseTime', 'value': sunrise_local})
+            astronomy_states_list.append({'key': 'sunriseTimeShort', 'value': sunrise_local[11:16]})
 
-                sunset_local = time.strftime(
-                    f"{self.inst_attr['date_format']} "
-                    f"{self.inst_attr['time_format']}",
-                    sunset_normal.timetuple()
-                )
-                astronomy_states_list.append({'key': 'sunsetTime', 'value': sunset_local})
-                astronomy_states_list.append(
-                    {'key': 'sunsetTimeShort', 'value': sunset_local[11:16]}
-                )
+            sunset_local = time.strftime(date_time_format, local_time(int(sun_set), zone))
+            astronomy_states_list.append({'key': 'sunsetTime', 'value': sunset_local})
+            astronomy_states_list.append({'key': 'sunsetTimeShort', 'value': sunset_local[11:16]})
 
             # ================================ Moon Phase =================================
             # Float
             moon_phase_new, moon_phase_ui = self.fix_corrupted_data(val=moon_phase * 100)
-            moon_phase_ui = self.ui_format_percentage(dev=dev, val=moon_phase_ui)
+            moon_phase_ui = self.device_formatter(dev).percentage(moon_phase_ui)
             astronomy_states_list.append(
                 {'key': 'moonPhase', 'value': moon_phase_new, 'uiValue': moon_phase_ui}
             )
@@ -1444,7 +2162,7 @@ class Plugin(indigo.PluginBase):
             # ============================== Moon Phase Icon ==============================
             # Integer
             moon_phase_icon, moon_phase_icon_ui = self.fix_corrupted_data(val=int(moon_phase_new))
-            moon_phase_icon_ui = self.ui_format_percentage(dev=dev, val=moon_phase_icon_ui)
+            moon_phase_icon_ui = self.device_formatter(dev).percentage(moon_phase_icon_ui)
             astronomy_states_list.append(
                 {'key': 'moonPhaseIcon', 'value': moon_phase_icon, 'uiValue': moon_phase_icon_ui}
             )
@@ -1474,15 +2192,9 @@ class Plugin(indigo.PluginBase):
             moon_phase_name = next((k for k, v in criteria.items() if v), "Unknown")
             astronomy_states_list.append({'key': 'moonPhaseName', 'value': moon_phase_name})
 
-            new_props = dev.pluginProps
-            _lat = float(dev.pluginProps.get('latitude', 'lat'))
-            _long = float(dev.pluginProps.get('longitude', 'long'))
-            new_props['address'] = f"{_lat:.5f}, {_long:.5f}"
-            dev.replacePluginPropsOnServer(new_props)
-
             astronomy_states_list.append({'key': 'onOffState', 'value': True, 'uiValue': " "})
 
-            dev.updateStatesOnServer(astronomy_states_list)
+            self.update_device_states(dev, astronomy_states_list)
             dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
 
         except Exception:  # noqa
@@ -1503,312 +2215,78 @@ class Plugin(indigo.PluginBase):
         hourly_forecast_states_list = []
 
         try:
-            hour_temp      = 0
-            location       = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
+            location       = self.device_location(dev)
             weather_data   = self.masterWeatherDict[location]
-            forecast_data  = weather_data['hourly']['data']
+            forecast_data  = weather_data.hourly
+            context        = self.location_context(location)
             preferred_time = dev.pluginProps.get('time_zone', 'time_here')
-            timezone       = pytz.timezone(zone=weather_data['timezone'])
+            zone           = context.zone if preferred_time == "time_there" else None
 
             # ============================== Hourly Summary ===============================
             hourly_forecast_states_list.append(
                 {'key': 'hourly_summary',
-                 'value': self.masterWeatherDict[location]['hourly']['summary']
+                 'value': forecast_data.summary
                  }
             )
 
             # ============================= Observation Epoch =============================
-            current_observation_epoch = (
-                int(self.nested_lookup(weather_data, keys=('currently', 'time')))
-            )
             hourly_forecast_states_list.append(
-                {'key': 'currentObservationEpoch', 'value': current_observation_epoch}
+                {'key': 'currentObservationEpoch', 'value': context.epoch}
             )
 
             # ============================= Observation Time ==============================
-            obs_time = time.strftime(
-                '%b %d, %H:%M %p %z', time.localtime(current_observation_epoch)
-            )
             hourly_forecast_states_list.append(
-                {'key': 'currentObservation', 'value': f"Last updated on {obs_time}"}
+                {'key': 'currentObservation', 'value': context.observation}
             )
 
             # ============================= Observation 24hr ==============================
-            epoch_24hr = time.localtime(current_observation_epoch)
-            current_observation_24hr = time.strftime(
-                f"{self.inst_attr['date_format']} {self.inst_attr['time_format']}", epoch_24hr
-            )
             hourly_forecast_states_list.append(
-                {'key': 'currentObservation24hr', 'value': current_observation_24hr}
-            )
-
-            forecast_counter = 1
-            for observation in forecast_data:
-
-                if forecast_counter <= 24:
-
-                    cloud_cover        = self.nested_lookup(observation, keys=('cloudCover',))
-                    forecast_time      = self.nested_lookup(observation, keys=('time',))
-                    humidity           = self.nested_lookup(observation, keys=('humidity',))
-                    icon               = self.nested_lookup(observation, keys=('icon',))
-                    ozone              = self.nested_lookup(observation, keys=('ozone',))
-                    precip_intensity   = self.nested_lookup(observation, keys=('precipIntensity',))
-                    precip_probability = (
-                        self.nested_lookup(observation, keys=('precipProbability',))
-                    )
-                    precip_type  = self.nested_lookup(observation, keys=('precipType',))
-                    pressure     = self.nested_lookup(observation, keys=('pressure',))
-                    summary      = self.nested_lookup(observation, keys=('summary',))
-                    temperature  = self.nested_lookup(observation, keys=('temperature',))
-                    uv_index     = self.nested_lookup(observation, keys=('uvIndex',))
-                    visibility   = self.nested_lookup(observation, keys=('visibility',))
-                    wind_bearing = self.nested_lookup(observation, keys=('windBearing',))
-                    wind_gust    = self.nested_lookup(observation, keys=('windGust',))
-                    wind_speed   = self.nested_lookup(observation, keys=('windSpeed',))
-
-                    # Add leading zero to counter value for device state names 1-9.
-                    if forecast_counter < 10:
-                        fore_counter_text = f"0{forecast_counter}"
-                    else:
-                        fore_counter_text = forecast_counter
-
-                    # ========================= Forecast Day, Epoch, Hour =========================
-                    # Local Time (server timezone)
-                    if preferred_time == "time_here":
-                        local_time       = time.localtime(float(forecast_time))
-
-                        forecast_day_long  = time.strftime('%A', local_time)
-                        forecast_day_short = time.strftime('%a', local_time)
-                        forecast_hour      = time.strftime('%H:%M', local_time)
-                        forecast_hour_ui   = (
-                            time.strftime(self.inst_attr['time_format'], local_time)
-                        )
-
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_day",
-                             'value': forecast_day_long,
-                             'uiValue': forecast_day_long
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_day_short",
-                             'value': forecast_day_short,
-                             'uiValue': forecast_day_short
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_epoch",
-                             'value': forecast_time
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_hour",
-                             'value': forecast_hour,
-                             'uiValue': forecast_hour_ui
-                             }
-                        )
-
-                    # Location Time (location timezone)
-                    elif preferred_time == "time_there":
-                        aware_time = dt.datetime.fromtimestamp(int(forecast_time), tz=pytz.utc)
-
-                        forecast_day_long  = timezone.normalize(aware_time).strftime("%A")
-                        forecast_day_short = timezone.normalize(aware_time).strftime("%a")
-                        forecast_hour      = timezone.normalize(aware_time).strftime("%H:%M")
-                        forecast_hour_ui   = time.strftime(
-                            self.inst_attr['time_format'],
-                            timezone.normalize(aware_time).timetuple()
-                        )
-
-                        zone = dt.datetime.fromtimestamp(forecast_time, timezone)
-                        zone_tuple = zone.timetuple()              # tuple
-                        zone_posix = int(time.mktime(zone_tuple))  # timezone timestamp
-
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_day",
-                             'value': forecast_day_long,
-                             'uiValue': forecast_day_long
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_day_short",
-                             'value': forecast_day_short,
-                             'uiValue': forecast_day_short
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_epoch",
-                             'value': zone_posix
-                             }
-                        )
-                        hourly_forecast_states_list.append(
-                            {'key': f"h{fore_counter_text}_hour",
-                             'value': forecast_hour,
-                             'uiValue': forecast_hour_ui
-                             }
-                        )
-
-                    # ================================ Cloud Cover ================================
-                    cloud_cover, cloud_cover_ui = self.fix_corrupted_data(val=cloud_cover * 100)
-                    cloud_cover_ui = self.ui_format_percentage(dev=dev, val=cloud_cover_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_cloudCover",
-                         'value': cloud_cover,
-                         'uiValue': cloud_cover_ui
-                         }
-                    )
-
-                    # ================================= Humidity ==================================
-                    humidity, humidity_ui = self.fix_corrupted_data(val=humidity * 100)
-                    humidity_ui = self.ui_format_percentage(dev=dev, val=humidity_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_humidity",
-                         'value': humidity,
-                         'uiValue': humidity_ui
-                         }
-                    )
-
-                    # ============================= Precip Intensity ==============================
-                    precip_intensity, precip_intensity_ui = (
-                        self.fix_corrupted_data(val=precip_intensity)
-                    )
-                    precip_intensity_ui = self.ui_format_rain(dev=dev, val=precip_intensity_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_precipIntensity",
-                         'value': precip_intensity,
-                         'uiValue': precip_intensity_ui
-                         }
-                    )
-
-                    # ============================ Precip Probability =============================
-                    precip_probability, precip_probability_ui = (
-                        self.fix_corrupted_data(val=precip_probability * 100)
-                    )
-                    precip_probability_ui = (
-                        self.ui_format_percentage(dev=dev, val=precip_probability_ui)
-                    )
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_precipChance",
-                         'value': precip_probability,
-                         'uiValue': precip_probability_ui
-                         }
-                    )
-
-                    # =================================== Icon ====================================
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_icon", 'value': f"{icon.replace('-', '_')}"}
-                    )
-
-                    # =================================== Ozone ===================================
-                    ozone, ozone_ui = self.fix_corrupted_data(val=ozone)
-                    ozone_ui = self.ui_format_index(dev, val=ozone_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_ozone", 'value': ozone, 'uiValue': ozone_ui}
-                    )
-
-                    # ================================ Precip Type ================================
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_precipType", 'value': precip_type}
-                    )
-
-                    # ================================= Pressure ==================================
-                    pressure, pressure_ui = self.fix_corrupted_data(val=pressure)
-                    pressure_ui = self.ui_format_pressure(dev=dev, val=pressure_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_pressure",
-                         'value': pressure,
-                         'uiValue': pressure_ui
-                         }
-                    )
-
-                    # ================================== Summary ==================================
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_summary", 'value': summary}
-                    )
-
-                    # ================================ Temperature ================================
-                    temperature, temperature_ui = self.fix_corrupted_data(val=temperature)
-                    temperature_ui = self.ui_format_temperature(dev=dev, val=temperature_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_temperature",
-                         'value': temperature,
-                         'uiValue': temperature_ui
-                         }
-                    )
-
-                    if forecast_counter == int(dev.pluginProps.get('ui_display', '1')):
-                        hour_temp = round(temperature)
-
-                    # ================================= UV Index ==================================
-                    uv_index, uv_index_ui = self.fix_corrupted_data(val=uv_index)
-                    uv_index_ui = self.ui_format_index(dev, val=uv_index_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_uvIndex",
-                         'value': uv_index,
-                         'uiValue': uv_index_ui
-                         }
-                    )
-
-                    # =============================== Wind Bearing ================================
-                    wind_bearing, wind_bearing_ui = self.fix_corrupted_data(val=wind_bearing)
-                    # We don't need fractional wind speed values for the UI, so we try to fix that
-                    # here.  However, sometimes it comes through as "--" so we need to account for
-                    # that, too.
-                    try:
-                        int(float(wind_bearing_ui))
-                    except ValueError:
-                        pass
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_windBearing",
-                         'value': wind_bearing,
-                         'uiValue': wind_bearing_ui
-                         }
-                    )
-
-                    # ============================= Wind Bearing Name =============================
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_windBearingName",
-                         'value': self.ui_format_wind_name(val=wind_bearing)
-                         }
-                    )
-
-                    # ================================= Wind Gust =================================
-                    wind_gust, wind_gust_ui = self.fix_corrupted_data(val=wind_gust)
-                    wind_gust_ui = self.ui_format_wind(dev=dev, val=wind_gust_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_windGust",
-                         'value': wind_gust,
-                         'uiValue': wind_gust_ui
-                         }
-                    )
-
-                    # ================================ Wind Speed =================================
-                    wind_speed, wind_speed_ui = self.fix_corrupted_data(val=wind_speed)
-                    wind_speed_ui = self.ui_format_wind(dev=dev, val=wind_speed_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_windSpeed",
-                         'value': wind_speed,
-                         'uiValue': wind_speed_ui
-                         }
-                    )
-
-                    # ================================ Visibility =================================
-                    visibility, visibility_ui = self.fix_corrupted_data(val=visibility)
-                    visibility_ui = self.ui_format_distance(dev, val=visibility_ui)
-                    hourly_forecast_states_list.append(
-                        {'key': f"h{fore_counter_text}_visibility",
-                         'value': visibility,
-                         'uiValue': visibility_ui
-                         }
-                    )
+                {'key': 'currentObservation24hr', 'value': context.observation_24hr}
+            )
+
+            fmt     = self.device_formatter(dev)
+            values  = {}
+            periods = self.inst_attr['forecast_periods']['Hourly']
+            for forecast_counter, forecast_time in enumerate(
+                    forecast_data.values('time', periods, NOT_AVAILABLE), start=1
+            ):
+                fore_counter_text = f"{forecast_counter:02d}"
+
+                # ========================= Forecast Day, Epoch, Hour =========================
+                # Server time ('time_here') or location time ('time_there').
+                hour = hour_strings(forecast_time, zone, self.inst_attr['time_format'])
+
+                hourly_forecast_states_list.append(
+                    {'key': f"h{fore_counter_text}_day",
+                     'value': hour.day,
+                     'uiValue': hour.day
+                     }
+                )
+                hourly_forecast_states_list.append(
+                    {'key': f"h{fore_counter_text}_day_short",
+                     'value': hour.day_short,
+                     'uiValue': hour.day_short
+                     }
+                )
+                hourly_forecast_states_list.append(
+                    {'key': f"h{fore_counter_text}_epoch",
+                     'value': hour.epoch
+                     }
+                )
+                hourly_forecast_states_list.append(
+                    {'key': f"h{fore_counter_text}_hour",
+                     'value': hour.hour,
+                     'uiValue': hour.hour_ui
+                     }
+                )
 
-                    forecast_counter += 1
+            # ================================ Schema States ==================================
+            # Each field is handled for every hour at once.
+            for keys, extract in self.inst_attr['extractors']['Hourly']:
+                values.update(zip(keys, extract(forecast_data, fmt, hourly_forecast_states_list)))
 
-            new_props = dev.pluginProps
-            _lat = float(dev.pluginProps.get('latitude', 'lat'))
-            _long = float(dev.pluginProps.get('longitude', 'long'))
-            new_props['address'] = f"{_lat:.5f}, {_long:.5f}"
-            dev.replacePluginPropsOnServer(new_props)
+            ui_display = int(dev.pluginProps.get('ui_display', '1'))
+            hour_temp  = round(values.get(f"h{ui_display:02d}_temperature", 0))
 
             display_value = f"{int(hour_temp)}{dev.pluginProps['temperatureUnits']}"
             hourly_forecast_states_list.append(
@@ -1818,7 +2296,7 @@ class Plugin(indigo.PluginBase):
                  }
             )
 
-            dev.updateStatesOnServer(hourly_forecast_states_list)
+            self.update_device_states(dev, hourly_forecast_states_list)
             dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
 
         except Exception:  # noqa
@@ -1826,7 +2304,7 @@ class Plugin(indigo.PluginBase):
             hourly_forecast_states_list.append(
                 {'key': 'onOffState', 'value': False, 'uiValue': " "}
             )
-            dev.updateStatesOnServer(hourly_forecast_states_list)
+            self.update_device_states(dev, hourly_forecast_states_list)
             dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
 
     # =============================================================================
@@ -1842,295 +2320,78 @@ class Plugin(indigo.PluginBase):
         daily_forecast_states_list = []
 
         try:
-            location      = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
+            location      = self.device_location(dev)
             weather_data  = self.masterWeatherDict[location]
-            forecast_date = self.masterWeatherDict[location]['daily']['data']
-            timezone      = pytz.timezone(zone=weather_data['timezone'])
-            today_high    = 0
-            today_low     = 0
+            forecast_date = weather_data.daily
+            context       = self.location_context(location)
+            zone          = context.zone
 
             # =============================== Daily Summary ===============================
             current_summary = self.nested_lookup(weather_data, keys=('daily', 'summary'))
             daily_forecast_states_list.append({'key': 'daily_summary', 'value': current_summary})
 
             # ============================= Observation Epoch =============================
-            current_observation_epoch = self.nested_lookup(weather_data, keys=('currently', 'time'))
             daily_forecast_states_list.append(
                 {'key': 'currentObservationEpoch',
-                 'value': current_observation_epoch,
-                 'uiValue': current_observation_epoch
+                 'value': context.epoch,
+                 'uiValue': context.epoch
                  }
             )
 
             # ============================= Observation Time ==============================
-            curr_obs = time.strftime(
-                '%b %d, %H:%M %p %z', time.localtime(current_observation_epoch)
-            )
-            current_observation_time = f"Last updated on {curr_obs}"
             daily_forecast_states_list.append(
                 {'key': 'currentObservation',
-                 'value': current_observation_time,
-                 'uiValue': current_observation_time
+                 'value': context.observation,
+                 'uiValue': context.observation
                  }
             )
 
             # ============================= Observation 24hr ==============================
-            curr_obs_24 = time.localtime(float(current_observation_epoch))
-            current_observation_24hr = time.strftime(
-                f"{self.inst_attr['date_format']} "
-                f"{self.inst_attr['time_format']}",
-                curr_obs_24
-            )
             daily_forecast_states_list.append(
-                {'key': 'currentObservation24hr', 'value': current_observation_24hr}
-            )
-
-            forecast_counter = 1
-            for observation in forecast_date:
-                cloud_cover        = self.nested_lookup(obj=observation, keys=('cloudCover',))
-                forecast_time      = self.nested_lookup(obj=observation, keys=('time',))
-                humidity           = self.nested_lookup(obj=observation, keys=('humidity',))
-                icon               = self.nested_lookup(obj=observation, keys=('icon',))
-                ozone              = self.nested_lookup(obj=observation, keys=('ozone',))
-                precip_probability = (
-                    self.nested_lookup(obj=observation, keys=('precipProbability',))
+                {'key': 'currentObservation24hr', 'value': context.observation_24hr}
+            )
+
+            fmt     = self.device_formatter(dev)
+            values  = {}
+            periods = self.inst_attr['forecast_periods']['Daily']
+            for forecast_counter, forecast_time in enumerate(
+                    forecast_date.values('time', periods, NOT_AVAILABLE), start=1
+            ):
+                fore_counter_text = f"{forecast_counter:02d}"
+
+                # =========================== Forecast Date and Day ===========================
+                # We set the daily stuff to the location timezone regardless, because the
+                # timestamp from DS is always 00:00 localized. If we set it using the server
+                # timezone, it may display the wrong day if the location is ahead of where we
+                # are.
+                day = day_strings(int(forecast_time), zone)
+
+                daily_forecast_states_list.append(
+                    {'key': f"d{fore_counter_text}_date",
+                     'value': day.date,
+                     'uiValue': day.date
+                     }
+                )
+                daily_forecast_states_list.append(
+                    {'key': f"d{fore_counter_text}_day",
+                     'value': day.day,
+                     'uiValue': day.day
+                     }
+                )
+                daily_forecast_states_list.append(
+                    {'key': f"d{fore_counter_text}_day_short",
+                     'value': day.day_short,
+                     'uiValue': day.day_short
+                     }
                 )
-                precip_intensity   = self.nested_lookup(obj=observation, keys=('precipIntensity',))
-                precip_type        = self.nested_lookup(obj=observation, keys=('precipType',))
-                pressure           = self.nested_lookup(obj=observation, keys=('pressure',))
-                summary            = self.nested_lookup(obj=observation, keys=('summary',))
-                temperature_high   = self.nested_lookup(obj=observation, keys=('temperatureHigh',))
-                temperature_low    = self.nested_lookup(obj=observation, keys=('temperatureLow',))
-                uv_index           = self.nested_lookup(obj=observation, keys=('uvIndex',))
-                visibility         = self.nested_lookup(obj=observation, keys=('visibility',))
-                wind_bearing       = self.nested_lookup(obj=observation, keys=('windBearing',))
-                wind_gust          = self.nested_lookup(obj=observation, keys=('windGust',))
-                wind_speed         = self.nested_lookup(obj=observation, keys=('windSpeed',))
-
-                if forecast_counter <= 8:
-
-                    # Add leading zero to counter value for device state names 1-9. Although Dark
-                    # Sky only provides 8 days of data at this time, if it should decide to
-                    # increase that, this will provide for proper sorting of states.
-                    if forecast_counter < 10:
-                        fore_counter_text = f"0{forecast_counter}"
-                    else:
-                        fore_counter_text = forecast_counter
-
-                    # ================================ Cloud Cover ================================
-                    cloud_cover, cloud_cover_ui = self.fix_corrupted_data(val=cloud_cover * 100)
-                    cloud_cover_ui = self.ui_format_percentage(dev=dev, val=cloud_cover_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_cloudCover",
-                         'value': cloud_cover,
-                         'uiValue': cloud_cover_ui
-                         }
-                    )
-
-                    # =========================== Forecast Date and Day ===========================
-                    # We set the daily stuff to the location timezone regardless, because the
-                    # timestamp from DS is always 00:00 localized. If we set it using the server
-                    # timezone, it may display the wrong day if the location is ahead of where we
-                    # are.
-                    aware_time         = dt.datetime.fromtimestamp(int(forecast_time), tz=pytz.utc)
-                    forecast_date      = timezone.normalize(aware_time).strftime('%Y-%m-%d')
-                    forecast_day_long  = timezone.normalize(aware_time).strftime("%A")
-                    forecast_day_short = timezone.normalize(aware_time).strftime("%a")
-
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_date",
-                         'value': forecast_date,
-                         'uiValue': forecast_date
-                         }
-                    )
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_day",
-                         'value': forecast_day_long,
-                         'uiValue': forecast_day_long
-                         }
-                    )
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_day_short",
-                         'value': forecast_day_short,
-                         'uiValue': forecast_day_short
-                         }
-                    )
-
-                    # ================================= Humidity ==================================
-                    humidity, humidity_ui = self.fix_corrupted_data(val=humidity * 100)
-                    humidity_ui = self.ui_format_percentage(dev=dev, val=humidity_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_humidity",
-                         'value': humidity,
-                         'uiValue': humidity_ui
-                         }
-                    )
-
-                    # =================================== Icon ====================================
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_icon", 'value': f"{icon.replace('-', '_')}"}
-                    )
-
-                    # =================================== Ozone ===================================
-                    ozone, ozone_ui = self.fix_corrupted_data(val=ozone)
-                    ozone_ui = self.ui_format_index(dev, val=ozone_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_ozone",
-                         'value': ozone,
-                         'uiValue': ozone_ui
-                         }
-                    )
-
-                    # ============================= Precip Intensity ==============================
-                    precip_intensity, precip_intensity_ui = (
-                        self.fix_corrupted_data(val=precip_intensity)
-                    )
-                    precip_intensity_ui = self.ui_format_rain(dev=dev, val=precip_intensity_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_precipIntensity",
-                         'value': precip_intensity,
-                         'uiValue': precip_intensity_ui
-                         }
-                    )
-
-                    # ============================ Precip Probability =============================
-                    precip_probability, precip_probability_ui = (
-                        self.fix_corrupted_data(val=precip_probability * 100)
-                    )
-                    precip_probability_ui = self.ui_format_percentage(
-                        dev=dev, val=precip_probability_ui
-                    )
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_precipChance",
-                         'value': precip_probability,
-                         'uiValue': precip_probability_ui
-                         }
-                    )
-
-                    # ================================ Precip Total ===============================
-                    precip_total = precip_intensity * 24
-                    precip_total_ui = self.ui_format_rain(dev, val=precip_total)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_precipTotal",
-                         'value': precip_total,
-                         'uiValue': precip_total_ui
-                         }
-                    )
-
-                    # ================================ Precip Type ================================
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_precipType", 'value': precip_type}
-                    )
-
-                    # ================================= Pressure ==================================
-                    pressure, pressure_ui = self.fix_corrupted_data(val=pressure)
-                    pressure_ui = self.ui_format_pressure(dev, val=pressure_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_pressure",
-                         'value': pressure,
-                         'uiValue': pressure_ui
-                         }
-                    )
-
-                    # ================================== Summary ==================================
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_summary", 'value': summary}
-                    )
-
-                    # ============================= Temperature High ==============================
-                    temperature_high, temperature_high_ui = (
-                        self.fix_corrupted_data(val=temperature_high)
-                    )
-                    temperature_high_ui = self.ui_format_temperature(dev, val=temperature_high_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_temperatureHigh",
-                         'value': temperature_high,
-                         'uiValue': temperature_high_ui
-                         }
-                    )
-
-                    if forecast_counter == 1:
-                        today_high = round(temperature_high)
-
-                    # ============================== Temperature Low ==============================
-                    temperature_low, temperature_low_ui = (
-                        self.fix_corrupted_data(val=temperature_low)
-                    )
-                    temperature_low_ui = self.ui_format_temperature(dev, val=temperature_low_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_temperatureLow",
-                         'value': temperature_low,
-                         'uiValue': temperature_low_ui
-                         }
-                    )
-
-                    if forecast_counter == 1:
-                        today_low = round(temperature_low)
-
-                    # ================================= UV Index ==================================
-                    uv_index, uv_index_ui = self.fix_corrupted_data(val=uv_index)
-                    uv_index_ui = self.ui_format_index(dev, val=uv_index_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_uvIndex",
-                         'value': uv_index,
-                         'uiValue': uv_index_ui
-                         }
-                    )
-
-                    # ================================ Visibility =================================
-                    visibility, visibility_ui = self.fix_corrupted_data(val=visibility)
-                    visibility_ui = self.ui_format_distance(dev, val=visibility_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_visibility",
-                         'value': visibility,
-                         'uiValue': visibility_ui
-                         }
-                    )
-
-                    # =============================== Wind Bearing ================================
-                    wind_bearing, wind_bearing_ui = self.fix_corrupted_data(val=wind_bearing)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_windBearing",
-                         'value': wind_bearing,
-                         'uiValue': int(float(wind_bearing_ui)) if wind_bearing_ui != "--" else wind_bearing_ui
-                         }
-                    )
-
-                    # ============================= Wind Bearing Name =============================
-                    wind_bearing_name = self.ui_format_wind_name(val=wind_bearing)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_windBearingName",
-                         'value': wind_bearing_name
-                         }
-                    )
-
-                    # ================================= Wind Gust =================================
-                    wind_gust, wind_gust_ui = self.fix_corrupted_data(val=wind_gust)
-                    wind_gust_ui = self.ui_format_wind(dev, val=wind_gust_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_windGust",
-                         'value': wind_gust,
-                         'uiValue': wind_gust_ui
-                         }
-                    )
-
-                    # ================================ Wind Speed =================================
-                    wind_speed, wind_speed_ui = self.fix_corrupted_data(val=wind_speed)
-                    wind_speed_ui = self.ui_format_wind(dev, val=wind_speed_ui)
-                    daily_forecast_states_list.append(
-                        {'key': f"d{fore_counter_text}_windSpeed",
-                         'value': wind_speed,
-                         'uiValue': wind_speed_ui
-                         }
-                    )
 
-                    forecast_counter += 1
+            # ================================ Schema States ==================================
+            # Each field is handled for every day at once.
+            for keys, extract in self.inst_attr['extractors']['Daily']:
+                values.update(zip(keys, extract(forecast_date, fmt, daily_forecast_states_list)))
 
-            new_props = dev.pluginProps
-            _lat = float(dev.pluginProps.get('latitude', 'lat'))
-            _long = float(dev.pluginProps.get('longitude', 'long'))
-            new_props['address'] = f"{_lat:0.5f}, {_long:0.5f}"
-            dev.replacePluginPropsOnServer(new_props)
+            today_high = round(values.get('d01_temperatureHigh', 0))
+            today_low  = round(values.get('d01_temperatureLow', 0))
 
             temp_units = dev.pluginProps['temperatureUnits']
             display_value = f"{int(today_high)}{temp_units}/{int(today_low)}{temp_units}"
@@ -2141,7 +2402,7 @@ class Plugin(indigo.PluginBase):
                  }
             )
 
-            dev.updateStatesOnServer(daily_forecast_states_list)
+            self.update_device_states(dev, daily_forecast_states_list)
             dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
 
         except Exception:  # noqa
@@ -2151,7 +2412,7 @@ class Plugin(indigo.PluginBase):
             )
 
             dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-            dev.updateStatesOnServer(daily_forecast_states_list)
+            self.update_device_states(dev, daily_forecast_states_list)
 
     # =============================================================================
     def parse_current_weather_data(self, dev: indigo.Device | None = None) -> None:  # noqa
@@ -2170,341 +2431,253 @@ class Plugin(indigo.PluginBase):
 
         try:
 
-            location     = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
+            location     = self.device_location(dev)
             weather_data = self.masterWeatherDict[location]
+            context      = self.location_context(location)
 
-            apparent_temperature = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'apparentTemperature',)
-            )
-            cloud_cover = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'cloudCover',)
-            )
-            dew_point = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'dewPoint',)
-            )
-            humidity = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'humidity',)
-            )
-            icon = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'icon',)
-            )
-            storm_bearing = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'nearestStormBearing',)
-            )
-            storm_distance = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'nearestStormDistance',)
-            )
-            ozone = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'ozone',)
-            )
-            pressure = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'pressure',)
-            )
-            precip_intensity = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'precipIntensity',)
-            )
-            precip_probability = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'precipProbability',)
-            )
-            summary = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'summary',)
-            )
-            temperature = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'temperature',)
-            )
-            epoch = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'time')
-            )
-            uv = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'uvIndex',)
-            )
-            visibility = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'visibility',)
-            )
-            wind_bearing = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'windBearing',)
-            )
-            wind_gust = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'windGust',)
-            )
-            wind_speed = self.nested_lookup(
-                obj=weather_data, keys=('currently', 'windSpeed',)
+            # ================================ Time Epoch =================================
+            # (Int) Epoch time of the data.
+            weather_states_list.append({'key': 'currentObservationEpoch', 'value': context.epoch})
+
+            # =================================== Time ====================================
+            # (string: "Last Updated on MONTH DD, HH:MM AM/PM TZ")
+            weather_states_list.append({'key': 'currentObservation', 'value': context.observation})
+
+            # ================================ Time 24 Hour ===============================
+            weather_states_list.append(
+                {'key': 'currentObservation24hr', 'value': context.observation_24hr}
             )
 
-            # ================================ Time Epoch =================================
-            # (Int) Epoch time of the data.
-            weather_states_list.append({'key': 'currentObservationEpoch', 'value': int(epoch)})
+            # =============================== Schema States ===============================
+            fmt    = self.device_formatter(dev)
+            values = self.inst_attr['extractors']['Weather'](weather_data, fmt, weather_states_list)
 
-            # =================================== Time ====================================
-            # (string: "Last Updated on MONTH DD, HH:MM AM/PM TZ")
-            time_long = (f"Last updated on "
-                         f"{time.strftime('%b %d, %H:%M %p %z', time.localtime(epoch))}")
-            weather_states_list.append({'key': 'currentObservation', 'value': time_long})
+            temperature        = values['temperature']
+            wind_bearing_name  = values['windBearingName']
+            current_wind_speed = values['windSpeed']
 
-            # ================================ Time 24 Hour ===============================
-            time_24 = time.strftime(
-                f"{self.inst_attr['date_format']} "
-                f"{self.inst_attr['time_format']}",
-                time.localtime(epoch)
-            )
-            weather_states_list.append({'key': 'currentObservation24hr', 'value': time_24})
-
-            # ============================= Apparent Temperature ==========================
-            apparent_temperature, apparent_temperature_ui = (
-                self.fix_corrupted_data(val=apparent_temperature)
-            )
-            apparent_temperature_ui = self.ui_format_temperature(dev, val=apparent_temperature_ui)
+            # ================================ Wind String ================================
             weather_states_list.append(
-                {'key': 'apparentTemperature',
-                 'value': apparent_temperature,
-                 'uiValue': apparent_temperature_ui
+                {'key': 'windString',
+                 'value': (f"{wind_bearing_name} at "
+                           f"{round(current_wind_speed):.0f}{dev.pluginProps['windUnits']}")
                  }
             )
-            weather_states_list.append(
-                {'key': 'apparentTemperatureIcon', 'value': round(apparent_temperature)}
-            )
 
-            # ================================ Cloud Cover ================================
-            cloud_cover, cloud_cover_ui = self.fix_corrupted_data(val=float(cloud_cover) * 100)
-            cloud_cover_ui = self.ui_format_percentage(dev=dev, val=cloud_cover_ui)
-            weather_states_list.append(
-                {'key': 'cloudCover',
-                 'value': cloud_cover,
-                 'uiValue': cloud_cover_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'cloudCoverIcon', 'value': round(cloud_cover)}
+            self.update_device_states(dev, weather_states_list)
+            dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensorOn)
+            display_value = fmt.item_list_temperature(temperature)
+            dev.updateStateOnServer(
+                'onOffState',
+                value=True,
+                uiValue=f"{display_value}{dev.pluginProps['temperatureUnits']}"
             )
 
-            # ================================= Dew Point =================================
-            dew_point, dew_point_ui = self.fix_corrupted_data(val=dew_point)
-            dew_point_ui = self.ui_format_temperature(dev, val=dew_point_ui)
-            weather_states_list.append(
-                {'key': 'dewpoint',
-                 'value': dew_point,
-                 'uiValue': dew_point_ui
-                 }
-            )
-            weather_states_list.append({'key': 'dewpointIcon', 'value': round(dew_point)})
+        except Exception:  # noqa
+            self.logger.error("Problem parsing weather device data.", exc_info=True)
+            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
+            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
 
-            # ================================= Humidity ==================================
-            humidity, humidity_ui = self.fix_corrupted_data(val=float(humidity) * 100)
-            humidity_ui = self.ui_format_percentage(dev=dev, val=humidity_ui)
-            weather_states_list.append(
-                {'key': 'humidity',
-                 'value': humidity,
-                 'uiValue': humidity_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'humidityIcon', 'value': round(humidity)}
-            )
+    # =============================================================================
+    def parse_weather_device(self, dev: indigo.Device | None = None) -> None:  # noqa
+        """
+        Parse downloaded weather data to a weather device
 
-            # =================================== Icon ====================================
-            weather_states_list.append(
-                {'key': 'icon', 'value': icon.replace('-', '_')}
-            )
+        The parse_weather_device() method confirms that the downloaded data for the device location
+        are newer than the data the device already has, and then hands the device to the parser for
+        its device type.
 
-            # =========================== Nearest Storm Bearing ===========================
-            storm_bearing, storm_bearing_ui = self.fix_corrupted_data(val=storm_bearing)
-            storm_bearing_ui = self.ui_format_index(dev, val=storm_bearing_ui)
-            weather_states_list.append(
-                {'key': 'nearestStormBearing',
-                 'value': storm_bearing,
-                 'uiValue': storm_bearing_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'nearestStormBearingIcon', 'value': storm_bearing}
-            )
+        :param indigo.Device dev:
+        """
+        location = self.device_location(dev)
 
-            # ========================== Nearest Storm Distance ===========================
-            storm_distance, storm_distance_ui = self.fix_corrupted_data(val=storm_distance)
-            storm_distance_ui = self.ui_format_distance(dev, val=storm_distance_ui)
-            weather_states_list.append(
-                {'key': 'nearestStormDistance',
-                 'value': storm_distance,
-                 'uiValue': storm_distance_ui}
-            )
-            weather_states_list.append(
-                {'key': 'nearestStormDistanceIcon', 'value': round(storm_distance)}
-            )
+        # The location couldn't be downloaded and is waiting for another attempt. Any data kept from
+        # the last good download are left for the forecast email and the cache.
+        if location in self.inst_attr['retry_schedule']:
+            dev.updateStateOnServer('onOffState', value=False, uiValue="No Comm")
+            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+            return
 
-            # =================================== Ozone ===================================
-            ozone, ozone_ui = self.fix_corrupted_data(val=ozone)
-            ozone_ui = self.ui_format_index(dev, val=ozone_ui)
-            weather_states_list.append(
-                {'key': 'ozone',
-                 'value': ozone,
-                 'uiValue': ozone_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'ozoneIcon', 'value': round(ozone)}
-            )
+        try:
+            # New devices may not have an epoch value yet.
+            device_epoch = dev.states['currentObservationEpoch']
+            try:
+                device_epoch = int(device_epoch)
 
-            # ============================ Barometric Pressure ============================
-            pressure, pressure_ui = self.fix_corrupted_data(val=pressure)
-            pressure_ui = self.ui_format_pressure(dev, val=pressure_ui)
-            weather_states_list.append(
-                {'key': 'pressure',
-                 'value': pressure,
-                 'uiValue': pressure_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'pressureIcon', 'value': round(pressure)}
-            )
+            except ValueError:
+                device_epoch = 0
 
-            # ============================= Precip Intensity ==============================
-            precip_intensity, precip_intensity_ui = self.fix_corrupted_data(val=precip_intensity)
-            precip_intensity_ui = self.ui_format_rain(dev=dev, val=precip_intensity_ui)
-            weather_states_list.append(
-                {'key': 'precipIntensity',
-                 'value': precip_intensity,
-                 'uiValue': precip_intensity_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'precipIntensityIcon', 'value': round(precip_intensity)}
-            )
+            # If we don't know the age of the data, we don't update.
+            try:
+                weather_data_epoch = int(self.masterWeatherDict[location]['currently']['time'])
 
-            # ============================ Precip Probability =============================
-            precip_probability, precip_probability_ui = (
-                self.fix_corrupted_data(val=float(precip_probability) * 100)
-            )
-            precip_probability_ui = self.ui_format_percentage(dev=dev, val=precip_probability_ui)
-            weather_states_list.append(
-                {'key': 'precipProbability',
-                 'value': precip_probability,
-                 'uiValue': precip_probability_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'precipProbabilityIcon', 'value': round(precip_probability)}
-            )
+            except ValueError:
+                weather_data_epoch = 0
 
-            # ================================== Summary ==================================
-            weather_states_list.append(
-                {'key': 'summary', 'value': summary}
-            )
+            good_time = device_epoch <= weather_data_epoch
+            if not good_time:
+                self.logger.warning(
+                    f"Latest data are older than data we already have. Skipping "
+                    f"{dev.name} update."
+                )
 
-            # ================================ Temperature ================================
-            temperature, temperature_ui = self.fix_corrupted_data(val=temperature)
-            temperature_ui = self.ui_format_temperature(dev=dev, val=temperature_ui)
-            weather_states_list.append(
-                {'key': 'temperature',
-                 'value': temperature,
-                 'uiValue': temperature_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'temperatureIcon', 'value': round(temperature)}
-            )
+        except KeyError:
+            if not self.inst_attr['comm_error']:
+                self.logger.warning(
+                    f"{dev.name} cannot determine age of data. Skipping until next "
+                    f"scheduled poll."
+                )
+            good_time = False
 
-            # ==================================== UV =====================================
-            uv, uv_ui = self.fix_corrupted_data(val=uv)
-            uv_ui = self.ui_format_index(dev, val=uv_ui)
-            weather_states_list.append(
-                {'key': 'uv', 'value': uv, 'uiValue': uv_ui}
-            )
-            weather_states_list.append(
-                {'key': 'uvIcon', 'value': round(uv)}
-            )
+        # If the weather dict is not empty, the data are newer than the data we
+        # already have lets update the devices.
+        if self.masterWeatherDict and good_time:
 
-            # ================================ Visibility =================================
-            visibility, visibility_ui = self.fix_corrupted_data(val=visibility)
-            visibility_ui = self.ui_format_distance(dev, val=visibility_ui)
-            weather_states_list.append(
-                {'key': 'visibility',
-                 'value': visibility,
-                 'uiValue': visibility_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'visibilityIcon', 'value': round(visibility)}
-            )
+            # Astronomy devices.
+            if dev.deviceTypeId == 'Astronomy':
+                self.parse_astronomy_data(dev=dev)
 
-            # =============================== Wind Bearing ================================
-            current_wind_bearing, current_wind_bearing_ui = self.fix_corrupted_data(val=wind_bearing)
-            weather_states_list.append(
-                {'key': 'windBearing',
-                 'value': current_wind_bearing,
-                 'uiValue': current_wind_bearing_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'windBearingIcon', 'value': round(current_wind_bearing)}
-            )
+            # Hourly devices.
+            elif dev.deviceTypeId == 'Hourly':
+                self.parse_hourly_forecast_data(dev=dev)
 
-            # ============================= Wind Bearing Name =============================
-            wind_bearing_name = self.ui_format_wind_name(val=current_wind_bearing)
-            weather_states_list.append(
-                {'key': 'windBearingName', 'value': wind_bearing_name}
-            )
+            # Daily devices.
+            elif dev.deviceTypeId == 'Daily':
+                self.parse_daily_forecast_data(dev=dev)
 
-            # ================================= Wind Gust =================================
-            current_wind_gust, current_wind_gust_ui = self.fix_corrupted_data(val=wind_gust)
-            current_wind_gust_ui = self.ui_format_wind(dev=dev, val=current_wind_gust_ui)
-            weather_states_list.append(
-                {'key': 'windGust',
-                 'value': current_wind_gust,
-                 'uiValue': current_wind_gust_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'windGustIcon', 'value': round(current_wind_gust)}
-            )
+            # Weather devices.
+            elif dev.deviceTypeId == 'Weather':
+                self.parse_current_weather_data(dev=dev)
+                self.parse_alerts_data(dev=dev)
 
-            # ================================ Wind Speed =================================
-            current_wind_speed, current_wind_speed_ui = self.fix_corrupted_data(val=wind_speed)
-            current_wind_speed_ui = self.ui_format_wind(dev=dev, val=current_wind_speed_ui)
-            weather_states_list.append(
-                {'key': 'windSpeed',
-                 'value': current_wind_speed,
-                 'uiValue': current_wind_speed_ui
-                 }
-            )
-            weather_states_list.append(
-                {'key': 'windSpeedIcon', 'value': round(current_wind_speed)}
-            )
+    # =============================================================================
+    def device_refresh_interval(self, dev: indigo.Device | None = None, stretch: bool = True) -> int:  # noqa
+        """
+        Return the refresh interval for a device (in seconds)
 
-            # ================================ Wind String ================================
-            weather_states_list.append(
-                {'key': 'windString',
-                 'value': (f"{wind_bearing_name} at "
-                           f"{round(current_wind_speed):.0f}{dev.pluginProps['windUnits']}")
-                 }
-            )
+        The device setting wins, then the setting for its device type, then the plugin call interval.
+        Weather device intervals are stretched by the quota governor when the daily call limit would
+        otherwise run out before midnight (UTC).
 
-            new_props = dev.pluginProps
-            _lat = float(dev.pluginProps.get('latitude', 'lat'))
-            _long = float(dev.pluginProps.get('longitude', 'long'))
-            new_props['address'] = f"{_lat:.5f}, {_long:.5f}"
-            dev.replacePluginPropsOnServer(new_props)
+        :param indigo.Device dev:
+        :param bool stretch: apply the quota governor interval multiplier.
+        :return int:
+        """
+        download_interval = int(self.pluginPrefs.get('downloadInterval', '900'))
+        interval          = dev.pluginProps.get('refreshInterval', 'default')
 
-            dev.updateStatesOnServer(weather_states_list)
-            dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensorOn)
-            display_value = self.ui_format_item_list_temperature(val=temperature)
-            dev.updateStateOnServer(
-                'onOffState',
-                value=True,
-                uiValue=f"{display_value}{dev.pluginProps['temperatureUnits']}"
-            )
+        if interval == 'default':
+            type_pref = DEVICE_TYPE_INTERVAL_PREFS.get(dev.deviceTypeId, '')
+            interval  = self.pluginPrefs.get(type_pref, 'default')
 
-        except Exception:  # noqa
-            self.logger.error("Problem parsing weather device data.", exc_info=True)
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+        try:
+            interval = max(60, int(interval))
+        except ValueError:
+            interval = download_interval
+
+        if stretch and dev.pluginProps.get('isWeatherDevice', False):
+            interval = int(interval * self.quota.scale)
+
+        return interval
 
     # =============================================================================
-    def refresh_weather_data(self) -> None:
+    def next_refresh_time(self, dev: indigo.Device | None = None, after: float = 0) -> float:  # noqa
+        """
+        Return the first staggered refresh time for a device after an epoch
+
+        Refresh times fall on a grid of the device's interval, offset by a phase within the plugin call
+        interval derived from the device location (image downloaders use the device id.) Devices at
+        the same location get the same phase, so their refreshes line up (and share one download)
+        whenever their intervals do, while different locations are spread across the call interval.
+
+        :param indigo.Device dev:
+        :param float after: epoch
+        :return float: epoch
+        """
+        if dev.pluginProps.get('isWeatherDevice', False):
+            key = ",".join(self.device_location(dev))
+        else:
+            key = str(dev.id)
+
+        return staggered_time(
+            key,
+            self.device_refresh_interval(dev),
+            int(self.pluginPrefs.get('downloadInterval', '900')),
+            after,
+        )
+
+    # =============================================================================
+    def due_devices(self, weather: bool = True, force: bool = False) -> list:
+        """
+        Return the enabled devices that are due for a refresh and schedule their next refresh
+
+        Devices that are due within the REFRESH_ALIGN_WINDOW are refreshed now so that devices
+        whose schedules nearly line up share a download. Devices that haven't been scheduled yet
+        are due right away unless we already have data for their location (from the forecast
+        cache, for example) that were decoded for their device type.
+
+        :param bool weather: weather devices (True) or image downloader devices (False)
+        :param bool force: every enabled device is due.
+        :return list:
+        """
+        now         = time.time()
+        horizon     = now + REFRESH_ALIGN_WINDOW
+        schedule    = self.inst_attr['next_refresh']
+        due_devices = []
+
+        for dev in indigo.devices.iter("self"):
+            if not (dev.configured and dev.enabled):
+                continue
+            if bool(dev.pluginProps.get('isWeatherDevice', False)) != weather:
+                continue
+
+            next_refresh = schedule.get(dev.id)
+            location     = self.device_location(dev) if weather else None
+            if (
+                    next_refresh is None
+                    and location in self.masterWeatherDict
+                    and dev.deviceTypeId in self.inst_attr['projected_types'].get(location, ())
+            ):
+                next_refresh = self.next_refresh_time(dev, now)
+
+            if force or next_refresh is None or next_refresh <= horizon:
+                due_devices.append(dev)
+                next_refresh = self.next_refresh_time(dev, horizon)
+
+            schedule[dev.id] = next_refresh
+
+        return due_devices
+
+    # =============================================================================
+    def seconds_until_next_refresh(self, weather: bool = True) -> float:
+        """
+        Return the number of seconds until the next weather (or image downloader) device is due
+
+        Returns the plugin call interval if there aren't any devices scheduled.
+
+        :param bool weather: weather devices (True) or image downloader devices (False)
+        :return float:
+        """
+        schedule = self.inst_attr['next_refresh']
+        upcoming = [
+            schedule[dev.id] for dev in indigo.devices.iter("self")
+            if dev.id in schedule and bool(dev.pluginProps.get('isWeatherDevice', False)) == weather
+        ]
+
+        if not upcoming:
+            return float(self.pluginPrefs.get('downloadInterval', '900'))
+
+        return max(0.0, min(upcoming) - time.time())
+
+    # =============================================================================
+    def refresh_weather_data(self, force: bool = False) -> None:
         """
         Refresh data for plugin devices
 
-        This method refreshes weather data for all devices based on a general cycle, Action Item or
-        Plugin Menu call.
+        This method refreshes weather data for the devices that are due (see due_devices()), or for
+        all devices when forced by an Action Item or Plugin Menu call.
+
+        :param bool force: refresh every enabled weather device.
         """
         self.inst_attr['download_interval'] = dt.timedelta(
             seconds=int(self.pluginPrefs.get('downloadInterval', '900'))
@@ -2514,8 +2687,63 @@ class Plugin(indigo.PluginBase):
         self.inst_attr['date_format'] = self.Formatter.dateFormat()
         self.inst_attr['time_format'] = self.Formatter.timeFormat()
 
-        # Check to see if the daily call limit has been reached.
-        self.masterWeatherDict = {}
+        # Stretch the refresh intervals if the current schedule would run out of API calls today.
+        weather_devices = [
+            dev for dev in indigo.devices.iter("self")
+            if dev.configured and dev.enabled and dev.pluginProps.get('isWeatherDevice', False)
+        ]
+        self.update_quota(weather_devices)
+
+        due_devices = self.due_devices(weather=True, force=force)
+
+        self.inst_attr['states_pushed'] = 0
+        self.inst_attr['states_suppressed'] = 0
+        self.inst_attr['formatters'].clear()
+        self.inst_attr['location_context'].clear()
+
+        # ================================ Fetch Stage ================================
+        # Collect the distinct locations of the weather devices that are due and download them
+        # before any of the devices are parsed. Devices at the same location that are due together
+        # share one download.
+        # Locations that are waiting out a retry backoff are left to retry_weather_data().
+        now = dt.datetime.now()
+        locations = {self.device_location(dev) for dev in due_devices}
+
+        # When the calls left today can't cover every location, the highest priority locations are
+        # downloaded and the rest wait for a later cycle.
+        allowed, deferred = self.quota.allot(self.rank_locations(locations, due_devices))
+        if deferred:
+            self.logger.warning(
+                f"The daily API call limit ({self.quota.limit}) leaves {len(allowed)} call(s) today. "
+                f"Skipping {len(deferred)} location(s)."
+            )
+            locations   = set(allowed)
+            due_devices = [dev for dev in due_devices if self.device_location(dev) in locations]
+        due_ids = {dev.id for dev in due_devices}
+
+        # Forget locations that no device uses any longer. Data that's about to be refreshed is kept
+        # until a download replaces it, so a failed download doesn't lose the last good forecast.
+        in_use = {self.device_location(dev) for dev in weather_devices}
+        for location in list(self.masterWeatherDict):
+            if location not in in_use:
+                del self.masterWeatherDict[location]
+                self.inst_attr['projected_types'].pop(location, None)
+
+        # Report the number of API calls saved by sharing locations between nearby devices.
+        raw_locations = {
+            (dev.pluginProps['latitude'], dev.pluginProps['longitude']) for dev in due_devices
+        }
+        self.inst_attr['dedup_calls_saved'] = len(raw_locations) - len(locations)
+        self.logger.debug(
+            f"{len(due_devices)} weather device(s) due share {len(locations)} location(s). Location "
+            f"dedup saved {self.inst_attr['dedup_calls_saved']} API call(s) this cycle."
+        )
+
+        locations = {
+            location for location in locations
+            if self.inst_attr['retry_schedule'].get(location, {}).get('next_attempt', now) <= now
+        }
+        self.fetch_weather_data(locations)
 
         for dev in indigo.devices.iter("self"):
             # for dev in indigo.devices.items("self"):
@@ -2540,73 +2768,9 @@ class Plugin(indigo.PluginBase):
                     dev.updateStateOnServer('onOffState', value=False, uiValue="Disabled")
                     dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
 
-                elif dev.enabled:
+                elif dev.id in due_ids:
                     dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
-
-                    if dev.pluginProps['isWeatherDevice']:
-
-                        location = (dev.pluginProps['latitude'], dev.pluginProps['longitude'])
-
-                        self.get_weather_data(dev)
-
-                        try:
-                            # New devices may not have an epoch value yet.
-                            device_epoch = dev.states['currentObservationEpoch']
-                            try:
-                                device_epoch = int(device_epoch)
-
-                            except ValueError:
-                                device_epoch = 0
-
-                            # If we don't know the age of the data, we don't update.
-                            try:
-                                weather_data_epoch = int(self.masterWeatherDict[location]['currently']['time'])
-
-                            except ValueError:
-                                weather_data_epoch = 0
-
-                            good_time = device_epoch <= weather_data_epoch
-                            if not good_time:
-                                self.logger.warning(
-                                    f"Latest data are older than data we already have. Skipping "
-                                    f"{dev.name} update."
-                                )
-
-                        except KeyError:
-                            if not self.inst_attr['comm_error']:
-                                self.logger.warning(
-                                    f"{dev.name} cannot determine age of data. Skipping until next "
-                                    f"scheduled poll."
-                                )
-                            good_time = False
-
-                        # If the weather dict is not empty, the data are newer than the data we
-                        # already have lets update the devices.
-                        if self.masterWeatherDict and good_time:
-
-                            # Astronomy devices.
-                            if dev.deviceTypeId == 'Astronomy':
-                                self.parse_astronomy_data(dev=dev)
-
-                            # Hourly devices.
-                            elif dev.deviceTypeId == 'Hourly':
-                                self.parse_hourly_forecast_data(dev=dev)
-
-                            # Daily devices.
-                            elif dev.deviceTypeId == 'Daily':
-                                self.parse_daily_forecast_data(dev=dev)
-
-                                if self.pluginPrefs.get('updaterEmailsEnabled', False):
-                                    self.email_forecast(dev=dev)
-
-                            # Weather devices.
-                            elif dev.deviceTypeId == 'Weather':
-                                self.parse_current_weather_data(dev=dev)
-                                self.parse_alerts_data(dev=dev)
-
-                    # Image Downloader devices.
-                    elif dev.deviceTypeId == 'satelliteImageDownloader':
-                        self.get_satellite_image(dev=dev)
+                    self.parse_weather_device(dev)
 
             except Exception:  # noqa
                 self.logger.error(f"Problem parsing Weather data. Dev: {dev.name}", exc_info=True)
@@ -2617,302 +2781,341 @@ class Plugin(indigo.PluginBase):
         self.pluginPrefs['lastSuccessfulPoll'] = f"{now:%Y-%m-%d %H:%M:%S}"
 
         # Update next poll time
-        next_poll_time = now + self.inst_attr['download_interval']
+        next_poll_time = now + dt.timedelta(seconds=self.seconds_until_next_refresh(weather=True))
         self.inst_attr['next_poll'] = next_poll_time
         self.pluginPrefs['nextPoll'] = f"{next_poll_time:%Y-%m-%d %H:%M:%S}"
 
+        self.logger.debug(
+            f"Pushed {self.inst_attr['states_pushed']} state(s) to the server and suppressed "
+            f"{self.inst_attr['states_suppressed']} unchanged state(s) this cycle."
+        )
         self.logger.info("Weather data cycle complete.")
 
     # =============================================================================
-    def send_weather_emails(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
-        """ placeholder"""
-        for dev in indigo.devices.iter("self"):
-            if dev.deviceTypeId == "Daily" and dev.enabled:
-                self.email_forecast(dev, force=True)
-
-    # =============================================================================
-    def trigger_processing(self) -> None:
+    def run_scheduled_jobs(self) -> None:
         """
-        Fire various triggers for plugin devices
+        Run the jobs that are due
 
-        Weather Location Offline:
-        The trigger_processing method will examine the time of the last weather location update and,
-        if the update exceeds the time delta specified in a Fantastically Useful Weather Utility
-        Plugin Weather Location Offline trigger, the trigger will be fired. The plugin examines the
-        value of the latest "currentObservationEpoch" and *not* the Indigo Last Update value.
-
-        An additional event that will cause a trigger to be fired is if the weather location
-        temperature is less than -55 which indicates that a data value is invalid.
+        The jobs are:
+            refresh  - download the locations of the weather devices that are due and update them,
+                       then schedule the triggers and emails jobs and the next refresh.
+            images   - download the satellite images that are due.
+            triggers - check the plugin triggers.
+            emails   - send any forecast emails that are due (also runs at the top of each hour.)
+            retry    - retry locations whose download failed.
+        """
+        for name in self.scheduler.pop_due():
+            if self.inst_attr['pluginIsShuttingDown']:
+                return
 
-        Severe Weather Alerts:
-        This trigger will fire if a weather location has at least one severe weather alert.
+            try:
+                force = name in self.inst_attr['forced_jobs']
+                self.inst_attr['forced_jobs'].discard(name)
 
-        Note that trigger processing will only occur during routine weather update cycles and will
-        not be triggered when a data refresh is called from the Indigo Plugins menu.
-        """
-        # Reconstruct the masterTriggerDict in case it has changed.
-        self.masterTriggerDict = {
-            int(trigger.pluginProps['list_of_devices']): (
-                trigger.pluginProps['offlineTimer'], trigger.id
-            )
-            for trigger in indigo.triggers.iter(filter="self.weatherSiteOffline")
-        }
+                if name == 'refresh':
+                    self.refresh_weather_data(force=force)
+                    for job in ('triggers', 'emails'):
+                        self.scheduler.schedule(job)
+                    self.scheduler.schedule('refresh', self.seconds_until_next_refresh(weather=True))
 
-        try:
+                elif name == 'images':
+                    self.download_satellite_images(force=force)
+                    self.scheduler.schedule('images', self.seconds_until_next_refresh(weather=False))
 
-            # Iterate through all the plugin devices to see if a related trigger should be fired
-            for dev in indigo.devices.iter(filter='self'):
+                elif name == 'triggers':
+                    self.trigger_processing()
 
-                # ========================== Weather Location Offline ==========================
-                # If the device is in the masterTriggerDict, it has an offline trigger
-                if dev.id in self.masterTriggerDict:
+                elif name == 'emails':
+                    self.check_weather_emails()
+                    self.scheduler.schedule('emails', self.seconds_until_next_hour(), keep_earlier=True)
 
-                    # Process the trigger only if the device is enabled
-                    if dev.enabled:
+                elif name == 'retry':
+                    self.retry_weather_data()
+                    if self.inst_attr['retry_schedule']:
+                        self.scheduler.schedule(
+                            'retry', self.seconds_until_next_retry(900), keep_earlier=True
+                        )
 
-                        trigger_id = self.masterTriggerDict[dev.id][1]  # Indigo trigger ID
+            except Exception:  # noqa
+                self.logger.error(f"Problem running the {name} job.", exc_info=True)
 
-                        if indigo.triggers[trigger_id].pluginTypeId == 'weatherSiteOffline':
+    # =============================================================================
+    @staticmethod
+    def seconds_until_next_hour() -> float:
+        """
+        Return the number of seconds until the top of the next hour
 
-                            offline_delta = dt.timedelta(
-                                minutes=int(self.masterTriggerDict.get(dev.id, ('60', ''))[0])
-                            )
+        :return float:
+        """
+        now = dt.datetime.now()
+        return (now.replace(minute=0, second=0, microsecond=0) + dt.timedelta(hours=1) - now).total_seconds()
 
-                            # Convert currentObservationEpoch to a localized datetime object
-                            current_observation_epoch = float(dev.states['currentObservationEpoch'])
-                            current_observation = time.strftime(
-                                '%Y-%m-%d %H:%M', time.localtime(current_observation_epoch)
-                            )
-                            current_observation = parse(current_observation)
+    # =============================================================================
+    def check_weather_emails(self) -> None:
+        """
+        Send the forecast emails that are due
 
-                            # Time elapsed since last observation
-                            diff = dt.datetime.now() - current_observation
+        email_forecast() decides whether each Daily device's email is due (and hasn't already been
+        sent today.)
+        """
+        if not self.pluginPrefs.get('updaterEmailsEnabled', False):
+            return
 
-                            # If the observation is older than offline_delta
-                            if diff >= offline_delta:
-                                total_seconds = int(diff.total_seconds())
-                                days, remainder = divmod(total_seconds, 60 * 60 * 24)
-                                hours, remainder = divmod(remainder, 60 * 60)
-                                minutes, seconds = divmod(remainder, 60)
+        for dev in indigo.devices.iter("self.Daily"):
+            if dev.enabled and self.device_location(dev) in self.masterWeatherDict:
+                self.email_forecast(dev=dev)
 
-                                # Note that we leave seconds off, but it could easily be added if needed.
-                                diff_msg = f"{days} days, {hours} hrs, {minutes} mins"
+    # =============================================================================
+    def download_satellite_images(self, force: bool = False) -> None:
+        """
+        Download the images for the image downloader devices that are due
 
-                                dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-                                dev.updateStateOnServer('onOffState', value='offline')
+        The images are downloaded through their own thread pool (and HTTP session), separate from
+        the forecast downloads, so that a slow image server doesn't hold up the weather devices. The
+        number of simultaneous image downloads is controlled by the 'maxImageDownloads' plugin
+        preference. The devices are updated as each download completes.
 
-                                if indigo.triggers[trigger_id].enabled:
-                                    self.logger.warning(f"{dev.name} location appears to be offline for {diff_msg}")
-                                    indigo.trigger.execute(trigger_id)
+        :param bool force: download every enabled image downloader device.
+        """
+        devices = []
 
-                            # If the temperature observation is lower than -55
-                            elif dev.states['temperature'] <= -55.0:
-                                dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-                                dev.updateStateOnServer('onOffState', value='offline')
+        for dev in self.due_devices(weather=False, force=force):
+            destination = dev.pluginProps['imageDestinationLocation']
 
-                                if indigo.triggers[trigger_id].enabled:
-                                    self.logger.warning(
-                                        f"{dev.name} location appears to be offline (ambient "
-                                        f"temperature lower than -55)."
-                                    )
-                                    indigo.trigger.execute(trigger_id)
+            if not destination.endswith((".gif", ".jpg", ".jpeg", ".png")):
+                self.logger.error("The image destination must include one of these types (.gif, .jpg, .jpeg, .png)")
+                dev.updateStateOnServer('onOffState', value=False, uiValue="Bad Type")
+                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+                continue
 
-                # ============================ Severe Weather Alert ============================
-                for trigger in indigo.triggers.iter('self.weatherAlert'):
+            validator = self.inst_attr['image_validators'].get(dev.id)
+            if validator is None or validator.destination != destination:
+                self.inst_attr['image_validators'][dev.id] = ImageValidator(destination)
 
-                    if int(trigger.pluginProps['listOfDevices']) == dev.id \
-                            and dev.states['alertStatus'] and trigger.enabled:
+            # Frame history (and the animated loop) are set up the first time the device runs.
+            frame_count = int(dev.pluginProps.get('frameCount', '0'))
+            if frame_count and dev.id not in self.inst_attr['image_frames']:
+                try:
+                    self.inst_attr['image_frames'][dev.id] = (
+                        FrameRing(destination, frame_count, int(dev.pluginProps.get('frameMaxAge', '10800'))),
+                        frame_loop(destination, int(dev.pluginProps.get('frameDelay', '500')))
+                        if dev.pluginProps.get('frameLoop', False) else None,
+                    )
+                except OSError:
+                    self.logger.warning(f"[{dev.name}] Unable to create the image frame folder.", exc_info=True)
 
-                        self.logger.warning(
-                            f"{dev.name} location has at least one severe weather alert."
-                        )
-                        indigo.trigger.execute(trigger.id)
+            devices.append(dev)
 
-        except KeyError:
-            pass
+        if not devices or self.inst_attr['pluginIsShuttingDown']:
+            return
 
-    # =============================================================================
-    def ui_format_distance(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
-        """
-        Format distance data for Indigo UI
+        max_workers = max(1, int(self.pluginPrefs.get('maxImageDownloads', '2')))
 
-        Adds distance units to rain values for display in control pages, etc.
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as pool:
+            futures = {pool.submit(self.get_satellite_image, dev): dev for dev in devices}
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
-        """
-        distance_units = dev.pluginProps['distanceUnits']
+            for future in as_completed(futures):
+                dev = futures[future]
 
-        try:
-            return f"{float(val):0.{self.pluginPrefs['uiDistanceDecimal']}f}{distance_units}"
+                # Don't wait on downloads that haven't started if the plugin is shutting down.
+                if self.inst_attr['pluginIsShuttingDown']:
+                    for pending in futures:
+                        pending.cancel()
+                    break
 
-        except ValueError:
-            return f"{val}{distance_units}"
+                try:
+                    cache_status, download_time = future.result()
 
-    # =============================================================================
-    def ui_format_index(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
-        """
-        Format index data for Indigo UI
+                except requests.exceptions.ConnectionError:
+                    if not self.inst_attr['comm_error']:
+                        self.logger.error("Error downloading satellite image. (No comm.)")
+                        self.inst_attr['comm_error'] = True
+                    dev.updateStateOnServer('onOffState', value=False, uiValue="No comm")
+                    dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+                    continue
 
-        Adds index units to rain values for display in control pages, etc.
+                except requests.exceptions.Timeout:
+                    self.logger.warning("Error downloading satellite image (server timeout occurred).")
+                    continue
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
-        """
-        index_units = dev.pluginProps['indexUnits']
+                except Exception:  # noqa
+                    self.inst_attr['comm_error'] = True
+                    self.logger.error(f"[{dev.name}] Error downloading satellite image.", exc_info=True)
+                    dev.updateStateOnServer('onOffState', value=False, uiValue="No comm")
+                    dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+                    continue
+
+                bytes_saved = self.inst_attr['image_validators'][dev.id].bytes_saved
+                frames      = self.inst_attr['image_frames'].get(dev.id)
+                self.update_device_states(
+                    dev,
+                    [
+                        {'key': 'imageCacheStatus', 'value': cache_status},
+                        {'key': 'imageBytesSaved', 'value': bytes_saved},
+                        {'key': 'imageDownloadTime', 'value': round(download_time, 3),
+                         'uiValue': f"{download_time:.3f} s"},
+                        {'key': 'imageFrameCount', 'value': len(frames[0].frames) if frames else 0},
+                    ]
+                )
+                dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
+                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
 
-        try:
-            return f"{float(val):0.{self.pluginPrefs['uiIndexDecimal']}f}{index_units}"
+                # Report results of download timer.
+                self.logger.debug(
+                    f"[{dev.name}] Satellite image download time: {download_time:.3f} seconds ({cache_status})."
+                )
+                self.inst_attr['comm_error'] = False
 
-        except ValueError:
-            return f"{val}{index_units}"
+    # =============================================================================
+    def send_weather_emails(self, values_dict: indigo.Dict | None = None) -> None:  # noqa
+        """ placeholder"""
+        for dev in indigo.devices.iter("self"):
+            if dev.deviceTypeId == "Daily" and dev.enabled:
+                self.email_forecast(dev, force=True)
 
     # =============================================================================
-    def ui_format_item_list_temperature(self, val: int | float | str | None = None) -> str:
+    def trigger_processing(self) -> None:
         """
-        Format temperature values for Indigo UI
-
-        Adjusts the decimal precision of the temperature value for the Indigo Item List. Note: this
-        method needs to return a string rather than a Unicode string (for now.)
+        Fire various triggers for plugin devices
 
-        :param int or class Str val:
-        :return str:
-        """
-        try:
-            return f"{val:0.{int(self.pluginPrefs.get('itemListTempDecimal', '1'))}f}"
-        except ValueError:
-            return f"{val}"
+        Weather Location Offline:
+        The trigger_processing method will examine the time of the last weather location update and,
+        if the update exceeds the time delta specified in a Fantastically Useful Weather Utility
+        Plugin Weather Location Offline trigger, the trigger will be fired. The plugin examines the
+        value of the latest "currentObservationEpoch" and *not* the Indigo Last Update value.
 
-    # =============================================================================
-    def ui_format_pressure(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
-        """
-        Format index data for Indigo UI
+        An additional event that will cause a trigger to be fired is if the weather location
+        temperature is less than -55 which indicates that a data value is invalid.
 
-        Adds index units to rain values for display in control pages, etc.
+        Severe Weather Alerts:
+        This trigger will fire if a weather location has at least one new severe weather alert (one
+        that wasn't there when the location was last updated; see parse_alerts_data().)
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
+        Note that trigger processing will only occur during routine weather update cycles and will
+        not be triggered when a data refresh is called from the Indigo Plugins menu.
         """
-        index_units = dev.pluginProps['pressureUnits']
-
-        try:
-            return f"{float(val):0.{self.pluginPrefs['uiIndexDecimal']}f}{index_units}"
+        offline_triggers = self.masterTriggerDict['weatherSiteOffline']
+        alert_triggers   = self.masterTriggerDict['weatherAlert']
 
-        except ValueError:
-            return f"{val}{index_units}"
+        # Only the devices that have an (enabled) trigger are examined.
+        for dev_id in sorted(offline_triggers.keys() | alert_triggers.keys()):
 
-    # =============================================================================
-    def ui_format_percentage(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
-        """
-        Format percentage data for Indigo UI
+            try:
+                dev = indigo.devices[dev_id]
 
-        Adjusts the decimal precision of percentage values for display in control pages, etc.
+                # ========================== Weather Location Offline ==========================
+                # Process the trigger only if the device is enabled
+                if dev.enabled:
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
-        """
-        percentage_decimal = int(self.pluginPrefs.get('uiPercentageDecimal', '1'))
-        percentage_units = dev.pluginProps.get('percentageUnits', '')
+                    for trigger_id, timer in offline_triggers.get(dev_id, {}).items():
 
-        try:
-            return f"{float(val):0.{percentage_decimal}f}{percentage_units}"
+                        offline_delta = dt.timedelta(minutes=int(timer))
 
-        except ValueError:
-            return f"{val}{percentage_units}"
+                        # Convert currentObservationEpoch to a localized datetime object
+                        current_observation_epoch = float(dev.states['currentObservationEpoch'])
+                        current_observation = time.strftime(
+                            '%Y-%m-%d %H:%M', time.localtime(current_observation_epoch)
+                        )
+                        current_observation = parse(current_observation)
 
-    # =============================================================================
-    def ui_format_rain(self, dev: indigo.Device | None = None, val: int | float | str | None = None) -> str:  # noqa
-        """
-        Format rain data for Indigo UI
+                        # Time elapsed since last observation
+                        diff = dt.datetime.now() - current_observation
 
-        Adds rain units to rain values for display in control pages, etc.
+                        # If the observation is older than offline_delta
+                        if diff >= offline_delta:
+                            total_seconds = int(diff.total_seconds())
+                            days, remainder = divmod(total_seconds, 60 * 60 * 24)
+                            hours, remainder = divmod(remainder, 60 * 60)
+                            minutes, seconds = divmod(remainder, 60)
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
-        """
-        # Some devices use the prop 'rainUnits' and some use the prop 'rainAmountUnits'.  So if we
-        # fail on the first, try the second and--if still not successful, return and empty string.
-        try:
-            rain_units = dev.pluginProps['rainUnits']
-        except KeyError:
-            rain_units = dev.pluginProps.get('rainAmountUnits', '')
+                            # Note that we leave seconds off, but it could easily be added if needed.
+                            diff_msg = f"{days} days, {hours} hrs, {minutes} mins"
 
-        if val in ("NA", "N/A", "--", ""):
-            return val
+                            dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
+                            dev.updateStateOnServer('onOffState', value='offline')
 
-        try:
-            return f"{float(val):0.2f}{rain_units}"
+                            self.logger.warning(f"{dev.name} location appears to be offline for {diff_msg}")
+                            indigo.trigger.execute(trigger_id)
 
-        except ValueError:
-            return f"{val}"
+                        # If the temperature observation is lower than -55
+                        elif dev.states['temperature'] <= -55.0:
+                            dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
+                            dev.updateStateOnServer('onOffState', value='offline')
 
-    # =============================================================================
-    def ui_format_temperature(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
-        """
-        Format temperature data for Indigo UI
+                            self.logger.warning(
+                                f"{dev.name} location appears to be offline (ambient "
+                                f"temperature lower than -55)."
+                            )
+                            indigo.trigger.execute(trigger_id)
 
-        Adjusts the decimal precision of certain temperature values and appends the desired units
-        string for display in control pages, etc.
+                # ============================ Severe Weather Alert ============================
+                # Fire only when the device has alerts that weren't there the last time.
+                if dev_id in alert_triggers and dev_id in self.inst_attr['new_alerts']:
 
-        :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
-        """
-        temp_decimal      = int(self.pluginPrefs.get('uiTempDecimal', '1'))
-        temperature_units = dev.pluginProps.get('temperatureUnits', '')
+                    for trigger_id in alert_triggers[dev_id]:
+                        self.logger.warning(
+                            f"{dev.name} location has at least one severe weather alert."
+                        )
+                        indigo.trigger.execute(trigger_id)
 
-        try:
-            return f"{float(val):0.{temp_decimal}f}{temperature_units}"
+            except (KeyError, ValueError):
+                pass
 
-        except ValueError:
-            return "--"
+        # New alerts have been seen by the triggers.
+        self.inst_attr['new_alerts'].clear()
 
     # =============================================================================
-    def ui_format_wind(self, dev: indigo.Device | None = None, val: int | str | None = None) -> str:  # noqa
+    def update_device_address(self, dev: indigo.Device | None = None) -> None:  # noqa
         """
-        Format wind data for Indigo UI
+        Set the device address when the device coordinates change
 
-        Adjusts the decimal precision of certain wind values for display in control pages, etc.
+        The address is normally saved by validateDeviceConfigUi(). This catches devices that were
+        created before that (or whose coordinates were changed another way.) Replacing the props is
+        a round trip to the server that can restart the device, so it's only done when the address
+        is out of date.
 
         :param indigo.Device dev:
-        :param int or class Str val:
-        :return str:
         """
-        wind_decimal = int(self.pluginPrefs.get('uiWindDecimal', '1'))
-        wind_units   = dev.pluginProps.get('windUnits', '')
-
         try:
-            return f"{float(val):0.{wind_decimal}f}{wind_units}"
+            address = self.format_address(dev.pluginProps['latitude'], dev.pluginProps['longitude'])
 
-        except ValueError:
-            return f"{val}"
+        except (KeyError, ValueError):
+            self.logger.debug(f"{dev.name} doesn't have valid coordinates.")
+            return
+
+        if dev.pluginProps.get('address') != address:
+            new_props = dev.pluginProps
+            new_props['address'] = address
+            dev.replacePluginPropsOnServer(new_props)
 
     # =============================================================================
-    def ui_format_wind_name(self, val: float | int = 0) -> str:
+    def update_device_states(self, dev: indigo.Device | None = None, states_list: list | None = None) -> None:  # noqa
         """
-        Format wind data for Indigo UI
-
-        Adjusts the decimal precision of certain wind values for display in control pages, etc.
+        Send changed device states to the server
 
-        Credit to Indigo Forum user forestfield for conversion routine.
+        Each device keeps a shadow copy of the value and uiValue last pushed for each state. Only
+        states that differ from the shadow are sent with dev.updateStatesOnServer(). The onOffState
+        is also set directly by the comm status code, so it's always sent. The shadow is cleared
+        when the device starts so that a restarted device is brought fully up to date.
 
-        :param float val:
+        :param indigo.Device dev:
+        :param list states_list: [{'key': str, 'value': Any, 'uiValue': Any}, ...]
         """
-        long_short = self.pluginPrefs.get('uiWindName', 'Long')
-        val        = round(val)
+        shadow  = self.inst_attr['state_shadow'].setdefault(dev.id, {})
+        changed = []
 
-        if long_short == 'Long':
-            index = int(((val + 22.5) % 360) / 45)
-            value = ['North', 'Northeast', 'East', 'Southeast', 'South', 'Southwest', 'West',
-                     'Northwest'][index]
+        # Some lists reset a state and then set it again (alerts, for example); the last one wins.
+        latest = {state['key']: state for state in states_list}
 
-        else:
-            index = int(((val + 22.5) % 360) / 45)
-            value = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW'][index]
+        for state in latest.values():
+            pushed = (state['value'], state.get('uiValue'))
+            if state['key'] != 'onOffState' and shadow.get(state['key']) == pushed:
+                continue
+            shadow[state['key']] = pushed
+            changed.append(state)
+
+        self.inst_attr['states_pushed'] += len(changed)
+        self.inst_attr['states_suppressed'] += len(latest) - len(changed)
 
-        return value
+        if changed:
+            dev.updateStatesOnServer(changed)
@@ -8,12 +8,22 @@ kDefaultPluginPrefs = {
     'dailyIconNames': "",            # Hidden trap of icon names used by the API.
     'downloadInterval': "900",       # Frequency of weather updates.
     'hourlyIconNames': "",           # Hidden trap of icon names used by the API.
+    'intervalAstronomy': "default",  # Refresh interval for Astronomy devices ('default' = downloadInterval).
+    'intervalDaily': "default",      # Refresh interval for Daily devices ('default' = downloadInterval).
+    'intervalHourly': "default",     # Refresh interval for Hourly devices.
+    'intervalImages': "default",     # Refresh interval for image downloader devices.
+    'intervalWeather': "default",    # Refresh interval for Weather devices.
     'itemListTempDecimal': "1",      # Precision for Indigo Item List.
     'language': "en",                # Language for DS text.
     'lastSuccessfulPoll': "1970-01-01 00:00:00",    # Last successful plugin cycle
     'launchParameters': "https://pirate-weather.apiable.io",  # url for launch API button
+    'locationPrecision': "3",        # Decimal places used to share nearby locations.
+    'maxConcurrentDownloads': "4",   # Number of locations to download at the same time.
+    'maxImageDownloads': "2",        # Number of satellite images to download at the same time.
     'nextPoll': "1970-01-01 00:00:00",              # Next plugin cycle
     'noAlertLogging': False,         # Suppresses "no active alerts" logging.
+    'quotaIntervalScale': "1.00",    # Refresh interval multiplier set by the quota governor.
+    'quotaProjectedCalls': "0",      # API calls projected before midnight (UTC).
     'showDebugLevel': "30",          # Logger level.
     'uiDateFormat': "YYYY-MM-DD",    # Preferred date format string.
     'uiDistanceDecimal': "0",        # Precision for Indigo UI display (distance).
@@ -0,0 +1,153 @@
+"""
+API quota governor
+
+Pirate Weather plans have a fixed number of calls per day (the 'callCounter' plugin preference) and
+report the calls used so far in the X-Forecast-API-Calls response header. The QuotaGovernor class
+tracks the calls used each UTC day, projects how many calls the current refresh schedule will make
+before the day ends, and works out how much the refresh intervals have to be stretched for the
+remaining calls to last until midnight (UTC). When the calls left can't cover every location that's
+due, the locations are ranked by priority and the lowest ranked locations wait for the next cycle.
+"""
+
+import datetime as dt
+import math
+
+
+# =============================================================================
+class QuotaGovernor:
+    """
+    Daily API call budget
+
+    :param int limit: the number of calls allowed each UTC day.
+    :param int calls: the number of calls used so far on day.
+    :param str day: the UTC day the calls were counted ('YYYY-MM-DD'.)
+    """
+    def __init__(self, limit: int = 999, calls: int = 0, day: str = "1970-01-01") -> None:
+        self.limit     = limit
+        self.calls     = calls
+        self.day       = day
+        self.projected = 0    # calls the current schedule will make before the day ends
+        self.scale     = 1.0  # refresh interval multiplier
+        self.synced    = True  # False from a day rollover until the API's count has reset too
+        self.roll_over()
+
+    # =============================================================================
+    @staticmethod
+    def utc_day() -> str:
+        """
+        Return the current UTC day
+
+        :return str: 'YYYY-MM-DD'
+        """
+        return f"{dt.datetime.now(dt.timezone.utc):%Y-%m-%d}"
+
+    # =============================================================================
+    @staticmethod
+    def seconds_left_today() -> float:
+        """
+        Return the number of seconds until midnight (UTC)
+
+        :return float:
+        """
+        now = dt.datetime.now(dt.timezone.utc)
+        midnight = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time(), dt.timezone.utc)
+        return (midnight - now).total_seconds()
+
+    # =============================================================================
+    def roll_over(self) -> bool:
+        """
+        Reset the call count when a new UTC day starts
+
+        :return bool: True if the count was reset.
+        """
+        today = self.utc_day()
+
+        if self.day == today:
+            return False
+
+        self.day   = today
+        self.calls  = 0
+        self.scale  = 1.0
+        self.synced = False
+        return True
+
+    # =============================================================================
+    @property
+    def remaining(self) -> int:
+        """
+        The number of calls left today
+
+        :return int:
+        """
+        return max(0, self.limit - self.calls)
+
+    # =============================================================================
+    @property
+    def limit_reached(self) -> bool:
+        """
+        True when there are no calls left today
+
+        :return bool:
+        """
+        return self.remaining == 0
+
+    # =============================================================================
+    def record(self, header: str | int | None = None) -> None:
+        """
+        Record a call
+
+        The API's own count (the X-Forecast-API-Calls header) is used when the response includes it.
+        Otherwise the call is counted here. After a day rollover the header is only used once it's
+        no more than the count kept here; a higher count is still the previous day's and would hold
+        back downloads until the next midnight.
+
+        :param str header: the X-Forecast-API-Calls header value.
+        """
+        self.roll_over()
+
+        try:
+            count = int(header)
+        except (TypeError, ValueError):
+            count = -1
+
+        if count >= 0 and (self.synced or count <= self.calls + 1):
+            self.calls  = count
+            self.synced = True
+        else:
+            self.calls += 1
+
+    # =============================================================================
+    def project(self, intervals: list | None = None) -> float:
+        """
+        Project the rest of the day's calls and set the refresh interval multiplier
+
+        Each location makes one call per interval until midnight (UTC). If the projected calls are
+        more than the calls left, the intervals are stretched so that they aren't.
+
+        :param list intervals: the (unstretched) refresh interval of each location, in seconds.
+        :return float: the refresh interval multiplier.
+        """
+        self.roll_over()
+        seconds_left   = self.seconds_left_today()
+        self.projected = sum(math.ceil(seconds_left / max(1, interval)) for interval in intervals or [])
+
+        if not self.projected:
+            self.scale = 1.0
+        elif not self.remaining:
+            # Nothing left to spread out; wait for the next UTC day.
+            self.scale = max(1.0, seconds_left / min(intervals))
+        else:
+            self.scale = max(1.0, self.projected / self.remaining)
+
+        return self.scale
+
+    # =============================================================================
+    def allot(self, ranked: list | None = None) -> tuple[list, list]:
+        """
+        Split locations into those that can be downloaded now and those that have to wait
+
+        :param list ranked: locations, highest priority first.
+        :return tuple: (allowed, deferred)
+        """
+        ranked = ranked or []
+        return ranked[:self.remaining], ranked[self.remaining:]
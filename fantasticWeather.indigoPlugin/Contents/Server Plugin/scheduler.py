@@ -0,0 +1,151 @@
+"""
+Job scheduler
+
+The JobScheduler class keeps the plugin's jobs (weather refreshes, retries, trigger checks, emails and
+image downloads) in a heap ordered by due time, so that runConcurrentThread() can sleep until exactly
+the next job is due. Other threads (config dialogs, actions, menu items) can reschedule a job, which
+wakes the plugin thread right away.
+
+staggered_time() spreads device refreshes across the plugin call interval.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+import zlib
+
+
+# =============================================================================
+class JobScheduler:
+    """
+    Heap of named jobs
+
+    Each job name has at most one live due time. Rescheduling a job leaves its old heap entry in
+    place; stale entries are skipped when they reach the top of the heap.
+    """
+    def __init__(self) -> None:
+        self._heap    = []  # [(due, sequence, name)]
+        self._live    = {}  # {name: (due, sequence)}
+        self._counter = itertools.count()
+        self._lock    = threading.Lock()
+        self._wake    = threading.Event()
+
+    # =============================================================================
+    def schedule(self, name: str = "", delay: float = 0.0, keep_earlier: bool = False) -> None:
+        """
+        Schedule a job and wake the waiting thread
+
+        :param str name:
+        :param float delay: seconds from now.
+        :param bool keep_earlier: if the job is already due sooner, leave it alone.
+        """
+        due = time.monotonic() + max(0.0, delay)
+
+        with self._lock:
+            current = self._live.get(name)
+            if keep_earlier and current and current[0] <= due:
+                return
+
+            entry = (due, next(self._counter), name)
+            self._live[name] = entry[:2]
+            heapq.heappush(self._heap, entry)
+
+        self._wake.set()
+
+    # =============================================================================
+    def cancel(self, name: str = "") -> None:
+        """
+        Remove a job from the schedule
+
+        :param str name:
+        """
+        with self._lock:
+            self._live.pop(name, None)
+
+    # =============================================================================
+    def clear(self) -> None:
+        """
+        Remove all jobs from the schedule
+        """
+        with self._lock:
+            self._heap.clear()
+            self._live.clear()
+
+    # =============================================================================
+    def pop_due(self) -> list[str]:
+        """
+        Remove and return the jobs that are due, in due order
+
+        :return list:
+        """
+        now = time.monotonic()
+        due = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                when, sequence, name = heapq.heappop(self._heap)
+                if self._live.get(name) == (when, sequence):
+                    del self._live[name]
+                    due.append(name)
+
+        return due
+
+    # =============================================================================
+    def seconds_until_next(self, default: float | None = None) -> float | None:
+        """
+        Return the number of seconds until the next job is due (default if there are no jobs)
+
+        :param float default:
+        :return float:
+        """
+        with self._lock:
+            while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][:2]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                return default
+
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    # =============================================================================
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Sleep until the timeout passes or the scheduler is woken
+
+        :param float timeout: seconds.
+        :return bool: True if the scheduler was woken.
+        """
+        woken = self._wake.wait(timeout)
+        self._wake.clear()
+        return woken
+
+    # =============================================================================
+    def wake(self) -> None:
+        """
+        Wake the waiting thread so that it looks at the schedule again
+        """
+        self._wake.set()
+
+
+# =============================================================================
+def staggered_time(key: str = "", interval: int = 900, call_interval: int = 900, after: float = 0) -> float:
+    """
+    Return the first staggered refresh time after an epoch
+
+    Each key gets one phase within the call interval, and refresh times fall on a grid of the
+    device's interval shifted by that phase (reduced modulo the interval.) Devices with the same key
+    share the phase, so their refresh times coincide whenever one interval is a multiple of the
+    other, or at their common multiples otherwise.
+
+    :param str key: the device location (or id.)
+    :param int interval: the device refresh interval, in seconds.
+    :param int call_interval: the plugin call interval, in seconds.
+    :param float after: epoch
+    :return float: epoch
+    """
+    interval = max(1, interval)
+    phase    = (zlib.crc32(key.encode("utf-8")) % 1000) / 1000 * call_interval
+    offset   = phase % interval
+    return offset + (math.floor((after - offset) / interval) + 1) * interval
@@ -0,0 +1,95 @@
+"""
+Device state schema
+
+The state schema describes how each device state is extracted from the Pirate Weather JSON. The
+plugin compiles the schema into extractors when it loads (one per Weather device record and one per
+forecast field column; see Plugin.compile_extractors()), using the state ids in Devices.xml to
+determine which states (and how many forecast periods) each device type has. Adding a new field is a one-line addition here plus the
+state in Devices.xml.
+
+Each entry is a tuple of:
+    state key   - the device state id. Forecast keys include a '{:02d}' placeholder for the period.
+    path        - the JSON key path (relative to the forecast period for forecast devices.)
+    rule        - how the raw value is treated:
+                    'raw'       the value is used as is.
+                    'icon'      dashes are replaced with underscores (icon names.)
+                    'fix'       the value is run through fix_corrupted_data().
+                    'percent'   the value is multiplied by 100 and run through fix_corrupted_data().
+                    'wind_name' the (fixed) wind bearing is converted to a wind name.
+                    'total'     the (fixed) hourly value is multiplied by 24.
+    formatter   - the UIFormatter method applied to the uiValue ('fix', 'percent' and 'total' rules.)
+                  None uses the fixed value string. 'bearing' displays the bearing as an integer.
+    icon state  - Weather devices only. 'round' adds a '<key>Icon' state with the rounded value,
+                  'value' adds one with the fixed value.
+"""
+
+# ================================== Weather ==================================
+WEATHER_FIELDS = (
+    ('apparentTemperature',  ('currently', 'apparentTemperature'),  'fix',       'temperature', 'round'),
+    ('cloudCover',           ('currently', 'cloudCover'),           'percent',   'percentage',  'round'),
+    ('dewpoint',             ('currently', 'dewPoint'),             'fix',       'temperature', 'round'),
+    ('humidity',             ('currently', 'humidity'),             'percent',   'percentage',  'round'),
+    ('icon',                 ('currently', 'icon'),                 'icon',      None,          None),
+    ('nearestStormBearing',  ('currently', 'nearestStormBearing'),  'fix',       'index',       'value'),
+    ('nearestStormDistance', ('currently', 'nearestStormDistance'), 'fix',       'distance',    'round'),
+    ('ozone',                ('currently', 'ozone'),                'fix',       'index',       'round'),
+    ('pressure',             ('currently', 'pressure'),             'fix',       'pressure',    'round'),
+    ('precipIntensity',      ('currently', 'precipIntensity'),      'fix',       'rain',        'round'),
+    ('precipProbability',    ('currently', 'precipProbability'),    'percent',   'percentage',  'round'),
+    ('summary',              ('currently', 'summary'),              'raw',       None,          None),
+    ('temperature',          ('currently', 'temperature'),          'fix',       'temperature', 'round'),
+    ('uv',                   ('currently', 'uvIndex'),              'fix',       'index',       'round'),
+    ('visibility',           ('currently', 'visibility'),           'fix',       'distance',    'round'),
+    ('windBearing',          ('currently', 'windBearing'),          'fix',       None,          'round'),
+    ('windBearingName',      ('currently', 'windBearing'),          'wind_name', None,          None),
+    ('windGust',             ('currently', 'windGust'),             'fix',       'wind',        'round'),
+    ('windSpeed',            ('currently', 'windSpeed'),            'fix',       'wind',        'round'),
+)
+
+# =================================== Hourly ==================================
+HOURLY_FIELDS = (
+    ('h{:02d}_cloudCover',      ('cloudCover',),        'percent',   'percentage',  None),
+    ('h{:02d}_humidity',        ('humidity',),          'percent',   'percentage',  None),
+    ('h{:02d}_precipIntensity', ('precipIntensity',),   'fix',       'rain',        None),
+    ('h{:02d}_precipChance',    ('precipProbability',), 'percent',   'percentage',  None),
+    ('h{:02d}_icon',            ('icon',),              'icon',      None,          None),
+    ('h{:02d}_ozone',           ('ozone',),             'fix',       'index',       None),
+    ('h{:02d}_precipType',      ('precipType',),        'raw',       None,          None),
+    ('h{:02d}_pressure',        ('pressure',),          'fix',       'pressure',    None),
+    ('h{:02d}_summary',         ('summary',),           'raw',       None,          None),
+    ('h{:02d}_temperature',     ('temperature',),       'fix',       'temperature', None),
+    ('h{:02d}_uvIndex',         ('uvIndex',),           'fix',       'index',       None),
+    ('h{:02d}_windBearing',     ('windBearing',),       'fix',       None,          None),
+    ('h{:02d}_windBearingName', ('windBearing',),       'wind_name', None,          None),
+    ('h{:02d}_windGust',        ('windGust',),          'fix',       'wind',        None),
+    ('h{:02d}_windSpeed',       ('windSpeed',),         'fix',       'wind',        None),
+    ('h{:02d}_visibility',      ('visibility',),        'fix',       'distance',    None),
+)
+
+# =================================== Daily ===================================
+DAILY_FIELDS = (
+    ('d{:02d}_cloudCover',      ('cloudCover',),        'percent',   'percentage',  None),
+    ('d{:02d}_humidity',        ('humidity',),          'percent',   'percentage',  None),
+    ('d{:02d}_icon',            ('icon',),              'icon',      None,          None),
+    ('d{:02d}_ozone',           ('ozone',),             'fix',       'index',       None),
+    ('d{:02d}_precipIntensity', ('precipIntensity',),   'fix',       'rain',        None),
+    ('d{:02d}_precipChance',    ('precipProbability',), 'percent',   'percentage',  None),
+    ('d{:02d}_precipTotal',     ('precipIntensity',),   'total',     'rain',        None),
+    ('d{:02d}_precipType',      ('precipType',),        'raw',       None,          None),
+    ('d{:02d}_pressure',        ('pressure',),          'fix',       'pressure',    None),
+    ('d{:02d}_summary',         ('summary',),           'raw',       None,          None),
+    ('d{:02d}_temperatureHigh', ('temperatureHigh',),   'fix',       'temperature', None),
+    ('d{:02d}_temperatureLow',  ('temperatureLow',),    'fix',       'temperature', None),
+    ('d{:02d}_uvIndex',         ('uvIndex',),           'fix',       'index',       None),
+    ('d{:02d}_visibility',      ('visibility',),        'fix',       'distance',    None),
+    ('d{:02d}_windBearing',     ('windBearing',),       'fix',       'bearing',     None),
+    ('d{:02d}_windBearingName', ('windBearing',),       'wind_name', None,          None),
+    ('d{:02d}_windGust',        ('windGust',),          'fix',       'wind',        None),
+    ('d{:02d}_windSpeed',       ('windSpeed',),         'fix',       'wind',        None),
+)
+
+STATE_SCHEMA = {
+    'Weather': WEATHER_FIELDS,
+    'Hourly': HOURLY_FIELDS,
+    'Daily': DAILY_FIELDS,
+}
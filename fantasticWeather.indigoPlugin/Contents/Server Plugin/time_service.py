@@ -0,0 +1,126 @@
+"""
+Shared time rendering
+
+Forecast devices render the same epochs over and over: every Hourly device at a location shows the
+same 24 hours, and each hour only moves one slot per cycle. These functions cache the tzinfo objects
+and memoize the conversion of an epoch to its local strings, so each (epoch, zone) pair is converted
+once rather than once per device per cycle. A zone of None means the server's local time.
+"""
+
+import datetime as dt
+from functools import lru_cache
+import time
+from typing import NamedTuple
+
+import pytz
+
+
+# =============================================================================
+class HourStrings(NamedTuple):
+    """
+    Rendered values for one forecast hour
+    """
+    day: str        # Monday
+    day_short: str  # Mon
+    hour: str       # 14:00
+    hour_ui: str    # the hour in the Indigo time format
+    epoch: int      # the epoch shown on the device
+
+
+# =============================================================================
+class DayStrings(NamedTuple):
+    """
+    Rendered values for one forecast day
+    """
+    date: str       # 2025-01-31
+    day: str        # Friday
+    day_short: str  # Fri
+
+
+# =============================================================================
+@lru_cache(maxsize=None)
+def zone_info(zone: str = "") -> dt.tzinfo:
+    """
+    Return the (cached) tzinfo for a zone name
+
+    :param str zone: for example, 'America/Chicago'
+    :return dt.tzinfo:
+    """
+    return pytz.timezone(zone=zone)
+
+
+# =============================================================================
+@lru_cache(maxsize=4096)
+def location_time(epoch: int | float = 0, zone: str = "") -> dt.datetime:
+    """
+    Return an epoch as an aware datetime in the location timezone
+
+    :param int epoch:
+    :param str zone:
+    :return dt.datetime:
+    """
+    return zone_info(zone).normalize(dt.datetime.fromtimestamp(int(epoch), tz=pytz.utc))
+
+
+# =============================================================================
+@lru_cache(maxsize=4096)
+def local_time(epoch: int | float = 0, zone: str | None = None) -> time.struct_time:
+    """
+    Return an epoch as a time tuple in the location timezone (or server time if zone is None)
+
+    :param int epoch:
+    :param str zone:
+    :return time.struct_time:
+    """
+    if zone is None:
+        return time.localtime(float(epoch))
+    return location_time(epoch, zone).timetuple()
+
+
+# =============================================================================
+@lru_cache(maxsize=4096)
+def hour_strings(epoch: int | float = 0, zone: str | None = None, time_format: str = "%H:%M") -> HourStrings:
+    """
+    Render a forecast hour
+
+    In server time the epoch is passed through. In location time the epoch is the location's wall
+    clock time read as a server time (as the plugin has always reported it.)
+
+    :param int epoch:
+    :param str zone:
+    :param str time_format: the Indigo time format.
+    :return HourStrings:
+    """
+    struct = local_time(epoch, zone)
+
+    if zone is None:
+        shown_epoch = epoch
+    else:
+        zone_tuple  = dt.datetime.fromtimestamp(epoch, zone_info(zone)).timetuple()
+        shown_epoch = int(time.mktime(zone_tuple))
+
+    return HourStrings(
+        day=time.strftime('%A', struct),
+        day_short=time.strftime('%a', struct),
+        hour=time.strftime('%H:%M', struct),
+        hour_ui=time.strftime(time_format, struct),
+        epoch=shown_epoch,
+    )
+
+
+# =============================================================================
+@lru_cache(maxsize=1024)
+def day_strings(epoch: int | float = 0, zone: str = "") -> DayStrings:
+    """
+    Render a forecast day in the location timezone
+
+    :param int epoch:
+    :param str zone:
+    :return DayStrings:
+    """
+    struct = local_time(epoch, zone)
+    return DayStrings(
+        date=time.strftime('%Y-%m-%d', struct),
+        day=time.strftime('%A', struct),
+        day_short=time.strftime('%a', struct),
+    )
@@ -0,0 +1,174 @@
+"""
+Device UI value formatting
+
+The UIFormatter class formats state values for display in the Indigo UI (control pages, etc.) It's
+built once per device per cycle (see Plugin.device_formatter()); the unit strings and decimal
+precision are read from the plugin prefs and device props when it's built, so each format call is
+just a float conversion and a format().
+"""
+
+from typing import Any
+
+WIND_NAMES_LONG  = ('North', 'Northeast', 'East', 'Southeast', 'South', 'Southwest', 'West', 'Northwest')
+WIND_NAMES_SHORT = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+
+
+# =============================================================================
+class UIFormatter:
+    """
+    UI value formatter for one device
+
+    :param dict prefs: the plugin prefs.
+    :param dict props: the device props.
+    """
+    def __init__(self, prefs: Any = None, props: Any = None) -> None:
+        prefs = prefs or {}
+        props = props or {}
+
+        self.distance_spec    = f"0.{prefs.get('uiDistanceDecimal', '1')}f"
+        self.index_spec       = f"0.{prefs.get('uiIndexDecimal', '1')}f"
+        self.item_list_spec   = f"0.{int(prefs.get('itemListTempDecimal', '1'))}f"
+        self.percentage_spec  = f"0.{int(prefs.get('uiPercentageDecimal', '1'))}f"
+        self.temperature_spec = f"0.{int(prefs.get('uiTempDecimal', '1'))}f"
+        self.wind_spec        = f"0.{int(prefs.get('uiWindDecimal', '1'))}f"
+        self.wind_names       = (
+            WIND_NAMES_LONG if prefs.get('uiWindName', 'Long') == 'Long' else WIND_NAMES_SHORT
+        )
+
+        self.distance_units    = props.get('distanceUnits', '')
+        self.index_units       = props.get('indexUnits', '')
+        self.percentage_units  = props.get('percentageUnits', '')
+        self.pressure_units    = props.get('pressureUnits', '')
+        self.temperature_units = props.get('temperatureUnits', '')
+        self.wind_units        = props.get('windUnits', '')
+        # Some devices use the prop 'rainUnits' and some use the prop 'rainAmountUnits'.
+        self.rain_units        = props.get('rainUnits', props.get('rainAmountUnits', ''))
+
+    # =============================================================================
+    def distance(self, val: int | float | str | None = None) -> str:
+        """
+        Format distance data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.distance_spec)}{self.distance_units}"
+
+        except ValueError:
+            return f"{val}{self.distance_units}"
+
+    # =============================================================================
+    def index(self, val: int | float | str | None = None) -> str:
+        """
+        Format index data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.index_spec)}{self.index_units}"
+
+        except ValueError:
+            return f"{val}{self.index_units}"
+
+    # =============================================================================
+    def item_list_temperature(self, val: int | float | str | None = None) -> str:
+        """
+        Format temperature values for the Indigo Item List
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return format(val, self.item_list_spec)
+
+        except ValueError:
+            return f"{val}"
+
+    # =============================================================================
+    def percentage(self, val: int | float | str | None = None) -> str:
+        """
+        Format percentage data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.percentage_spec)}{self.percentage_units}"
+
+        except ValueError:
+            return f"{val}{self.percentage_units}"
+
+    # =============================================================================
+    def pressure(self, val: int | float | str | None = None) -> str:
+        """
+        Format pressure data for Indigo UI
+
+        Pressure values use the index precision preference.
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.index_spec)}{self.pressure_units}"
+
+        except ValueError:
+            return f"{val}{self.pressure_units}"
+
+    # =============================================================================
+    def rain(self, val: int | float | str | None = None) -> str:
+        """
+        Format rain data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        if val in ("NA", "N/A", "--", ""):
+            return val
+
+        try:
+            return f"{float(val):0.2f}{self.rain_units}"
+
+        except ValueError:
+            return f"{val}"
+
+    # =============================================================================
+    def temperature(self, val: int | float | str | None = None) -> str:
+        """
+        Format temperature data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.temperature_spec)}{self.temperature_units}"
+
+        except ValueError:
+            return "--"
+
+    # =============================================================================
+    def wind(self, val: int | float | str | None = None) -> str:
+        """
+        Format wind data for Indigo UI
+
+        :param int or class Str val:
+        :return str:
+        """
+        try:
+            return f"{format(float(val), self.wind_spec)}{self.wind_units}"
+
+        except ValueError:
+            return f"{val}"
+
+    # =============================================================================
+    def wind_name(self, val: float | int = 0) -> str:
+        """
+        Convert a wind bearing to its name
+
+        Credit to Indigo Forum user forestfield for conversion routine.
+
+        :param float val:
+        :return str:
+        """
+        return self.wind_names[int(((round(val) + 22.5) % 360) / 45)]
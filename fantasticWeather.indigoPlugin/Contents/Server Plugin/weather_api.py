@@ -0,0 +1,107 @@
+"""
+Pirate Weather API client
+
+The PirateWeatherClient class owns an HTTP session used for plugin downloads. The session keeps
+connections alive between cycles so that each location doesn't pay for a new TCP and TLS handshake
+every time it's polled. The plugin creates two clients at startup (one for forecasts and one for
+satellite images, so that each has its own connection pool) and closes them at shutdown.
+"""
+
+# Third-party modules
+try:
+    import requests  # noqa
+    from requests.adapters import HTTPAdapter  # noqa
+    from urllib3.util import Retry  # noqa
+except ImportError:
+    pass
+
+API_URL = "https://api.pirateweather.net"
+
+
+# =============================================================================
+class PirateWeatherClient:
+    """
+    Pooled HTTP client for the Pirate Weather API
+
+    :param int pool_size: the maximum number of connections kept open per host.
+    :param int timeout: the connect/read timeout (in seconds) for each request.
+    """
+    def __init__(self, pool_size: int = 4, timeout: int = 20) -> None:
+        self.timeout   = timeout
+        self.pool_size = None
+        self.session   = requests.Session()
+        self.session.headers.update({'Accept-Encoding': "gzip", 'Connection': "keep-alive"})
+        self.configure_pool(pool_size)
+
+    # =============================================================================
+    def configure_pool(self, pool_size: int = 4) -> None:
+        """
+        Mount connection pool adapters sized for the number of concurrent downloads
+
+        The adapters retry transient connection and gateway errors a couple of times before giving
+        up. Longer outages are left to the plugin's retry scheduler. The adapters are only replaced
+        when the pool size changes; the old adapters are closed once the new ones are mounted, and
+        requests still in flight on them close their connections when they finish.
+
+        :param int pool_size:
+        """
+        pool_size = max(1, int(pool_size))
+        if pool_size == self.pool_size:
+            return
+
+        retries = Retry(
+            total=2,
+            connect=2,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=10, pool_maxsize=pool_size, max_retries=retries
+        )
+        replaced = {self.session.adapters.get(prefix) for prefix in ("https://", "http://")}
+
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = pool_size
+
+        for old_adapter in replaced - {None}:
+            old_adapter.close()
+
+    # =============================================================================
+    def get(self, url: str = "", **kwargs) -> requests.Response:
+        """
+        Send a GET request through the pooled session
+
+        :param str url:
+        :return requests.Response:
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    # =============================================================================
+    def get_forecast(self, api_key: str = "", location: tuple = (), units: str = "auto", language: str = "en") -> requests.Response:  # noqa
+        """
+        Request the forecast for a location
+
+        :param str api_key:
+        :param tuple location: (latitude, longitude)
+        :param str units:
+        :param str language:
+        :return requests.Response:
+        """
+        latitude, longitude = location
+        source_url = (
+            f"{API_URL}/forecast/{api_key}/{latitude},{longitude}?"
+            f"exclude='minutely'&extend=''&units={units}&lang={language}"
+        )
+        return self.get(source_url)
+
+    # =============================================================================
+    def close(self) -> None:
+        """
+        Close the session and any pooled connections
+        """
+        self.session.close()
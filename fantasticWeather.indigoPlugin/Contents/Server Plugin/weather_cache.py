@@ -0,0 +1,155 @@
+"""
+On-disk forecast cache
+
+The ForecastCache class saves the raw JSON returned by Pirate Weather so that the plugin can
+repopulate its devices right away when it's restarted (without waiting for a network call). Each
+entry is keyed by location, units and language and is stored as the raw JSON body; the file's
+modification time is the fetch epoch. Entries are evicted by age and by the total size of the cache.
+Temporary files left behind by a save that didn't finish (the plugin was stopped mid-write, for
+example) are removed by evict() too.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Callable
+
+TEMP_MAX_AGE = 600  # seconds before an unfinished temporary file is removed
+
+
+# =============================================================================
+class ForecastCache:
+    """
+    Raw forecast JSON stored on disk
+
+    :param str cache_dir: the folder where entries are stored (created if needed.)
+    :param int max_age: entries older than this (in seconds) are evicted.
+    :param int max_bytes: the oldest entries are evicted when the cache grows beyond this size.
+    """
+    def __init__(self, cache_dir: str = "", max_age: int = 86400, max_bytes: int = 20971520) -> None:
+        self.cache_dir = cache_dir
+        self.max_age   = max_age
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # =============================================================================
+    def file_name(self, location: tuple = (), units: str = "", language: str = "") -> str:
+        """
+        Return the path of the cache entry for a location, units and language
+
+        :param tuple location: (latitude, longitude)
+        :param str units:
+        :param str language:
+        :return str:
+        """
+        key = re.sub(r'[^\w.-]', '_', "_".join([*location, units, language]))
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    # =============================================================================
+    def load(self, location: tuple = (), units: str = "", language: str = "", object_pairs_hook: Callable | None = None) -> tuple[dict, float] | None:  # noqa
+        """
+        Return the cached forecast and its fetch epoch
+
+        Returns None if there's no entry, the entry is too old, or it can't be decoded.
+
+        :param tuple location: (latitude, longitude)
+        :param str units:
+        :param str language:
+        :param Callable object_pairs_hook: passed to the JSON decoder.
+        :return tuple: (parsed JSON, fetch epoch)
+        """
+        file_name = self.file_name(location, units, language)
+
+        try:
+            fetch_epoch = os.path.getmtime(file_name)
+            if time.time() - fetch_epoch > self.max_age:
+                return None
+
+            with open(file_name, 'r', encoding="utf-8") as infile:
+                return json.load(infile, object_pairs_hook=object_pairs_hook), fetch_epoch
+
+        except (OSError, ValueError):
+            return None
+
+    # =============================================================================
+    def save(self, location: tuple = (), units: str = "", language: str = "", raw_json: bytes | str = b"", fetch_epoch: float | None = None) -> None:  # noqa
+        """
+        Save the raw forecast JSON for a location
+
+        The entry is written to a temporary file and then moved into place, so a reader never sees
+        a partial entry. This method may be called from the fetch pool worker threads.
+
+        :param tuple location: (latitude, longitude)
+        :param str units:
+        :param str language:
+        :param bytes raw_json: the response body.
+        :param float fetch_epoch: defaults to now.
+        """
+        file_name   = self.file_name(location, units, language)
+        fetch_epoch = fetch_epoch or time.time()
+
+        if isinstance(raw_json, str):
+            raw_json = raw_json.encode("utf-8")
+
+        handle, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'wb') as outfile:
+                outfile.write(raw_json)
+            os.utime(temp_name, (fetch_epoch, fetch_epoch))
+            os.replace(temp_name, file_name)
+
+        except OSError:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+    # =============================================================================
+    def evict(self) -> int:
+        """
+        Remove entries that are too old, then the oldest entries until the cache fits its size
+
+        Temporary files older than TEMP_MAX_AGE are left over from saves that didn't finish, and
+        are removed as well. A temporary file's modification time is set to the fetch epoch before
+        it's moved into place, so its age is taken from the later of its modification and status
+        change times.
+
+        :return int: the number of entries removed.
+        """
+        now     = time.time()
+        entries = []
+        removed = 0
+
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+
+            if entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                if now - max(stat.st_mtime, stat.st_ctime) > TEMP_MAX_AGE:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass  # moved into place since the folder was read
+                continue
+
+            if not entry.name.endswith(".json"):
+                continue
+
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                os.remove(entry.path)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            os.remove(path)
+            total_size -= size
+            removed += 1
+
+        return removed
@@ -0,0 +1,65 @@
+"""Tests for the projected forecast decoder.
+
+These tests run without an Indigo server; they decode sample Pirate Weather responses and check
+which fields survive the projection for each set of device types.
+"""
+import json
+import os
+import sys
+import unittest
+
+SERVER_PLUGIN_DIR_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../fantasticWeather.indigoPlugin/Contents/Server Plugin")
+)
+sys.path.insert(0, SERVER_PLUGIN_DIR_PATH)
+
+from forecast_decoder import decode  # noqa
+
+PAYLOAD = json.dumps({
+    'timezone': "America/Chicago",
+    'currently': {'time': 1700000000, 'temperature': 10.5, 'unusedField': 1},
+    'daily': {
+        'summary': "Rain all week.",
+        'data': [{'time': 1700000000, 'pressure': 1013.2, 'visibility': 16.09, 'unusedField': 1}],
+    },
+    'alerts': [
+        {
+            'title': "Flood Watch",
+            'description': "Heavy rain expected.",
+            'expires': 1700086400,
+            'regions': ["Region"],
+            'severity': "watch",
+            'time': 1700000000,
+            'uri': "https://alerts.example/1",
+        }
+    ],
+}).encode("utf-8")
+
+
+class TestDecode(unittest.TestCase):
+
+    def test_daily_keeps_alerts(self):
+        """Daily devices send the forecast email, which lists the alerts."""
+        forecast = decode(PAYLOAD, frozenset({'Daily'}))
+        self.assertEqual(len(forecast['alerts']), 1)
+        self.assertEqual(forecast['alerts'][0]['title'], "Flood Watch")
+        self.assertEqual(forecast['alerts'][0]['uri'], "https://alerts.example/1")
+        self.assertEqual(forecast['alerts'][0]['expires'], 1700086400)
+
+    def test_daily_keeps_email_fields(self):
+        forecast = decode(PAYLOAD, frozenset({'Daily'}))
+        self.assertEqual(forecast['daily']['data'][0]['pressure'], 1013.2)
+        self.assertEqual(forecast['daily']['data'][0]['visibility'], 16.09)
+
+    def test_unused_fields_dropped(self):
+        forecast = decode(PAYLOAD, frozenset({'Daily'}))
+        self.assertNotIn('unusedField', forecast['currently'])
+        self.assertNotIn('unusedField', forecast['daily']['data'][0])
+
+    def test_hourly_drops_alerts(self):
+        forecast = decode(PAYLOAD, frozenset({'Hourly'}))
+        self.assertNotIn('alerts', forecast)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests for the API quota governor.
+
+These tests run without an Indigo server; they record calls across a UTC day rollover and check the
+call count the governor keeps.
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+SERVER_PLUGIN_DIR_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../fantasticWeather.indigoPlugin/Contents/Server Plugin")
+)
+sys.path.insert(0, SERVER_PLUGIN_DIR_PATH)
+
+from quota_governor import QuotaGovernor  # noqa
+
+
+class TestRecord(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(QuotaGovernor, 'utc_day', return_value="2026-10-16")
+        self.utc_day = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.quota = QuotaGovernor(limit=1000, calls=990, day="2026-10-16")
+
+    def test_header_used_during_the_day(self):
+        self.quota.record("995")
+        self.assertEqual(self.quota.calls, 995)
+
+    def test_missing_header_counted_locally(self):
+        self.quota.record(None)
+        self.assertEqual(self.quota.calls, 991)
+
+    def test_stale_header_ignored_after_rollover(self):
+        """A count from before midnight mustn't use up the new day."""
+        self.utc_day.return_value = "2026-10-17"
+        self.quota.record("996")
+        self.assertEqual(self.quota.calls, 1)
+        self.quota.record("997")
+        self.assertEqual(self.quota.calls, 2)
+        self.assertFalse(self.quota.limit_reached)
+
+    def test_header_used_once_reset_after_rollover(self):
+        self.utc_day.return_value = "2026-10-17"
+        self.quota.record("996")
+        self.quota.record("2")
+        self.assertEqual(self.quota.calls, 2)
+        self.quota.record("10")
+        self.assertEqual(self.quota.calls, 10)
+
+    def test_stale_header_ignored_after_restart_on_a_new_day(self):
+        self.utc_day.return_value = "2026-10-17"
+        quota = QuotaGovernor(limit=1000, calls=990, day="2026-10-16")
+        self.assertEqual(quota.calls, 0)
+        quota.record("991")
+        self.assertEqual(quota.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
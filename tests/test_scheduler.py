@@ -0,0 +1,89 @@
+"""Tests for the job scheduler and the staggered refresh schedule.
+
+These tests run without an Indigo server; they schedule and drop jobs, and walk the refresh times of
+devices at one location to count the downloads the location needs.
+"""
+import os
+import sys
+import unittest
+
+SERVER_PLUGIN_DIR_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../fantasticWeather.indigoPlugin/Contents/Server Plugin")
+)
+sys.path.insert(0, SERVER_PLUGIN_DIR_PATH)
+
+from scheduler import JobScheduler, staggered_time  # noqa
+
+LOCATION = "41.878,-87.630"
+START    = 1760000000
+HOURS    = 2
+
+
+def refresh_times(key, interval, call_interval=900):
+    """Return the refresh times of one device over the test period."""
+    times = []
+    when  = staggered_time(key, interval, call_interval, START)
+    while when < START + HOURS * 3600:
+        times.append(when)
+        when = staggered_time(key, interval, call_interval, when)
+    return times
+
+
+class TestJobScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = JobScheduler()
+        self.scheduler.schedule('refresh')
+        self.scheduler.schedule('images')
+
+    def test_pop_due(self):
+        self.assertEqual(self.scheduler.pop_due(), ['refresh', 'images'])
+        self.assertIsNone(self.scheduler.seconds_until_next())
+
+    def test_cancel(self):
+        """A cancelled job isn't run, and the other jobs are left alone."""
+        self.scheduler.cancel('refresh')
+        self.assertEqual(self.scheduler.pop_due(), ['images'])
+
+    def test_cancel_then_schedule(self):
+        self.scheduler.cancel('refresh')
+        self.scheduler.schedule('refresh', 60)
+        self.assertEqual(self.scheduler.pop_due(), ['images'])
+        self.assertGreater(self.scheduler.seconds_until_next(), 0)
+
+    def test_clear(self):
+        self.scheduler.clear()
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.assertEqual(self.scheduler.seconds_until_next(default=900), 900)
+
+
+class TestStaggeredTime(unittest.TestCase):
+
+    def test_shared_downloads_300_900(self):
+        """The 900 s device's refreshes fall on the 300 s device's refreshes."""
+        fast = refresh_times(LOCATION, 300)
+        slow = refresh_times(LOCATION, 900)
+        self.assertTrue(set(slow) <= set(fast))
+        self.assertEqual(len(set(fast) | set(slow)), HOURS * 3600 // 300)
+
+    def test_shared_downloads_600_900(self):
+        """The devices share a download every 1800 s."""
+        fast = refresh_times(LOCATION, 600)
+        slow = refresh_times(LOCATION, 900)
+        self.assertEqual(len(set(fast) & set(slow)), HOURS * 3600 // 1800)
+        self.assertEqual(len(set(fast) | set(slow)), HOURS * 3600 // 600 + HOURS * 3600 // 1800)
+
+    def test_phase_within_interval(self):
+        for interval in (300, 600, 900, 3600):
+            when = staggered_time(LOCATION, interval, 900, START)
+            self.assertGreater(when, START)
+            self.assertLessEqual(when, START + interval)
+
+    def test_locations_spread(self):
+        self.assertNotEqual(
+            staggered_time(LOCATION, 900, 900, START), staggered_time("51.507,-0.128", 900, 900, START)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the on-disk forecast cache.
+
+These tests run without an Indigo server; they use a temporary cache folder.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+SERVER_PLUGIN_DIR_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../fantasticWeather.indigoPlugin/Contents/Server Plugin")
+)
+sys.path.insert(0, SERVER_PLUGIN_DIR_PATH)
+
+import weather_cache  # noqa
+from weather_cache import ForecastCache  # noqa
+
+LOCATION = ("41.878", "-87.630")
+
+
+class TestEvict(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.cache = ForecastCache(self.folder.name)
+
+    def temp_file(self):
+        handle, temp_name = tempfile.mkstemp(dir=self.folder.name, suffix=".tmp")
+        os.close(handle)
+        return temp_name
+
+    def test_stale_temp_file_removed(self):
+        """A temporary file left by a save that didn't finish is removed."""
+        temp_name = self.temp_file()
+        with mock.patch.object(weather_cache.time, 'time', return_value=time.time() + 3600):
+            self.cache.evict()
+        self.assertFalse(os.path.exists(temp_name))
+
+    def test_recent_temp_file_kept(self):
+        """A save that's still in progress isn't disturbed."""
+        temp_name = self.temp_file()
+        self.cache.evict()
+        self.assertTrue(os.path.exists(temp_name))
+
+    def test_entries_kept(self):
+        self.cache.save(LOCATION, "us", "en", b'{"timezone": "America/Chicago"}')
+        self.assertEqual(self.cache.evict(), 0)
+        self.assertEqual(self.cache.load(LOCATION, "us", "en")[0], {'timezone': "America/Chicago"})
+
+
+if __name__ == "__main__":
+    unittest.main()